@@ -5,16 +5,38 @@ Date: 2025-11-03 (Day 2)
 
 Wrapper around HelenaCore for per-agent memory management.
 Each agent has its own memory space within the multi-layer system.
+
+Optional write-behind mode: save() only enqueues the event and a
+background worker persists it, so agents never wait on the 4 layers.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import atexit
+import queue
 import sys
+import threading
+import time
+import weakref
 from pathlib import Path
 
 # Add parent directory to path for HelenaCore import
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from helena_core import HelenaCore
+from helena_clients import HelenaResourceManager
+
+
+# Write-behind memories with a running worker, closed (flushed) at exit
+_open_memories = weakref.WeakSet()
+
+# Seconds each memory gets to flush at exit (a stalled layer must not
+# hang interpreter shutdown)
+EXIT_FLUSH_TIMEOUT = 10.0
+
+
+@atexit.register
+def _close_open_memories():
+    for memory in list(_open_memories):
+        memory.close(timeout=EXIT_FLUSH_TIMEOUT)
 
 
 class AgentMemory:
@@ -28,19 +50,70 @@ class AgentMemory:
         memory = AgentMemory("Tomasz Kamiński", "project-id")
         memory.save("Completed task X", importance=0.8)
         contexts = memory.load("task X", limit=5)
+        
+    Write-behind usage:
+        memory = AgentMemory("Tomasz Kamiński", "project-id", write_behind=True)
+        memory.save("Completed task X", importance=0.8)  # returns immediately
+        memory.flush()                                    # wait until persisted
+        memory.close()                                    # flush + stop worker
     """
     
-    def __init__(self, agent_name: str, project_id: str):
+    def __init__(
+        self,
+        agent_name: str,
+        project_id: str,
+        write_behind: bool = False,
+        queue_size: int = 1000,
+        batch_size: int = 20,
+        put_timeout: float = 5.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        resources: Optional[HelenaResourceManager] = None
+    ):
         """
         Initialize agent memory
         
         Args:
             agent_name: Name of the agent (e.g., "Tomasz Kamiński")
             project_id: Project identifier for HelenaCore
+            write_behind: Queue saves and persist them in the background
+            queue_size: Max events waiting in the write-behind queue
+            batch_size: Max events the worker drains per batch
+            put_timeout: Seconds save() blocks on a full queue before
+                dropping the event (backpressure)
+            max_retries: Retries for an event no layer could persist
+            retry_backoff: Base delay (seconds) between retries, doubled
+                on each attempt
+            resources: Resource manager providing the project's HelenaCore
+                (default: the process-wide shared manager)
         """
         self.agent_name = agent_name
         self.project_id = project_id
-        self.helena = HelenaCore(project_id=project_id)
+        
+        # One HelenaCore (and one set of DB pools) per project, shared by
+        # every agent in the process
+        self.resources = resources or HelenaResourceManager.shared()
+        self.helena = self.resources.helena(project_id)
+        
+        # Write-behind state
+        self.write_behind = write_behind
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.metrics = {
+            "enqueued": 0,
+            "saved": 0,
+            "failed": 0,
+            "dropped": 0,
+            "retried": 0,
+            "batches": 0
+        }
         
     def save(
         self,
@@ -57,18 +130,207 @@ class AgentMemory:
             context_type: Type of memory (agent_work, task_received, etc.)
             
         Returns:
-            Dict with save results from all layers
-        """
-        return self.helena.save_to_all_layers(
-            event_type="agent_context",
-            content=content,
-            importance=importance,
-            made_by=self.agent_name,
-            additional_data={
+            Dict with save results from all layers. In write-behind mode:
+            {"success": bool, "queued": bool, "queue_depth": int}
+        """
+        event = {
+            "content": content,
+            "importance": importance,
+            "context_type": context_type
+        }
+        
+        if not self.write_behind:
+            return self._persist(event)
+        
+        return self._enqueue(event)
+    
+    def _persist(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Write one event to all layers via HelenaCore"""
+        return self.helena.save_to_all_layers(**self._helena_event(event))
+    
+    def _helena_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """HelenaCore save arguments for a memory event"""
+        return {
+            "event_type": "agent_context",
+            "content": event["content"],
+            "importance": event["importance"],
+            "made_by": self.agent_name,
+            "additional_data": {
                 "agent_name": self.agent_name,
-                "context_type": context_type
+                "context_type": event["context_type"]
             }
-        )
+        }
+    
+    # ==================== WRITE-BEHIND ====================
+    
+    def _enqueue(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue an event for the background worker (blocks while full)"""
+        # Checked under the lock close() takes, so an event is either
+        # counted before close() flushes or rejected
+        with self._pending_cond:
+            if self._closed:
+                raise RuntimeError(f"AgentMemory for {self.agent_name} is closed")
+            self._ensure_worker()
+            self._pending += 1
+        try:
+            self._queue.put(event, timeout=self.put_timeout)
+        except queue.Full:
+            self._mark_done(1)
+            self._count("dropped")
+            print(f"⚠️  {self.agent_name}: memory queue full, event dropped")
+            return {"success": False, "queued": False, "queue_depth": self._queue.qsize()}
+        
+        self._count("enqueued")
+        return {"success": True, "queued": True, "queue_depth": self._queue.qsize()}
+    
+    def _ensure_worker(self):
+        """Start the background worker on first use"""
+        if self._worker is not None:
+            return
+        with self._pending_cond:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._drain,
+                    name=f"agent-memory-{self.agent_name}",
+                    daemon=True
+                )
+                self._worker.start()
+                _open_memories.add(self)
+    
+    def _drain(self):
+        """Worker loop: take up to batch_size events and persist them"""
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            
+            batch = [event]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is None:
+                    stop = True
+                    break
+                batch.append(event)
+            
+            self._count("batches")
+            self._persist_batch(batch)
+            self._mark_done(len(batch))
+            
+            if stop:
+                return
+    
+    def _persist_batch(self, batch: List[Dict[str, Any]]):
+        """
+        Persist a drained batch with one HelenaCore.save_many call
+        
+        Events that nothing could be saved for are retried one by one.
+        """
+        try:
+            results = self.helena.save_many(
+                [self._helena_event(event) for event in batch]
+            )["events"]
+        except Exception as e:
+            print(f"⚠️  {self.agent_name}: memory batch write error: {e}")
+            results = [None] * len(batch)
+        
+        for event, result in zip(batch, results):
+            if result is not None and not self._nothing_saved(result):
+                self._count("saved" if result["success"] else "failed")
+            else:
+                self._count("retried")
+                self._persist_with_retry(event)
+    
+    @staticmethod
+    def _nothing_saved(result: Dict[str, Any]) -> bool:
+        """True when every attempted layer failed"""
+        statuses = [r["status"] for r in result["layers"].values()]
+        return "success" not in statuses and "failed" in statuses
+    
+    def _persist_with_retry(self, event: Dict[str, Any]):
+        """
+        Persist one queued event, retrying only when nothing was saved
+        
+        A partial result (some layers failed) is not retried, because
+        replaying it would duplicate the layers that did succeed.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = self._persist(event)
+                nothing_saved = self._nothing_saved(result)
+            except Exception as e:
+                print(f"⚠️  {self.agent_name}: memory write error: {e}")
+                result, nothing_saved = None, True
+            
+            if not nothing_saved:
+                self._count("saved" if result["success"] else "failed")
+                return
+            
+            if attempt < self.max_retries:
+                self._count("retried")
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        
+        self._count("failed")
+    
+    def _count(self, metric: str, amount: int = 1):
+        """Increment a write-behind counter (thread-safe)"""
+        with self._pending_cond:
+            self.metrics[metric] += amount
+    
+    def _mark_done(self, count: int):
+        """Mark queued events as finished and wake flush() waiters"""
+        with self._pending_cond:
+            self._pending -= count
+            if self._pending <= 0:
+                self._pending_cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued event has been persisted
+        
+        Args:
+            timeout: Max seconds to wait (None = wait forever)
+            
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._pending_cond:
+            return self._pending_cond.wait_for(lambda: self._pending <= 0, timeout)
+    
+    def close(self, timeout: Optional[float] = None):
+        """
+        Flush pending events and stop the background worker
+        
+        If the flush times out (a layer is stalled) the unsaved events
+        are reported and the daemon worker is left to finish or die with
+        the process, instead of blocking on a full queue.
+        """
+        with self._pending_cond:
+            if self._closed:
+                return
+            self._closed = True
+        
+        if self._worker is not None:
+            _open_memories.discard(self)
+            if not self.flush(timeout):
+                print(f"⚠️  {self.agent_name}: closed with {self._pending} memory events not persisted")
+                return
+            try:
+                self._queue.put(None, timeout=self.put_timeout)
+            except queue.Full:
+                return
+            self._worker.join(timeout)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Write-behind counters plus current queue depth"""
+        return {
+            **self.metrics,
+            "queue_depth": self._queue.qsize(),
+            "pending": self._pending
+        }
         
     def load(self, query: str, limit: int = 5) -> List[str]:
         """
@@ -50,7 +50,8 @@ class BaseAgent:
         name: str,
         role: str,
         specialization: str,
-        project_id: str = "destiny-team-framework-master"
+        project_id: str = "destiny-team-framework-master",
+        write_behind_memory: bool = False
     ):
         """
         Initialize base agent
@@ -60,6 +61,8 @@ class BaseAgent:
             role: Agent's role (e.g., "Developer", "QA Engineer")
             specialization: What agent specializes in
             project_id: Project identifier for memory system
+            write_behind_memory: Persist memories in the background so
+                receive_task/process_task don't wait on the 4 layers
         """
         self.name = name
         self.role = role
@@ -68,7 +71,11 @@ class BaseAgent:
         self.project_id = project_id
         
         # Memory system
-        self.memory = AgentMemory(agent_name=name, project_id=project_id)
+        self.memory = AgentMemory(
+            agent_name=name,
+            project_id=project_id,
+            write_behind=write_behind_memory
+        )
         
         # Task management
         self.task_queue: List[Task] = []
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+RedisCache value codec - encode/decode speed and stored size
+
+Compares the legacy json.dumps/json.loads path with CacheCodec settings
+on typical cached values (search-result lists of 5 - 100 hits). Codecs
+whose optional packages (msgpack, lz4, orjson) are missing are skipped.
+
+No Redis server required - measures serialization only.
+
+Usage:
+    python benchmarks/bench_cache_codec.py
+    python benchmarks/bench_cache_codec.py --results 20 100 --repeat 2000
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cache_codec
+from cache_codec import CacheCodec
+
+
+def search_results(count: int) -> list:
+    """Shape of MasterOrchestrator.search results"""
+    return [
+        {
+            "id": f"5f1c2a9e-0000-4000-8000-{i:012d}",
+            "score": round(0.92 - i * 0.004, 4),
+            "content": (
+                f"Decision {i}: we keep PostgreSQL as the source of truth and "
+                "cache hot reads in Redis; Qdrant only stores embeddings."
+            ),
+            "sender": ["Aleksander Nowak", "Tomasz Kamiński", "Anna Kowalczyk"][i % 3],
+            "timestamp": f"2025-11-03T12:{i % 60:02d}:00",
+            "message_type": "DECISION",
+            "importance": 0.8,
+            "tags": ["architecture", "database"],
+            "source": "qdrant"
+        }
+        for i in range(count)
+    ]
+
+
+def codecs() -> list:
+    """(name, encode, decode) for every codec available here"""
+    options = [("legacy json", json.dumps, json.loads)]
+    settings = [
+        ("json", None), ("json", "zlib"), ("json", "lz4"),
+        ("msgpack", None), ("msgpack", "zlib"), ("msgpack", "lz4"),
+    ]
+    for serializer, compression in settings:
+        try:
+            codec = CacheCodec(serializer, compression, compress_threshold=1024)
+        except ImportError:
+            continue
+        name = ("orjson" if serializer == "json" and cache_codec.orjson else serializer)
+        name += f" + {compression}" if compression else ""
+        options.append((name, codec.encode, codec.decode))
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RedisCache codecs")
+    parser.add_argument("--results", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("  Cache codec: encode / decode µs and bytes stored")
+    print("=" * 70)
+
+    for count in args.results:
+        value = search_results(count)
+        print(f"\n{count} search results")
+        print(f"{'codec':<20}{'encode µs':>11}{'decode µs':>11}{'bytes':>9}")
+        for name, encode, decode in codecs():
+            raw = encode(value)
+            encode_us = timeit.timeit(lambda: encode(value), number=args.repeat) / args.repeat * 1e6
+            decode_us = timeit.timeit(lambda: decode(raw), number=args.repeat) / args.repeat * 1e6
+            print(f"{name:<20}{encode_us:>11.1f}{decode_us:>11.1f}{len(raw):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+LMStudioEmbeddings.embed_batch - throughput benchmark
+
+Runs against a local stub embeddings server (no LM Studio needed) that
+simulates model latency: a fixed per-request overhead plus a cost per
+input character. Compares the old behaviour (10 texts per request, one
+request at a time) with char-capped, concurrent batches.
+
+Usage:
+    python benchmarks/bench_embed_batch.py --texts 2000
+    python benchmarks/bench_embed_batch.py --workers 8 --max-chars 32000
+    python benchmarks/bench_embed_batch.py --request-ms 50 --char-us 5
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lmstudio_embeddings import LMStudioEmbeddings
+
+
+def start_stub_server(request_ms: float, char_us: float, dimension: int) -> ThreadingHTTPServer:
+    """Stub /v1/embeddings that sleeps like a model server would"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            texts = body["input"]
+            chars = sum(len(t) for t in texts)
+            time.sleep(request_ms / 1000 + chars * char_us / 1_000_000)
+
+            vector = [0.0] * dimension
+            payload = json.dumps({"data": [{"embedding": vector} for _ in texts]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(base_url: str, texts: list, batch_size: int, workers: int, max_chars: int) -> float:
+    """Texts per second for one embed_batch configuration (cache disabled)"""
+    embedder = LMStudioEmbeddings(
+        base_url=base_url,
+        cache_size=0,
+        max_batch_chars=max_chars,
+        max_workers=workers
+    )
+    start = time.perf_counter()
+    embedder.embed_batch(texts, batch_size=batch_size, progress_callback=lambda done, total: None)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embed_batch throughput")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-chars", type=int, default=16000)
+    parser.add_argument("--request-ms", type=float, default=20.0,
+                        help="Simulated per-request overhead")
+    parser.add_argument("--char-us", type=float, default=2.0,
+                        help="Simulated cost per input character")
+    parser.add_argument("--dimension", type=int, default=1024)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.request_ms, args.char_us, args.dimension)
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    # Realistic spread of message lengths (40 - 400 chars)
+    texts = [f"Message {i}: " + "x" * (40 + (i * 37) % 360) for i in range(args.texts)]
+
+    configs = [
+        ("serial, 10/request", 10, 1, 10 ** 9),
+        (f"serial, {args.max_chars} chars", args.batch_size, 1, args.max_chars),
+        (f"{args.workers} workers, {args.max_chars} chars", args.batch_size, args.workers, args.max_chars),
+    ]
+
+    print("=" * 70)
+    print(f"  embed_batch throughput ({args.texts} texts, "
+          f"{args.request_ms:g} ms/request + {args.char_us:g} us/char)")
+    print("=" * 70)
+    print(f"{'configuration':<36}{'texts/sec':>12}")
+    for name, batch_size, workers, max_chars in configs:
+        rate = run(base_url, texts, batch_size, workers, max_chars)
+        print(f"{name:<36}{rate:>12.0f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+HelenaCore.save_to_all_layers - per-save latency benchmark
+
+Compares the legacy "subprocess" backend (curl + docker exec per call)
+with the "client" backend (long-lived native clients).
+
+Requires the full stack (PostgreSQL, Neo4j, Qdrant, Redis, LM Studio).
+
+Usage:
+    python benchmarks/bench_helena_save.py --saves 50
+    python benchmarks/bench_helena_save.py --sequential   # layers one by one
+    python benchmarks/bench_helena_save.py --backend client --event-type decision
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from helena_core import HelenaCore
+
+
+def run(
+    backend: str, saves: int, event_type: str, project_id: str,
+    concurrent_layers: bool = True
+) -> dict:
+    """Time `saves` calls of save_to_all_layers on one backend"""
+    helena = HelenaCore(
+        project_id=project_id,
+        backend=backend,
+        concurrent_layers=concurrent_layers
+    )
+    timings = []
+    failures = 0
+
+    for i in range(saves):
+        start = time.perf_counter()
+        # HelenaCore prints a banner per save - keep it out of the timings
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = helena.save_to_all_layers(
+                event_type=event_type,
+                content=f"Benchmark event {i} ({backend})",
+                importance=0.8,
+                made_by="Benchmark",
+                additional_data={"agent_name": "Benchmark", "context_key": f"bench_{i}"}
+            )
+        timings.append((time.perf_counter() - start) * 1000)
+        if not result["success"]:
+            failures += 1
+
+    helena.close()
+    timings.sort()
+    return {
+        "backend": backend,
+        "saves": saves,
+        "failures": failures,
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HelenaCore save latency")
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--backend", choices=["both", *HelenaCore.BACKENDS], default="both")
+    parser.add_argument("--event-type", default="agent_context")
+    parser.add_argument("--project-id", default="destiny-team-framework-master")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Write layers one after another (concurrent_layers=False)")
+    args = parser.parse_args()
+
+    backends = HelenaCore.BACKENDS[::-1] if args.backend == "both" else [args.backend]
+
+    print("=" * 70)
+    mode = "sequential" if args.sequential else "concurrent"
+    print(f"  HelenaCore save latency ({args.saves} saves, type={args.event_type}, {mode})")
+    print("=" * 70)
+    print(f"{'backend':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'failed':>9}")
+
+    for backend in backends:
+        r = run(backend, args.saves, args.event_type, args.project_id,
+                concurrent_layers=not args.sequential)
+        print(f"{r['backend']:<12}{r['mean_ms']:>10.1f}{r['p50_ms']:>10.1f}"
+              f"{r['p95_ms']:>10.1f}{r['failures']:>9}")
+
+
+if __name__ == "__main__":
+    main()
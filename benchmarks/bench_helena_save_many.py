@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+HelenaCore.save_many - bulk import throughput benchmark
+
+Compares importing N events with one save_to_all_layers call per event
+against a single save_many call (one request per layer per chunk).
+
+Requires the full stack (PostgreSQL, Neo4j, Qdrant, Redis, LM Studio).
+
+Usage:
+    python benchmarks/bench_helena_save_many.py --events 1000 10000 100000
+    python benchmarks/bench_helena_save_many.py --events 5000 --chunk-size 1000
+    python benchmarks/bench_helena_save_many.py --skip-single   # bulk only
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from helena_core import HelenaCore
+
+
+def make_events(count: int) -> list:
+    """Realistic mix: mostly agent contexts, some messages and decisions"""
+    events = []
+    for i in range(count):
+        if i % 10 == 0:
+            event_type, importance = "decision", 0.9
+        elif i % 3 == 0:
+            event_type, importance = "message", 0.6
+        else:
+            event_type, importance = "agent_context", 0.7
+        events.append({
+            "event_type": event_type,
+            "content": f"Benchmark import event {i}",
+            "importance": importance,
+            "made_by": "Benchmark",
+            "additional_data": {"agent_name": "Benchmark", "context_key": f"bench_{i}"}
+        })
+    return events
+
+
+def run_single(helena: HelenaCore, events: list) -> float:
+    """Events per second with one save_to_all_layers per event"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for e in events:
+            helena.save_to_all_layers(
+                e["event_type"], e["content"], e["importance"],
+                e["made_by"], e["additional_data"]
+            )
+    return len(events) / (time.perf_counter() - start)
+
+
+def run_bulk(helena: HelenaCore, events: list, chunk_size: int) -> float:
+    """Events per second with one save_many call"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        helena.save_many(events, chunk_size=chunk_size)
+    return len(events) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HelenaCore bulk imports")
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--project-id", default="destiny-team-framework-master")
+    parser.add_argument("--skip-single", action="store_true",
+                        help="Only run save_many (per-event saves are slow at 100k)")
+    args = parser.parse_args()
+
+    helena = HelenaCore(project_id=args.project_id)
+
+    print("=" * 70)
+    print(f"  HelenaCore import throughput (chunk_size={args.chunk_size})")
+    print("=" * 70)
+    print(f"{'events':>10}{'single ev/s':>15}{'save_many ev/s':>17}{'speedup':>10}")
+
+    for count in args.events:
+        events = make_events(count)
+        bulk = run_bulk(helena, events, args.chunk_size)
+        if args.skip_single:
+            print(f"{count:>10}{'-':>15}{bulk:>17.0f}{'-':>10}")
+            continue
+        single = run_single(helena, events)
+        print(f"{count:>10}{single:>15.0f}{bulk:>17.0f}{bulk / single:>9.1f}x")
+
+    helena.close()
+
+
+if __name__ == "__main__":
+    main()
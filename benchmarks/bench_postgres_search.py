@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+PostgresContextStore.search_messages - ILIKE scan vs tsvector/GIN search
+
+Seeds a scratch project with N synthetic messages (server-side, via
+generate_series), then times the legacy ILIKE query against the ranked
+full-text query for a few keyword searches.
+
+Needs a PostgreSQL 12+ server; the messages table is migrated to full-text
+search first if needed (python postgres_context_store.py --migrate-fts).
+Seeded rows are deleted afterwards unless --keep is given (re-runs with
+--keep reuse them).
+
+Usage:
+    python benchmarks/bench_postgres_search.py
+    python benchmarks/bench_postgres_search.py --messages 100000 --repeat 5
+    python benchmarks/bench_postgres_search.py --dsn "dbname=test host=db" --keep
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from postgres_context_store import PostgresContextStore
+
+
+PROJECT_ID = "bench-full-text-search"
+
+VOCABULARY = [
+    "database", "migration", "schema", "postgres", "redis", "cache", "latency",
+    "deployment", "pipeline", "security", "audit", "requirements", "architecture",
+    "decision", "review", "embedding", "vector", "qdrant", "graph", "neo4j",
+    "baza", "danych", "wdrożenie", "bezpieczeństwo", "wymagania", "decyzja",
+    "architektura", "przegląd", "wydajność", "kolejka", "agent", "projekt",
+    "the", "and", "with", "for", "team", "should", "keep", "move", "use",
+]
+
+QUERIES = [
+    "database migration",
+    "redis cache latency",
+    "bezpieczeństwo wdrożenie",
+    "architecture decision review",
+    "databse",  # typo: only the trigram index finds it
+]
+
+SEED_SQL = """
+INSERT INTO messages (id, project_id, sender, message_type, content, timestamp, importance, tags)
+SELECT
+    'bench-' || g,
+    %(project_id)s,
+    (ARRAY['Aleksander', 'Helena', 'Tomasz', 'Anna'])[1 + g %% 4],
+    'UPDATE',
+    (SELECT string_agg(v.words[1 + floor(random() * array_length(v.words, 1))::int], ' ')
+     FROM generate_series(1, 14) WHERE g > 0),
+    NOW() - (g || ' seconds')::interval,
+    random(),
+    ARRAY[v.words[1 + g %% array_length(v.words, 1)]]
+FROM generate_series(%(start)s, %(end)s) g, (SELECT %(vocabulary)s::text[] AS words) v
+ON CONFLICT (id) DO NOTHING
+"""
+
+
+def seed(store: PostgresContextStore, count: int, chunk: int = 100_000):
+    with store.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM messages WHERE project_id = %s", (PROJECT_ID,))
+        existing = cur.fetchone()[0]
+
+    if existing >= count:
+        print(f"Reusing {existing:,} seeded messages")
+        return
+
+    start = time.perf_counter()
+    for first in range(existing + 1, count + 1, chunk):
+        last = min(first + chunk - 1, count)
+        with store.cursor() as cur:
+            cur.execute(SEED_SQL, {
+                "project_id": PROJECT_ID,
+                "start": first,
+                "end": last,
+                "vocabulary": VOCABULARY
+            })
+        print(f"  Seeded {last:,}/{count:,}", end="\r")
+
+    with store.cursor() as cur:
+        cur.execute("ANALYZE messages")
+    print(f"\nSeeded {count - existing:,} messages in {time.perf_counter() - start:.1f}s")
+
+
+def timed(fn, repeat: int):
+    """(best ms, result) over `repeat` runs"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-text message search")
+    parser.add_argument("--dsn", default="dbname=destiny_team user=user password=password host=localhost port=5432")
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded messages")
+    args = parser.parse_args()
+
+    store = PostgresContextStore(args.dsn)
+    if not store.full_text_search:
+        store.migrate_full_text_search()
+
+    print("=" * 70)
+    print(f"  search_messages on {args.messages:,} messages (best of {args.repeat})")
+    print("=" * 70)
+    seed(store, args.messages)
+
+    print(f"\n{'query':<32}{'ILIKE ms':>10}{'hits':>6}{'FTS ms':>10}{'hits':>6}")
+    for query in QUERIES:
+        keywords = store._extract_keywords(query)
+        ilike_ms, ilike = timed(
+            lambda: store._search_messages_ilike(PROJECT_ID, keywords, args.limit), args.repeat
+        )
+        fts_ms, fts = timed(
+            lambda: store.search_messages(PROJECT_ID, query, args.limit), args.repeat
+        )
+        print(f"{query:<32}{ilike_ms:>10.1f}{len(ilike):>6}{fts_ms:>10.1f}{len(fts):>6}")
+
+    if not args.keep:
+        with store.cursor() as cur:
+            cur.execute("DELETE FROM messages WHERE project_id = %s", (PROJECT_ID,))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
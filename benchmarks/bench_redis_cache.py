@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+RedisCache composite operations - ops/sec, round-trip vs pipelined
+
+Compares the old multi-round-trip sequences (LPUSH then LTRIM, TTL then
+SETEX, INFO then DBSIZE) with the pipelined / Lua-scripted versions, and
+bulk add_many_to_hot_memory against one add per message.
+
+Needs a Redis server (default localhost:6379), or fakeredis with --fake
+(in-process, so it shows command overhead only - no network latency).
+Keys are written under a throwaway prefix and removed afterwards.
+
+Usage:
+    python benchmarks/bench_redis_cache.py
+    python benchmarks/bench_redis_cache.py --host 10.0.0.5 --ops 20000
+    python benchmarks/bench_redis_cache.py --fake
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from redis_cache import RedisCache
+
+
+def make_cache(args) -> RedisCache:
+    cache = RedisCache(host=args.host, port=args.port, prefix="destiny:bench:")
+    if args.fake:
+        try:
+            import fakeredis
+        except ImportError:
+            sys.exit('--fake requires: pip install "fakeredis[lua]"')
+        cache.client = fakeredis.FakeRedis()
+    return cache
+
+
+def rate(label: str, ops: int, fn):
+    """Run fn(i) `ops` times and print ops/sec"""
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<38}{ops / elapsed:>12,.0f} ops/s")
+
+
+def message(i: int) -> dict:
+    return {"id": f"msg-{i}", "sender": "bench", "content": f"Message {i}", "timestamp": "2025-11-03T12:00:00"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RedisCache pipelining")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=10, help="Messages per add_many call")
+    parser.add_argument("--fake", action="store_true", help="Use fakeredis instead of a server")
+    args = parser.parse_args()
+
+    cache = make_cache(args)
+    client = cache.client
+    hot_key = cache._make_key("hot_memory:bench")
+    session_key = cache._make_key("session:bench")
+
+    print("=" * 70)
+    print(f"  RedisCache round-trips ({'fakeredis' if args.fake else f'{args.host}:{args.port}'})")
+    print("=" * 70)
+
+    def legacy_hot(i):
+        client.lpush(hot_key, json.dumps(message(i)))
+        client.ltrim(hot_key, 0, 9)
+
+    print("\nHot memory (messages/s)")
+    rate("LPUSH + LTRIM (2 round-trips)", args.ops, legacy_hot)
+    rate("add_to_hot_memory (MULTI)", args.ops, lambda i: cache.add_to_hot_memory("bench", message(i)))
+
+    batches = max(1, args.ops // args.batch)
+    start = time.perf_counter()
+    for b in range(batches):
+        cache.add_many_to_hot_memory("bench", [message(b * args.batch + j) for j in range(args.batch)])
+    elapsed = time.perf_counter() - start
+    label = f"add_many_to_hot_memory (x{args.batch})"
+    print(f"  {label:<38}{batches * args.batch / elapsed:>12,.0f} ops/s")
+
+    def legacy_session(i):
+        ttl = client.ttl(session_key)
+        client.setex(session_key, ttl if ttl > 0 else 3600, cache.codec.encode({"step": i}))
+
+    print("\nSession update")
+    cache.create_session("bench", {"step": 0}, ttl=3600)
+    rate("TTL + SETEX (2 round-trips, racy)", args.ops, legacy_session)
+    rate("update_session (Lua)", args.ops, lambda i: cache.update_session("bench", {"step": i}))
+
+    def legacy_stats(i):
+        client.info()
+        client.dbsize()
+
+    print("\nCache stats")
+    stat_ops = max(1, args.ops // 10)
+    rate("INFO + DBSIZE (2 round-trips)", stat_ops, legacy_stats)
+    rate("get_cache_stats (pipelined)", stat_ops, lambda i: cache.get_cache_stats())
+
+    client.delete(hot_key, session_key)
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
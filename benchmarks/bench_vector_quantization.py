@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Vector quantization - recall@k vs RAM benchmark
+
+Builds the same synthetic corpus (low-rank structure + noise, shaped like
+1024-dim E5 embeddings) in LocalVectorIndex collections with no
+quantization, int8 scalar and binary codes, originals memory-mapped on
+disk, and reports recall@k against exact search, RAM per vector and
+query latency. The codes use the same sizes as Qdrant's scalar/binary
+quantization, so the RAM column carries over to a Qdrant node.
+
+No services required.
+
+Usage:
+    python benchmarks/bench_vector_quantization.py --points 20000
+    python benchmarks/bench_vector_quantization.py --k 20 --oversampling 1 2 4 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from local_vector_index import LocalVectorIndex
+
+
+def make_corpus(points: int, dimension: int, seed: int = 0) -> np.ndarray:
+    """Low-rank latent structure plus noise, like real text embeddings"""
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(points, 64)).astype(np.float32)
+    basis = rng.normal(size=(64, dimension)).astype(np.float32)
+    return latent @ basis + rng.normal(scale=4.0, size=(points, dimension)).astype(np.float32)
+
+
+def run(
+    corpus: np.ndarray, queries: np.ndarray, quantization, oversampling: float,
+    k: int, directory: Path
+) -> dict:
+    """Recall@k, RAM and latency for one quantization setting"""
+    name = f"bench-{quantization or 'float32'}"
+    index = LocalVectorIndex(directory, ivf_threshold=0, oversampling=oversampling)
+    index.create_collection(name, dimension=corpus.shape[1], quantization=quantization)
+    for start in range(0, len(corpus), 5000):
+        chunk = corpus[start:start + 5000]
+        index.upsert(name, list(range(start, start + len(chunk))), chunk, [{} for _ in chunk])
+
+    recalls, timings = [], []
+    for query in queries:
+        exact = {h["id"] for h in index.search(name, query, limit=k, exact=True)}
+        started = time.perf_counter()
+        hits = index.search(name, query, limit=k)
+        timings.append((time.perf_counter() - started) * 1000)
+        recalls.append(len(exact & {h["id"] for h in hits}) / k)
+
+    memory = index.memory_bytes(name)
+    index.delete_collection(name)
+    return {
+        "recall": float(np.mean(recalls)),
+        "ram_bytes_per_vector": memory["ram"] / len(corpus),
+        "ram_mb": memory["ram"] / 1e6,
+        "query_ms": float(np.median(timings))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recall vs RAM for quantized vectors")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, nargs="+", default=[2.0, 4.0])
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.points, args.dimension)
+    rng = np.random.default_rng(1)
+    picks = rng.choice(args.points, args.queries, replace=False)
+    queries = corpus[picks] + rng.normal(scale=4.0, size=(args.queries, args.dimension))
+
+    print("=" * 70)
+    print(f"  Recall@{args.k} vs RAM ({args.points} x {args.dimension}-dim vectors)")
+    print("=" * 70)
+    print(f"{'mode':<10}{'oversample':>11}{'recall':>9}{'B/vector':>10}{'RAM MB':>9}{'query ms':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = [(None, 1.0)] + [
+            (mode, factor) for mode in ("scalar", "binary") for factor in args.oversampling
+        ]
+        for quantization, oversampling in settings:
+            r = run(corpus, queries, quantization, oversampling, args.k, Path(tmp))
+            label = quantization or "float32"
+            factor = f"{oversampling:g}x" if quantization else "-"
+            print(f"{label:<10}{factor:>11}{r['recall']:>9.3f}{r['ram_bytes_per_vector']:>10.0f}"
+                  f"{r['ram_mb']:>9.1f}{r['query_ms']:>10.2f}")
+
+    print()
+    print("float32 keeps the full matrix in RAM; scalar/binary keep only the")
+    print("codes in RAM and read originals from disk when rescoring.")
+
+
+if __name__ == "__main__":
+    main()
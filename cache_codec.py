@@ -0,0 +1,294 @@
+"""
+Typed value codec for RedisCache
+
+Every encoded value starts with a 1-byte header naming its format, so
+reads never have to guess (no try-JSON-then-pickle):
+
+    0x01  JSON            0x04  msgpack
+    0x02  JSON + zlib     0x05  msgpack + zlib
+    0x03  JSON + lz4      0x06  msgpack + lz4
+
+JSON is written with orjson when installed (stdlib json otherwise);
+msgpack and lz4 are optional. Values larger than `compress_threshold`
+bytes are compressed.
+
+datetime, date, UUID, set, frozenset and bytes round-trip as tagged
+objects ({"__cache_type__": "datetime", "v": "..."}); values containing
+them get the TAGGED bit in the header, so plain values skip the
+decode-side walk. numpy scalars are written as the equal Python number.
+Any other non-JSON type (Enum, dataclass, numpy array, ...) raises
+TypeError instead of silently coming back as a string - the same with
+or without orjson installed.
+
+Values written before the header existed (plain JSON, or pickle) are
+still readable: legacy JSON is decoded, legacy pickle only when
+explicitly allowed - unpickling data from a shared cache can execute
+arbitrary code.
+"""
+
+import base64
+import json
+import pickle
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # optional - stdlib json fallback
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import lz4.frame as lz4
+except ImportError:  # optional
+    lz4 = None
+
+
+JSON, JSON_ZLIB, JSON_LZ4 = 0x01, 0x02, 0x03
+MSGPACK, MSGPACK_ZLIB, MSGPACK_LZ4 = 0x04, 0x05, 0x06
+
+_HEADERS = {
+    ("json", None): JSON,
+    ("json", "zlib"): JSON_ZLIB,
+    ("json", "lz4"): JSON_LZ4,
+    ("msgpack", None): MSGPACK,
+    ("msgpack", "zlib"): MSGPACK_ZLIB,
+    ("msgpack", "lz4"): MSGPACK_LZ4,
+}
+_FORMATS = {header: fmt for fmt, header in _HEADERS.items()}
+
+# Header bit: the body contains tagged (non-JSON) values
+TAGGED = 0x10
+
+_TAG = "__cache_type__"
+
+
+def _unsupported(value: Any) -> TypeError:
+    return TypeError(
+        f"{type(value).__name__} is not cacheable - convert it first "
+        f"(e.g. dataclasses.asdict, str)"
+    )
+
+
+def _tag(value: Any) -> Any:
+    """Allow-listed non-JSON value -> tagged object (serializer default hook)"""
+    if isinstance(value, Enum):
+        raise _unsupported(value)
+    if isinstance(value, datetime):
+        return {_TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {_TAG: "date", "v": value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {_TAG: type(value).__name__, "v": list(value)}
+    if isinstance(value, bytes):
+        return {_TAG: "bytes", "v": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, UUID):
+        return {_TAG: "uuid", "v": str(value)}
+    if type(value).__module__ == "numpy" and getattr(value, "shape", None) == ():
+        return value.item()
+    # str/int/float/dict/list subclasses (orjson passthrough) - what
+    # stdlib json writes for them
+    for base in (str, int, float, dict, list):
+        if isinstance(value, base):
+            return base(value)
+    raise _unsupported(value)
+
+
+# Types orjson and stdlib json both write as themselves
+_PLAIN = frozenset((str, int, float, bool, type(None)))
+
+
+def _scan(value: Any) -> bool:
+    """
+    True if `value` contains a UUID; raises TypeError on an Enum
+
+    orjson (and stdlib json, for str/int Enums) writes both natively,
+    so the default hook never sees them.
+    """
+    kind = type(value)
+    if kind in _PLAIN:
+        return False
+    found = False
+    if kind is dict or isinstance(value, dict):
+        for key, item in value.items():
+            if type(key) not in _PLAIN and isinstance(key, Enum):
+                raise _unsupported(key)
+            if type(item) not in _PLAIN:
+                found = _scan(item) or found
+        return found
+    if kind is list or isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            if type(item) not in _PLAIN:
+                found = _scan(item) or found
+        return found
+    if isinstance(value, Enum):
+        raise _unsupported(value)
+    return isinstance(value, UUID)
+
+
+_UNTAG = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "set": set,
+    "frozenset": frozenset,
+    "bytes": base64.b64decode,
+    "uuid": UUID,
+}
+
+
+def _untag(value: Any) -> Any:
+    """Inverse of _tag over a decoded structure"""
+    if isinstance(value, dict):
+        if _TAG in value and value[_TAG] in _UNTAG:
+            return _UNTAG[value[_TAG]](_untag(value["v"]))
+        return {k: _untag(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_untag(v) for v in value]
+    return value
+
+
+class LegacyPickleError(ValueError):
+    """A pre-codec pickled value was read with legacy pickle disabled"""
+
+
+class CacheCodec:
+    """
+    Header-tagged serializer for cache values.
+
+    Usage:
+        codec = CacheCodec()                       # orjson + zlib for > 1 KB
+        raw = codec.encode({"results": [...]})
+        value = codec.decode(raw)
+    """
+
+    def __init__(
+        self,
+        serializer: str = "json",
+        compression: Optional[str] = "auto",
+        compress_threshold: int = 1024,
+        allow_legacy_pickle: bool = False
+    ):
+        """
+        Initialize codec.
+
+        Args:
+            serializer: "json" (orjson if available) or "msgpack"
+            compression: "zlib", "lz4", None, or "auto" (lz4 if installed,
+                else zlib)
+            compress_threshold: Compress values larger than this (bytes)
+            allow_legacy_pickle: Decode pre-codec pickled values (only for
+                trusted caches, while migrating)
+        """
+        if serializer not in ("json", "msgpack"):
+            raise ValueError(f"serializer must be 'json' or 'msgpack', got {serializer!r}")
+        if serializer == "msgpack" and msgpack is None:
+            raise ImportError("msgpack serializer requires: pip install msgpack")
+        if compression == "auto":
+            compression = "lz4" if lz4 is not None else "zlib"
+        if compression not in (None, "zlib", "lz4"):
+            raise ValueError(f"compression must be 'zlib', 'lz4' or None, got {compression!r}")
+        if compression == "lz4" and lz4 is None:
+            raise ImportError("lz4 compression requires: pip install lz4")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.allow_legacy_pickle = allow_legacy_pickle
+
+    # ==================== ENCODE ====================
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serialize `value` with a format header
+
+        Raises:
+            TypeError: value contains a type that can't round-trip
+        """
+        tagged = []
+
+        def default(obj):
+            result = _tag(obj)
+            if isinstance(result, dict) and _TAG in result:
+                tagged.append(True)
+            return result
+
+        body = self._serialize(value, default, has_uuid=_scan(value))
+
+        compression = None
+        if self.compression and len(body) > self.compress_threshold:
+            compression = self.compression
+            body = zlib.compress(body, 1) if compression == "zlib" else lz4.compress(body)
+
+        header = _HEADERS[(self.serializer, compression)] | (TAGGED if tagged else 0)
+        return bytes((header,)) + body
+
+    def _serialize(self, value: Any, default, has_uuid: bool = False) -> bytes:
+        if self.serializer == "msgpack":
+            return msgpack.packb(value, default=default, use_bin_type=True)
+        if orjson is not None and not has_uuid:
+            # Passthrough: orjson would otherwise turn datetimes,
+            # dataclasses and subclasses into strings/dicts without
+            # calling default (UUIDs can't be passed through - those
+            # values take the stdlib path)
+            return orjson.dumps(
+                value,
+                default=default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_SUBCLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        return json.dumps(value, default=default, separators=(",", ":")).encode("utf-8")
+
+    # ==================== DECODE ====================
+
+    def decode(self, raw: bytes) -> Any:
+        """
+        Deserialize a value written by encode() or by the legacy
+        JSON/pickle format.
+
+        Raises:
+            LegacyPickleError: Legacy pickled value and pickle not allowed
+        """
+        fmt = _FORMATS.get(raw[0] & ~TAGGED) if raw else None
+        if fmt is None:
+            return self._decode_legacy(raw)
+
+        serializer, compression = fmt
+        body = raw[1:]
+        if compression == "zlib":
+            body = zlib.decompress(body)
+        elif compression == "lz4":
+            if lz4 is None:
+                raise ImportError("value is lz4-compressed: pip install lz4")
+            body = lz4.decompress(body)
+
+        if serializer == "msgpack":
+            if msgpack is None:
+                raise ImportError("value is msgpack-encoded: pip install msgpack")
+            value = msgpack.unpackb(body, raw=False)
+        else:
+            value = orjson.loads(body) if orjson is not None else json.loads(body)
+        return _untag(value) if raw[0] & TAGGED else value
+
+    def _decode_legacy(self, raw: bytes) -> Any:
+        """Values written before the codec: JSON text, else pickle"""
+        if raw[:1] == b"\x80":  # pickle protocol 2+ opcode
+            if not self.allow_legacy_pickle:
+                raise LegacyPickleError("legacy pickled cache value (pickle disabled)")
+            return pickle.loads(raw)
+        return json.loads(raw)
+
+    @staticmethod
+    def describe(raw: bytes) -> Dict[str, Any]:
+        """Format of an encoded value (for debugging / migration reports)"""
+        fmt = _FORMATS.get(raw[0] & ~TAGGED) if raw else None
+        if fmt is None:
+            legacy = "pickle" if raw[:1] == b"\x80" else "json"
+            return {"serializer": legacy, "compression": None, "legacy": True}
+        return {"serializer": fmt[0], "compression": fmt[1], "legacy": False}
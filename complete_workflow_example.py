@@ -145,7 +145,7 @@ def simulate_full_project_session():
     print()
     
     # Add some tasks to work queue
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         cur.execute("""
             INSERT INTO agent_work_queue (agent_name, project_id, task, status, priority)
             VALUES 
@@ -153,10 +153,9 @@ def simulate_full_project_session():
                 ('Tomasz Zieliński', %s, 'Add rate limiting', 'in_progress', 7),
                 ('Anna Nowakowska', %s, 'Test payment flow', 'pending', 6)
         """, (project_id, project_id, project_id))
-        postgres.conn.commit()
     
     # Add decision to decisions table
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         cur.execute("""
             INSERT INTO decisions (project_id, decision_text, made_by, timestamp)
             VALUES (%s, %s, %s, NOW())
@@ -165,7 +164,6 @@ def simulate_full_project_session():
             "Stripe API chosen for payment processing",
             "Katarzyna Wiśniewska"
         ))
-        postgres.conn.commit()
     
     input("\nPress Enter to end session and generate briefing...")
     
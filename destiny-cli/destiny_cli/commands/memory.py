@@ -656,16 +656,23 @@ def health(
 def cleanup(
     older_than_days: int = typer.Option(90, "--older-than", help="Delete memories older than N days"),
     project: Optional[str] = typer.Option(None, "--project", help="Project ID to clean up"),
+    all_projects: bool = typer.Option(False, "--all-projects", help="Clean up every project"),
+    table: str = typer.Option("events", "--table", help="events or messages (agent conversations)"),
+    archive: bool = typer.Option(False, "--archive", help="messages: move old partitions to messages_archive instead of dropping"),
     dry_run: bool = typer.Option(True, "--dry-run/--execute", help="Show what would be deleted"),
     confirm: bool = typer.Option(False, "--confirm", "-y", help="Skip confirmation prompt")
 ):
     """
     Clean up old memories (DESTRUCTIVE - use with caution!)
     
+    On a partitioned messages table whole partitions are dropped (or
+    archived) instead of deleting row by row.
+    
     Examples:
         destiny memory cleanup --older-than 90 --dry-run
         destiny memory cleanup --project test-* --dry-run
         destiny memory cleanup --older-than 180 --execute --confirm
+        destiny memory cleanup --table messages --all-projects --older-than 365 --execute --archive
     """
     console.print("\n[bold red]⚠️ MEMORY CLEANUP (DESTRUCTIVE OPERATION)[/bold red]\n")
     
@@ -673,11 +680,15 @@ def cleanup(
     if not helena:
         return
     
-    project_id = project or helena.project_id
+    if table not in ("events", "messages"):
+        console.print(f"[red]Unknown table: {table} (use events or messages)[/red]\n")
+        return
+    
+    project_id = None if all_projects else (project or helena.project_id)
     cutoff_date = datetime.now() - timedelta(days=older_than_days)
     
-    console.print(f"[bold]Target:[/bold] Memories older than {cutoff_date.strftime('%Y-%m-%d')}")
-    console.print(f"[bold]Project:[/bold] {project_id}")
+    console.print(f"[bold]Target:[/bold] {table.capitalize()} older than {cutoff_date.strftime('%Y-%m-%d')}")
+    console.print(f"[bold]Project:[/bold] {project_id or 'all projects'}")
     console.print(f"[bold]Mode:[/bold] {'DRY RUN (no changes)' if dry_run else 'EXECUTE (will delete!)'}\n")
     
     if not dry_run and not confirm:
@@ -686,6 +697,10 @@ def cleanup(
             console.print("[yellow]Cancelled[/yellow]\n")
             return
     
+    if table == "messages":
+        _cleanup_messages(helena, cutoff_date, project_id, archive, dry_run)
+        return
+    
     try:
         import psycopg2
         conn = psycopg2.connect(helena.postgres_conn)
@@ -694,7 +709,7 @@ def cleanup(
         # Count affected records
         cursor.execute("""
             SELECT COUNT(*) FROM events
-            WHERE timestamp < %s AND project_id = %s
+            WHERE timestamp < %s AND project_id = COALESCE(%s, project_id)
         """, (cutoff_date, project_id))
         
         count = cursor.fetchone()[0]
@@ -714,7 +729,7 @@ def cleanup(
             # Execute deletion
             cursor.execute("""
                 DELETE FROM events
-                WHERE timestamp < %s AND project_id = %s
+                WHERE timestamp < %s AND project_id = COALESCE(%s, project_id)
             """, (cutoff_date, project_id))
             
             conn.commit()
@@ -729,6 +744,41 @@ def cleanup(
         console.print(f"[red]Cleanup failed: {e}[/red]\n")
 
 
+def _cleanup_messages(helena, cutoff_date: datetime, project_id: Optional[str], archive: bool, dry_run: bool):
+    """Partition-aware cleanup of the messages table (PostgresContextStore)"""
+    try:
+        from postgres_context_store import PostgresContextStore
+        store = PostgresContextStore(helena.postgres_conn)
+        try:
+            report = store.cleanup_messages(cutoff_date, project_id=project_id, archive=archive, dry_run=dry_run)
+        finally:
+            store.close()
+    except Exception as e:
+        console.print(f"[red]Cleanup failed: {e}[/red]\n")
+        return
+    
+    console.print(f"[bold]Layout:[/bold] {report['partitioning'] or 'not partitioned'}\n")
+    if report["partitions"]:
+        verb = "archive" if archive else "drop"
+        table = Table(title=f"Partitions to {verb}", show_header=True, header_style="bold magenta")
+        table.add_column("Partition", style="cyan")
+        for name in report["partitions"]:
+            table.add_row(name)
+        console.print(table)
+        console.print(f"[yellow]{report['partition_rows']:,} messages in {len(report['partitions'])} partitions[/yellow]")
+    console.print(f"[yellow]{report['deleted_rows']:,} messages to delete row by row[/yellow]\n")
+    
+    if not report["partitions"] and not report["deleted_rows"]:
+        console.print("[green]Nothing to clean up[/green]\n")
+    elif dry_run:
+        console.print("[bold green]✅ DRY RUN COMPLETE[/bold green]")
+        console.print("[dim]Run with --execute to actually delete these memories[/dim]\n")
+    else:
+        removed = "Archived" if archive else "Dropped"
+        console.print(f"[bold green]✅ {removed} {len(report['partitions'])} partitions, "
+                      f"deleted {report['deleted_rows']:,} messages[/bold green]\n")
+
+
 # ============================================================================
 # Main entry point (for testing)
 # ============================================================================
@@ -314,6 +314,30 @@ class TestMemoryCleanup:
         assert result.exit_code == 0
         assert "DRY RUN" in result.stdout
         assert "50" in result.stdout
+    
+    @patch('destiny_cli.commands.memory.get_helena_core')
+    @patch('postgres_context_store.PostgresContextStore')
+    def test_cleanup_messages_drops_partitions(self, mock_store_class, mock_helena):
+        """Test messages cleanup reports partitions instead of row deletes"""
+        mock_core = Mock()
+        mock_core.project_id = "test-project"
+        mock_core.postgres_conn = "test_conn"
+        mock_helena.return_value = mock_core
+        
+        mock_store = Mock()
+        mock_store.cleanup_messages.return_value = {
+            "partitioning": "month", "partitions": ["messages_y2025m01"],
+            "partition_rows": 1200, "deleted_rows": 0, "dry_run": True
+        }
+        mock_store_class.return_value = mock_store
+        
+        result = runner.invoke(app, ["cleanup", "--table", "messages", "--all-projects", "--older-than", "365"])
+        
+        assert result.exit_code == 0
+        assert "messages_y2025m01" in result.stdout
+        assert "1,200" in result.stdout
+        assert mock_store.cleanup_messages.call_args.kwargs["project_id"] is None
+        mock_store.close.assert_called_once()
 
 
 class TestMemoryIntegration:
@@ -0,0 +1,166 @@
+"""
+Embedding cache for Destiny Team
+
+Content-hash keyed cache in front of the LM Studio embedding server:
+- Memory tier: LRU of recent embeddings as read-only float32 arrays
+  (~4 KB per 1024-dim vector; converted to lists on the way out)
+- Disk tier (optional): SQLite file of float32 vectors that survives restarts
+
+Keys are sha256(model + text), so switching the embedding model never
+returns vectors from the old one.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Two-tier (LRU + optional SQLite) embedding cache.
+
+    Usage:
+        cache = EmbeddingCache(max_entries=4096, path="~/.destiny/embeddings.db")
+        vector = cache.get(model, text)
+        if vector is None:
+            vector = embed(text)
+            cache.put(model, text, vector)
+        cache.get_stats()  # {"hits": ..., "disk_hits": ..., "hit_rate": ...}
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        path: Optional[Union[str, Path]] = None
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            max_entries: Embeddings kept in the in-memory LRU (0 disables it)
+            path: SQLite file for the on-disk tier (None = memory only)
+        """
+        self.max_entries = max_entries
+        self.path = Path(path).expanduser() if path else None
+
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL
+                )
+            """)
+            self._db.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Cache key: content hash of model name + text"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Cached embedding, or None on a miss"""
+        return self.get_many(model, [text])[0]
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached embeddings for `texts` (None where missing), in order"""
+        keys = [self.key(model, text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                    self.stats["hits"] += 1
+
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            if missing and self._db is not None:
+                placeholders = ",".join("?" * len(missing))
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    missing
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)  # read-only view
+                    found[key] = vector
+                    self._remember(key, vector)
+                    self.stats["disk_hits"] += 1
+
+            self.stats["misses"] += sum(1 for key in keys if key not in found)
+
+        return [found[key].tolist() if key in found else None for key in keys]
+
+    def put(self, model: str, text: str, vector: List[float]):
+        """Store one embedding in both tiers"""
+        self.put_many(model, [text], [vector])
+
+    def put_many(self, model: str, texts: List[str], vectors: List[List[float]]):
+        """Store embeddings in both tiers"""
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.key(model, text)
+                array = np.array(vector, dtype=np.float32)
+                array.flags.writeable = False
+                self._remember(key, array)
+                rows.append((key, model, array.tobytes()))
+            self.stats["writes"] += len(rows)
+
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the LRU, evicting the oldest entry (lock held)"""
+        if self.max_entries <= 0:
+            return
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def clear(self, model: Optional[str] = None):
+        """Drop cached embeddings (all, or only those of `model` on disk)"""
+        with self._lock:
+            self._lru.clear()
+            if self._db is not None:
+                if model is None:
+                    self._db.execute("DELETE FROM embeddings")
+                else:
+                    self._db.execute("DELETE FROM embeddings WHERE model = ?", (model,))
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = self.stats["hits"] + self.stats["disk_hits"]
+            return {
+                **self.stats,
+                "memory_entries": len(self._lru),
+                "hit_rate": hits / lookups * 100 if lookups else 0.0
+            }
+
+    def close(self):
+        """Close the SQLite file"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Native database clients for HelenaCore
+
+Long-lived client objects used by HelenaCore's "client" backend instead of
+spawning curl / docker exec processes for every layer write:
+- PostgreSQL: psycopg2 ThreadedConnectionPool
+- Neo4j:      neo4j Driver (bolt)
+- Qdrant:     QdrantClient
+- Redis:      redis.Redis backed by a ConnectionPool
+- LM Studio:  requests.Session (HTTP keep-alive)
+
+Every client is created lazily on first use, so a HelenaCore that only
+touches PostgreSQL never opens a Neo4j or Qdrant connection.
+
+HelenaResourceManager is the process-wide owner of one HelenaClients set
+plus one HelenaCore per project, shared by every AgentMemory.
+"""
+
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+import requests
+
+from embedding_cache import EmbeddingCache
+
+
+EMBEDDING_MODEL = "text-embedding-intfloat-multilingual-e5-large-instruct"
+
+
+class HelenaClients:
+    """
+    Lazily-initialised, thread-safe holder of native database clients.
+
+    Usage:
+        clients = HelenaClients(postgres_conn="dbname=destiny_team ...")
+        with clients.postgres() as conn:
+            ...
+        clients.redis.lpush("key", "value")
+        clients.close()
+    """
+
+    def __init__(
+        self,
+        postgres_conn: str,
+        neo4j_uri: str = "bolt://localhost:7687",
+        neo4j_user: str = "neo4j",
+        neo4j_password: str = "password",
+        qdrant_url: str = "http://localhost:6333",
+        redis_host: str = "localhost",
+        redis_port: int = 6379,
+        redis_db: int = 0,
+        lmstudio_url: str = "http://localhost:1234/v1/embeddings",
+        pg_minconn: int = 1,
+        pg_maxconn: int = 10,
+        pool_timeout: float = 10.0,
+        connect_timeout: int = 5,
+        socket_timeout: float = 30.0,
+        redis_max_connections: int = 50,
+        neo4j_max_pool_size: int = 50,
+        embedding_cache_size: int = 4096,
+        embedding_cache_path: Optional[str] = None
+    ):
+        """
+        Store connection settings (no connection is opened here)
+
+        Args:
+            postgres_conn: psycopg2 DSN
+            neo4j_uri: Neo4j Bolt URI
+            neo4j_user: Neo4j username
+            neo4j_password: Neo4j password
+            qdrant_url: Qdrant HTTP endpoint
+            redis_host: Redis host
+            redis_port: Redis port
+            redis_db: Redis database number
+            lmstudio_url: Full LM Studio embeddings endpoint
+            pg_minconn: Connections kept open in the PostgreSQL pool
+            pg_maxconn: Upper bound of the PostgreSQL pool
+            pool_timeout: Seconds to wait for a free pooled PostgreSQL
+                connection before giving up
+            connect_timeout: Seconds allowed to open a new connection
+            socket_timeout: Seconds allowed per request/reply
+            redis_max_connections: Upper bound of the Redis pool
+            neo4j_max_pool_size: Upper bound of the Neo4j driver pool
+            embedding_cache_size: Embeddings kept in the in-memory LRU
+            embedding_cache_path: SQLite file for a persistent embedding
+                cache (None = memory only)
+        """
+        self.postgres_conn = postgres_conn
+        self.neo4j_uri = neo4j_uri
+        self.neo4j_user = neo4j_user
+        self.neo4j_password = neo4j_password
+        self.qdrant_url = qdrant_url
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.redis_db = redis_db
+        self.lmstudio_url = lmstudio_url
+        self.pg_minconn = pg_minconn
+        self.pg_maxconn = pg_maxconn
+        self.pool_timeout = pool_timeout
+        self.connect_timeout = connect_timeout
+        self.socket_timeout = socket_timeout
+        self.redis_max_connections = redis_max_connections
+        self.neo4j_max_pool_size = neo4j_max_pool_size
+
+        self._lock = threading.Lock()
+        self._pg_pool: Optional[ThreadedConnectionPool] = None
+        self._neo4j_driver = None
+        self._qdrant = None
+        self._redis = None
+        self._http: Optional[requests.Session] = None
+        self.embedding_cache = EmbeddingCache(
+            max_entries=embedding_cache_size,
+            path=embedding_cache_path
+        )
+
+    # ==================== POSTGRESQL ====================
+
+    @property
+    def pg_pool(self) -> ThreadedConnectionPool:
+        """PostgreSQL connection pool (created on first use)"""
+        if self._pg_pool is None:
+            with self._lock:
+                if self._pg_pool is None:
+                    self._pg_pool = ThreadedConnectionPool(
+                        self.pg_minconn, self.pg_maxconn, self.postgres_conn,
+                        connect_timeout=self.connect_timeout
+                    )
+        return self._pg_pool
+
+    @contextmanager
+    def postgres(self):
+        """
+        Borrow a pooled PostgreSQL connection
+
+        Commits on success, rolls back on error and always returns the
+        connection to the pool.
+        """
+        pool = self.pg_pool
+        conn = self._getconn(pool)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
+
+    def _getconn(self, pool: ThreadedConnectionPool):
+        """Take a pooled connection, waiting up to pool_timeout if exhausted"""
+        deadline = time.monotonic() + self.pool_timeout
+        while True:
+            try:
+                return pool.getconn()
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+
+    # ==================== NEO4J / QDRANT / REDIS ====================
+
+    @property
+    def neo4j(self):
+        """Neo4j driver (created on first use)"""
+        if self._neo4j_driver is None:
+            with self._lock:
+                if self._neo4j_driver is None:
+                    from neo4j import GraphDatabase
+                    self._neo4j_driver = GraphDatabase.driver(
+                        self.neo4j_uri,
+                        auth=(self.neo4j_user, self.neo4j_password),
+                        max_connection_pool_size=self.neo4j_max_pool_size,
+                        connection_acquisition_timeout=self.pool_timeout,
+                        connection_timeout=self.connect_timeout
+                    )
+        return self._neo4j_driver
+
+    @property
+    def qdrant(self):
+        """Qdrant client (created on first use)"""
+        if self._qdrant is None:
+            with self._lock:
+                if self._qdrant is None:
+                    from qdrant_client import QdrantClient
+                    self._qdrant = QdrantClient(
+                        url=self.qdrant_url,
+                        timeout=int(self.socket_timeout)
+                    )
+        return self._qdrant
+
+    @property
+    def redis(self):
+        """Redis client sharing one connection pool (created on first use)"""
+        if self._redis is None:
+            with self._lock:
+                if self._redis is None:
+                    import redis
+                    self._redis = redis.Redis(
+                        connection_pool=redis.ConnectionPool(
+                            host=self.redis_host,
+                            port=self.redis_port,
+                            db=self.redis_db,
+                            max_connections=self.redis_max_connections,
+                            socket_connect_timeout=self.connect_timeout,
+                            socket_timeout=self.socket_timeout
+                        )
+                    )
+        return self._redis
+
+    # ==================== EMBEDDINGS ====================
+
+    @property
+    def http(self) -> requests.Session:
+        """Keep-alive HTTP session for LM Studio"""
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = requests.Session()
+        return self._http
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Generate one embedding via LM Studio (cached)
+
+        Raises:
+            Exception: If LM Studio returns a non-200 response
+        """
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts in one LM Studio request
+
+        Texts already in the embedding cache are not sent.
+
+        Raises:
+            Exception: If LM Studio returns a non-200 response
+        """
+        if not texts:
+            return []
+
+        embeddings = self.embedding_cache.get_many(EMBEDDING_MODEL, texts)
+        missing = list(dict.fromkeys(
+            t for t, e in zip(texts, embeddings) if e is None
+        ))
+        if not missing:
+            return embeddings
+
+        response = self.http.post(
+            self.lmstudio_url,
+            json={"input": missing, "model": EMBEDDING_MODEL},
+            timeout=(self.connect_timeout, self.socket_timeout)
+        )
+        if response.status_code != 200:
+            raise Exception(f"LM Studio error: {response.text}")
+        fresh = [item['embedding'] for item in response.json()['data']]
+        self.embedding_cache.put_many(EMBEDDING_MODEL, missing, fresh)
+
+        by_text = dict(zip(missing, fresh))
+        return [e if e is not None else by_text[t] for t, e in zip(texts, embeddings)]
+
+    # ==================== CLEANUP ====================
+
+    def close(self):
+        """Close every client that was opened"""
+        with self._lock:
+            if self._pg_pool is not None:
+                self._pg_pool.closeall()
+                self._pg_pool = None
+            if self._neo4j_driver is not None:
+                self._neo4j_driver.close()
+                self._neo4j_driver = None
+            if self._qdrant is not None:
+                self._qdrant.close()
+                self._qdrant = None
+            if self._redis is not None:
+                self._redis.close()
+                self._redis.connection_pool.disconnect()
+                self._redis = None
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+            self.embedding_cache.close()
+
+
+class HelenaResourceManager:
+    """
+    Process-wide resource manager shared by all agents
+
+    Holds one HelenaClients (PostgreSQL pool, Neo4j driver, Qdrant client,
+    Redis pool) and hands out one HelenaCore per project, all backed by
+    those same clients. Nine agents + the orchestrator therefore share a
+    single set of pools instead of each opening their own connections.
+
+    Usage:
+        HelenaResourceManager.configure(pg_maxconn=20, pool_timeout=5)
+        helena = HelenaResourceManager.shared().helena("my-project")
+    """
+
+    _shared: Optional["HelenaResourceManager"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, **settings: Any):
+        """
+        Args:
+            **settings: HelenaCore connection settings (postgres_conn,
+                neo4j_uri, qdrant_url, redis_host, ...) and HelenaClients
+                pool/timeout settings (pg_maxconn, pool_timeout, ...)
+        """
+        from helena_core import HelenaCore
+
+        # Split HelenaCore settings (with its defaults) from pool settings
+        params = inspect.signature(HelenaCore).parameters
+        self.core_settings = {
+            key: settings.pop(key, params[key].default)
+            for key in params
+            if key not in ("project_id", "backend", "clients")
+        }
+        self.clients = HelenaClients(
+            postgres_conn=self.core_settings["postgres_conn"],
+            neo4j_uri=self.core_settings["neo4j_uri"],
+            neo4j_user=self.core_settings["neo4j_user"],
+            neo4j_password=self.core_settings["neo4j_password"],
+            qdrant_url=self.core_settings["qdrant_url"],
+            redis_host=self.core_settings["redis_host"],
+            redis_port=self.core_settings["redis_port"],
+            lmstudio_url=self.core_settings["lmstudio_url"],
+            **settings
+        )
+        self._projects: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "HelenaResourceManager":
+        """The process-wide manager (created with defaults on first use)"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @classmethod
+    def configure(cls, **settings: Any) -> "HelenaResourceManager":
+        """
+        Replace the process-wide manager with one using `settings`
+
+        Call once at startup, before agents are created. An unused
+        previous manager is closed; one that already handed out a
+        HelenaCore is left alone, since agents still hold its clients.
+
+        Raises:
+            RuntimeError: The shared manager is already serving projects
+        """
+        with cls._shared_lock:
+            previous = cls._shared
+            if previous is not None and previous.projects():
+                raise RuntimeError(
+                    "HelenaResourceManager already serves projects "
+                    f"{previous.projects()}; configure() before creating agents"
+                )
+            cls._shared = cls(**settings)
+        if previous is not None:
+            previous.close()
+        return cls._shared
+
+    def helena(self, project_id: str):
+        """HelenaCore scoped to `project_id`, backed by the shared clients"""
+        from helena_core import HelenaCore
+
+        with self._lock:
+            if project_id not in self._projects:
+                self._projects[project_id] = HelenaCore(
+                    project_id=project_id,
+                    backend="client",
+                    clients=self.clients,
+                    **self.core_settings
+                )
+            return self._projects[project_id]
+
+    def projects(self) -> List[str]:
+        """Project IDs that currently have a HelenaCore"""
+        with self._lock:
+            return list(self._projects)
+
+    def release_project(self, project_id: str):
+        """Drop a project's HelenaCore (the shared clients stay open)"""
+        with self._lock:
+            helena = self._projects.pop(project_id, None)
+        if helena is not None:
+            helena.close()
+
+    def close(self):
+        """Close every project's HelenaCore and the shared clients"""
+        with self._lock:
+            projects, self._projects = self._projects, {}
+        for helena in projects.values():
+            helena.close()
+        self.clients.close()
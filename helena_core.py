@@ -14,12 +14,19 @@ Role: Chief of Staff ensuring quality and documentation
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 import subprocess
 import json
+import threading
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from helena_clients import HelenaClients, EMBEDDING_MODEL
+from postgres_context_store import ensure_message_partitions, messages_layout
+
 
 class HelenaCore:
     """
@@ -32,8 +39,16 @@ class HelenaCore:
     - Ensure data persistence and quality
     
     Pattern: Always paired with Aleksander (Orchestrator)
+    
+    Backends:
+    - "client" (default): long-lived native clients (psycopg2 pool, neo4j
+      Driver, QdrantClient, redis.Redis) shared via HelenaClients
+    - "subprocess": legacy path using curl and docker exec per call
     """
     
+    BACKENDS = ("client", "subprocess")
+    HOT_MEMORY_MODES = ("list", "stream")
+    
     def __init__(
         self,
         postgres_conn: str = "dbname=destiny_team user=user password=password host=localhost port=5432",
@@ -43,9 +58,42 @@ class HelenaCore:
         qdrant_url: str = "http://localhost:6333",
         redis_container: str = "kg-redis",
         lmstudio_url: str = "http://localhost:1234/v1/embeddings",
-        project_id: str = "destiny-team-framework-master"
+        project_id: str = "destiny-team-framework-master",
+        neo4j_uri: str = "bolt://localhost:7687",
+        redis_host: str = "localhost",
+        redis_port: int = 6379,
+        backend: str = "client",
+        clients: Optional[HelenaClients] = None,
+        concurrent_layers: bool = True,
+        hot_memory_mode: str = "list",
+        stream_maxlen: int = 1000
     ):
-        """Initialize Helena with all database connections"""
+        """
+        Initialize Helena with all database connections
+        
+        Args:
+            neo4j_container / redis_container: Docker containers used by
+                the "subprocess" backend
+            neo4j_uri / redis_host / redis_port: Endpoints used by the
+                "client" backend
+            backend: "client" or "subprocess"
+            clients: Existing HelenaClients to reuse (client backend only)
+            concurrent_layers: Write the 4 layers in parallel instead of
+                one after another (same result dict either way)
+            hot_memory_mode: "list" (last 10 events) or "stream" (same
+                Redis Stream RedisCache(hot_memory_mode="stream") reads)
+            stream_maxlen: Approximate entries kept in stream mode
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}' (expected one of {self.BACKENDS})"
+            )
+        if hot_memory_mode not in self.HOT_MEMORY_MODES:
+            raise ValueError(
+                f"Unknown hot_memory_mode '{hot_memory_mode}' "
+                f"(expected one of {self.HOT_MEMORY_MODES})"
+            )
+        
         self.postgres_conn = postgres_conn
         self.neo4j_container = neo4j_container
         self.neo4j_user = neo4j_user
@@ -55,6 +103,66 @@ class HelenaCore:
         self.lmstudio_url = lmstudio_url
         self.project_id = project_id
         self.collection_name = project_id
+        self.neo4j_uri = neo4j_uri
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.backend = backend
+        
+        # Clients passed in (e.g. by HelenaResourceManager) are shared and
+        # stay open when this HelenaCore is closed
+        self._owns_clients = clients is None
+        if backend == "client" and clients is None:
+            clients = HelenaClients(
+                postgres_conn=postgres_conn,
+                neo4j_uri=neo4j_uri,
+                neo4j_user=neo4j_user,
+                neo4j_password=neo4j_password,
+                qdrant_url=qdrant_url,
+                redis_host=redis_host,
+                redis_port=redis_port,
+                lmstudio_url=lmstudio_url
+            )
+        self.clients = clients
+        self.concurrent_layers = concurrent_layers
+        self.hot_memory_mode = hot_memory_mode
+        self.stream_maxlen = stream_maxlen
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._messages_layout: Optional[str] = None  # looked up on first insert
+    
+    @contextmanager
+    def _pg_connection(self):
+        """
+        PostgreSQL connection for one unit of work
+        
+        Client backend borrows from the shared pool; subprocess backend
+        opens (and closes) a dedicated connection as before.
+        Commits on success.
+        """
+        if self.backend == "client":
+            with self.clients.postgres() as conn:
+                yield conn
+        else:
+            conn = psycopg2.connect(self.postgres_conn)
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
+    
+    def _ensure_message_partitions(self, cur, timestamps: List[datetime]):
+        """Create the partitions a messages INSERT needs (partitioned table)"""
+        if self._messages_layout is None:
+            self._messages_layout = messages_layout(cur) or "plain"
+        ensure_message_partitions(cur, self._messages_layout, [(self.project_id, ts) for ts in timestamps])
+    
+    def close(self):
+        """Release the layer thread pool and any clients this instance owns"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.clients is not None and self._owns_clients:
+            self.clients.close()
         
     # ========================================================================
     # CORE FUNCTION 1: SAVE TO ALL LAYERS
@@ -113,52 +221,88 @@ class HelenaCore:
         
         additional_data = additional_data or {}
         
+        # Each layer write is independent - collect them as jobs so they can
+        # run one after another or all at once (concurrent_layers=True)
+        jobs = {}
+        
         # Layer 1: PostgreSQL (structured data)
-        pg_result = self._save_to_postgresql(
+        jobs["postgresql"] = lambda: self._save_to_postgresql(
             event_type, content, importance, made_by, 
             event_id, timestamp, additional_data
         )
-        results["layers"]["postgresql"] = pg_result
-        if pg_result["status"] == "failed":
-            results["success"] = False
             
         # Layer 2: Neo4j (if it's a decision, create knowledge chain)
         if event_type == "decision":
-            neo4j_result = self._save_to_neo4j(
+            jobs["neo4j"] = lambda: self._save_to_neo4j(
                 content, made_by, event_id, additional_data
             )
-            results["layers"]["neo4j"] = neo4j_result
-            if neo4j_result["status"] == "failed":
-                results["success"] = False
         else:
-            results["layers"]["neo4j"] = {"status": "skipped", "reason": "not a decision"}
+            jobs["neo4j"] = {"status": "skipped", "reason": "not a decision"}
             
         # Layer 3: Qdrant (semantic search)
         if importance >= 0.75:  # Only embed important events
-            qdrant_result = self._save_to_qdrant(
+            jobs["qdrant"] = lambda: self._save_to_qdrant(
                 event_type, content, importance, made_by, 
                 event_id, timestamp, additional_data
             )
-            results["layers"]["qdrant"] = qdrant_result
-            if qdrant_result["status"] == "failed":
-                results["success"] = False
         else:
-            results["layers"]["qdrant"] = {"status": "skipped", "reason": f"importance {importance} < 0.75"}
+            jobs["qdrant"] = {"status": "skipped", "reason": f"importance {importance} < 0.75"}
             
         # Layer 4: Redis (hot cache)
-        redis_result = self._save_to_redis(
+        jobs["redis"] = lambda: self._save_to_redis(
             event_type, content, importance, made_by, 
             event_id, timestamp
         )
-        results["layers"]["redis"] = redis_result
-        if redis_result["status"] == "failed":
-            results["success"] = False
+        
+        results["layers"] = self._run_layer_jobs(jobs)
+        results["success"] = all(
+            r["status"] != "failed" for r in results["layers"].values()
+        )
             
         # Print summary
         self._print_save_summary(results)
         
         return results
     
+    def _run_layer_jobs(self, jobs: Dict[str, Any]) -> Dict[str, Dict]:
+        """
+        Execute layer writes, preserving the layer order of `jobs`
+        
+        Values are either a callable returning the layer result or an
+        already-final result (e.g. "skipped"). With concurrent_layers the
+        callables run in parallel on Helena's thread pool.
+        """
+        if self.concurrent_layers:
+            executor = self._get_executor()
+            pending = {
+                layer: executor.submit(job) if callable(job) else job
+                for layer, job in jobs.items()
+            }
+            layers = {}
+            for layer, job in pending.items():
+                if isinstance(job, Future):
+                    try:
+                        layers[layer] = job.result()
+                    except Exception as e:
+                        layers[layer] = {"status": "failed", "error": str(e)}
+                else:
+                    layers[layer] = job
+            return layers
+        
+        return {
+            layer: job() if callable(job) else job
+            for layer, job in jobs.items()
+        }
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for concurrent layer writes (created on first use)"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="helena-layer"
+                )
+            return self._executor
+    
     def _save_to_postgresql(
         self, event_type: str, content: str, importance: float,
         made_by: str, event_id: str, timestamp: datetime,
@@ -166,63 +310,62 @@ class HelenaCore:
     ) -> Dict:
         """Save to PostgreSQL based on event type"""
         try:
-            conn = psycopg2.connect(self.postgres_conn)
-            cur = conn.cursor()
-            
-            if event_type == "decision":
-                cur.execute("""
-                    INSERT INTO decisions 
-                    (project_id, decision_text, decision_type, made_by, 
-                     approved_by, timestamp, context)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    self.project_id,
-                    content,
-                    additional_data.get("decision_type", "general"),
-                    made_by,
-                    additional_data.get("approved_by", [made_by]),
-                    timestamp,
-                    json.dumps(additional_data)
-                ))
+            with self._pg_connection() as conn:
+                cur = conn.cursor()
                 
-            elif event_type == "message":
-                cur.execute("""
-                    INSERT INTO messages 
-                    (id, project_id, sender, recipient, message_type, 
-                     content, importance, timestamp)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    event_id,
-                    self.project_id,
-                    made_by,
-                    additional_data.get("recipient", "Team"),
-                    additional_data.get("message_type", "NOTIFICATION"),
-                    content,
-                    importance,
-                    timestamp
-                ))
+                if event_type == "decision":
+                    cur.execute("""
+                        INSERT INTO decisions 
+                        (project_id, decision_text, decision_type, made_by, 
+                         approved_by, timestamp, context)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """, (
+                        self.project_id,
+                        content,
+                        additional_data.get("decision_type", "general"),
+                        made_by,
+                        additional_data.get("approved_by", [made_by]),
+                        timestamp,
+                        json.dumps(additional_data)
+                    ))
                 
-            elif event_type == "agent_context":
-                agent_name = additional_data.get("agent_name", made_by)
-                context_key = additional_data.get("context_key", "general_update")
-                cur.execute("""
-                    INSERT INTO agent_contexts 
-                    (agent_name, project_id, context_key, context_value, updated_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (agent_name, project_id, context_key)
-                    DO UPDATE SET context_value = EXCLUDED.context_value, 
-                                  updated_at = EXCLUDED.updated_at
-                """, (
-                    agent_name,
-                    self.project_id,
-                    context_key,
-                    json.dumps({"content": content, **additional_data}),
-                    timestamp
-                ))
-            
-            conn.commit()
-            cur.close()
-            conn.close()
+                elif event_type == "message":
+                    self._ensure_message_partitions(cur, [timestamp])
+                    cur.execute("""
+                        INSERT INTO messages 
+                        (id, project_id, sender, recipient, message_type, 
+                         content, importance, timestamp)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """, (
+                        event_id,
+                        self.project_id,
+                        made_by,
+                        additional_data.get("recipient", "Team"),
+                        additional_data.get("message_type", "NOTIFICATION"),
+                        content,
+                        importance,
+                        timestamp
+                    ))
+                
+                elif event_type == "agent_context":
+                    agent_name = additional_data.get("agent_name", made_by)
+                    context_key = additional_data.get("context_key", "general_update")
+                    cur.execute("""
+                        INSERT INTO agent_contexts 
+                        (agent_name, project_id, context_key, context_value, updated_at)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON CONFLICT (agent_name, project_id, context_key)
+                        DO UPDATE SET context_value = EXCLUDED.context_value, 
+                                      updated_at = EXCLUDED.updated_at
+                    """, (
+                        agent_name,
+                        self.project_id,
+                        context_key,
+                        json.dumps({"content": content, **additional_data}),
+                        timestamp
+                    ))
+                
+                cur.close()
             
             return {"status": "success", "table": event_type}
             
@@ -234,6 +377,53 @@ class HelenaCore:
         additional_data: Dict
     ) -> Dict:
         """Save decision chain to Neo4j"""
+        if self.backend == "subprocess":
+            return self._save_to_neo4j_subprocess(
+                content, made_by, event_id, additional_data
+            )
+        
+        try:
+            reasons = additional_data.get("reasons", [])
+            
+            # Parameterised query - no quote escaping needed
+            cypher = """
+            MATCH (p:Project {id: $project_id})
+            CREATE (decision:Decision {
+              id: $event_id,
+              text: $text,
+              made_by: $made_by,
+              project_id: $project_id,
+              timestamp: datetime(),
+              importance: $importance
+            })
+            CREATE (decision)-[:IN_PROJECT]->(p)
+            FOREACH (reason_text IN $reasons |
+              CREATE (decision)-[:BECAUSE]->(:Reason {text: reason_text})
+            )
+            RETURN decision.id AS id
+            """
+            
+            with self.clients.neo4j.session() as session:
+                session.run(
+                    cypher,
+                    project_id=self.project_id,
+                    event_id=event_id,
+                    text=content,
+                    made_by=made_by,
+                    importance=additional_data.get('importance', 0.8),
+                    reasons=list(reasons)
+                ).consume()
+            
+            return {"status": "success", "nodes": 1 + len(reasons)}
+            
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+    
+    def _save_to_neo4j_subprocess(
+        self, content: str, made_by: str, event_id: str, 
+        additional_data: Dict
+    ) -> Dict:
+        """Save decision chain to Neo4j via docker exec cypher-shell"""
         try:
             # Create decision node and relationship chain
             reasons = additional_data.get("reasons", [])
@@ -284,6 +474,39 @@ class HelenaCore:
         additional_data: Dict
     ) -> Dict:
         """Generate embedding and save to Qdrant"""
+        if self.backend == "subprocess":
+            return self._save_to_qdrant_subprocess(
+                event_type, content, importance, made_by,
+                event_id, timestamp, additional_data
+            )
+        
+        try:
+            from qdrant_client.models import PointStruct
+            
+            embedding = self.clients.embed(f"{event_type}: {content}")
+            point_id = self._qdrant_point_id(event_id)
+            
+            payload = self._qdrant_payload(
+                event_type, content, importance, made_by,
+                event_id, timestamp, additional_data
+            )
+            
+            self.clients.qdrant.upsert(
+                collection_name=self.collection_name,
+                points=[PointStruct(id=point_id, vector=embedding, payload=payload)]
+            )
+            
+            return {"status": "success", "point_id": point_id}
+            
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+    
+    def _save_to_qdrant_subprocess(
+        self, event_type: str, content: str, importance: float,
+        made_by: str, event_id: str, timestamp: datetime,
+        additional_data: Dict
+    ) -> Dict:
+        """Generate embedding and save to Qdrant via curl"""
         try:
             # Generate embedding
             embed_text = f"{event_type}: {content}"
@@ -293,7 +516,7 @@ class HelenaCore:
                 '-H', 'Content-Type: application/json',
                 '-d', json.dumps({
                     "input": embed_text,
-                    "model": "text-embedding-intfloat-multilingual-e5-large-instruct"
+                    "model": EMBEDDING_MODEL
                 })
             ], capture_output=True, text=True)
             
@@ -303,22 +526,7 @@ class HelenaCore:
             embedding_response = json.loads(result.stdout)
             embedding = embedding_response['data'][0]['embedding']
             
-            # Get next ID
-            result = subprocess.run([
-                'curl', '-s', f'{self.qdrant_url}/collections/{self.collection_name}'
-            ], capture_output=True, text=True)
-            
-            coll_data = json.loads(result.stdout)
-            
-            # Handle collection not found or API errors
-            if 'result' not in coll_data:
-                if 'status' in coll_data and 'error' in coll_data['status']:
-                    error_msg = coll_data['status']['error']
-                    return {"status": "failed", "error": f"Qdrant collection error: {error_msg}"}
-                else:
-                    return {"status": "failed", "error": "Unexpected Qdrant API response structure"}
-            
-            next_id = coll_data['result']['points_count'] + 1
+            point_id = self._qdrant_point_id(event_id)
             
             # Save to Qdrant
             payload = {
@@ -333,7 +541,7 @@ class HelenaCore:
             
             point_data = {
                 "points": [{
-                    "id": next_id,
+                    "id": point_id,
                     "vector": embedding,
                     "payload": payload
                 }]
@@ -346,19 +554,107 @@ class HelenaCore:
                 '-d', json.dumps(point_data)
             ], capture_output=True, text=True)
             
-            if result.returncode == 0:
-                return {"status": "success", "point_id": next_id}
-            else:
+            if result.returncode != 0:
                 return {"status": "failed", "error": "upload failed"}
+            
+            # Handle collection not found or API errors
+            response = json.loads(result.stdout)
+            if 'status' in response and isinstance(response['status'], dict):
+                error_msg = response['status'].get('error', 'unknown error')
+                return {"status": "failed", "error": f"Qdrant collection error: {error_msg}"}
+            
+            return {"status": "success", "point_id": point_id}
                 
         except Exception as e:
             return {"status": "failed", "error": str(e)}
     
+    @staticmethod
+    def _qdrant_point_id(event_id: str) -> str:
+        """
+        Deterministic Qdrant point ID for an event
+        
+        Event IDs are UUIDs and are used as-is; anything else is mapped to
+        a stable UUIDv5. No collection read is needed, so concurrent
+        writers can never pick the same ID, and re-saving an event
+        overwrites its point instead of duplicating it.
+        """
+        try:
+            return str(uuid.UUID(event_id))
+        except ValueError:
+            return str(uuid.uuid5(uuid.NAMESPACE_URL, f"destiny:event:{event_id}"))
+    
+    def _qdrant_payload(
+        self, event_type: str, content: str, importance: float,
+        made_by: str, event_id: str, timestamp: datetime,
+        additional_data: Dict
+    ) -> Dict:
+        """Qdrant point payload for an event"""
+        return {
+            "type": event_type,
+            "content": content,
+            "importance": importance,
+            "made_by": made_by,
+            "timestamp": timestamp.isoformat(),
+            "event_id": event_id,
+            **additional_data
+        }
+    
+    def _redis_event_json(
+        self, event_type: str, content: str, importance: float,
+        made_by: str, event_id: str, timestamp: datetime
+    ) -> str:
+        """Hot-memory entry for an event"""
+        return json.dumps({
+            "type": event_type,
+            "content": content[:200],  # Truncate for cache
+            "importance": importance,
+            "made_by": made_by,
+            "event_id": event_id,
+            "timestamp": timestamp.isoformat()
+        })
+    
     def _save_to_redis(
         self, event_type: str, content: str, importance: float,
         made_by: str, event_id: str, timestamp: datetime
     ) -> Dict:
         """Save to Redis hot cache"""
+        if self.backend == "subprocess":
+            return self._save_to_redis_subprocess(
+                event_type, content, importance, made_by, event_id, timestamp
+            )
+        
+        try:
+            event_json = self._redis_event_json(
+                event_type, content, importance, made_by, event_id, timestamp
+            )
+            
+            if self.hot_memory_mode == "stream":
+                self.clients.redis.xadd(
+                    f"destiny:hot_stream:{self.project_id}",
+                    {"data": event_json},
+                    maxlen=self.stream_maxlen,
+                    approximate=True
+                )
+                return {"status": "success", "cached": True}
+            
+            key = f"destiny:hot_memory:{self.project_id}"
+            
+            # LPUSH + LTRIM (last 10 events) in one round-trip
+            pipe = self.clients.redis.pipeline(transaction=False)
+            pipe.lpush(key, event_json)
+            pipe.ltrim(key, 0, 9)
+            pipe.execute()
+            
+            return {"status": "success", "cached": True}
+            
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+    
+    def _save_to_redis_subprocess(
+        self, event_type: str, content: str, importance: float,
+        made_by: str, event_id: str, timestamp: datetime
+    ) -> Dict:
+        """Save to Redis hot cache via docker exec redis-cli"""
         try:
             event_json = json.dumps({
                 "type": event_type,
@@ -369,6 +665,17 @@ class HelenaCore:
                 "timestamp": timestamp.isoformat()
             })
             
+            if self.hot_memory_mode == "stream":
+                # One command: append + approximate trim
+                result = subprocess.run([
+                    'docker', 'exec', self.redis_container,
+                    'redis-cli', 'XADD', f"destiny:hot_stream:{self.project_id}",
+                    'MAXLEN', '~', str(self.stream_maxlen), '*', 'data', event_json
+                ], capture_output=True, text=True)
+                if result.returncode == 0:
+                    return {"status": "success", "cached": True}
+                return {"status": "failed", "error": result.stderr}
+            
             key = f"destiny:hot_memory:{self.project_id}"
             
             # Add to list (LPUSH)
@@ -391,6 +698,333 @@ class HelenaCore:
         except Exception as e:
             return {"status": "failed", "error": str(e)}
     
+    # ========================================================================
+    # BULK SAVE: one round-trip per layer for many events
+    # ========================================================================
+    
+    def save_many(
+        self,
+        events: List[Dict[str, Any]],
+        chunk_size: int = 500
+    ) -> Dict[str, Any]:
+        """
+        Save many events with one request per layer per chunk
+        
+        Per chunk: one LM Studio call for all embeddings, one Qdrant
+        upsert, one PostgreSQL transaction with a multi-row INSERT per
+        table, one UNWIND Cypher statement for decisions and one Redis
+        pipeline. Same layer rules as save_to_all_layers (Neo4j only for
+        decisions, Qdrant only for importance >= 0.75).
+        
+        Args:
+            events: Dicts with save_to_all_layers arguments:
+                event_type, content, importance, made_by, additional_data
+            chunk_size: Events per round-trip (bounds request size for
+                large imports)
+            
+        Returns:
+            {
+                "success": bool,        # every event fully saved
+                "saved": int,           # events saved to all layers
+                "failed": int,          # events with a failed layer
+                "events": [...]         # per-event results, input order,
+                                        # shaped like save_to_all_layers
+            }
+        """
+        print(f"💾 HELENA: Bulk saving {len(events)} events")
+        
+        if self.backend == "subprocess":
+            # No bulk path over curl/docker exec - save one by one
+            statuses = [
+                self.save_to_all_layers(
+                    e["event_type"], e["content"], e["importance"],
+                    e["made_by"], e.get("additional_data")
+                )
+                for e in events
+            ]
+        else:
+            statuses = []
+            for start in range(0, len(events), chunk_size):
+                statuses.extend(self._save_chunk(events[start:start + chunk_size]))
+        
+        saved = sum(1 for s in statuses if s["success"])
+        summary = {
+            "success": saved == len(statuses),
+            "saved": saved,
+            "failed": len(statuses) - saved,
+            "events": statuses
+        }
+        print(f"   ✅ {saved}/{len(statuses)} events saved to all layers")
+        return summary
+    
+    def _save_chunk(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk-save one chunk; returns per-event results"""
+        timestamp = datetime.now()
+        prepared = [
+            {
+                "event_type": e["event_type"],
+                "content": e["content"],
+                "importance": e["importance"],
+                "made_by": e["made_by"],
+                "additional_data": e.get("additional_data") or {},
+                "event_id": str(uuid.uuid4()),
+                "timestamp": timestamp
+            }
+            for e in events
+        ]
+        decisions = [e for e in prepared if e["event_type"] == "decision"]
+        important = [e for e in prepared if e["importance"] >= 0.75]
+        
+        jobs = {
+            "postgresql": lambda: self._save_many_to_postgresql(prepared),
+            "neo4j": lambda: self._save_many_to_neo4j(decisions),
+            "qdrant": lambda: self._save_many_to_qdrant(important),
+            "redis": lambda: self._save_many_to_redis(prepared)
+        }
+        if not decisions:
+            del jobs["neo4j"]
+        if not important:
+            del jobs["qdrant"]
+        batch = self._run_layer_jobs(jobs)
+        
+        results = []
+        for event in prepared:
+            layers = {"postgresql": self._event_layer_result(batch["postgresql"])}
+            
+            if event["event_type"] == "decision":
+                layers["neo4j"] = self._event_layer_result(batch["neo4j"])
+            else:
+                layers["neo4j"] = {"status": "skipped", "reason": "not a decision"}
+            
+            if event["importance"] >= 0.75:
+                layers["qdrant"] = self._event_layer_result(
+                    batch["qdrant"],
+                    point_id=batch["qdrant"].get("point_ids", {}).get(event["event_id"])
+                )
+            else:
+                layers["qdrant"] = {
+                    "status": "skipped",
+                    "reason": f"importance {event['importance']} < 0.75"
+                }
+            
+            layers["redis"] = self._event_layer_result(batch["redis"])
+            
+            results.append({
+                "success": all(r["status"] != "failed" for r in layers.values()),
+                "layers": layers,
+                "event_id": event["event_id"],
+                "timestamp": timestamp.isoformat()
+            })
+        
+        return results
+    
+    def _event_layer_result(self, batch_result: Dict, point_id: Any = None) -> Dict:
+        """Per-event view of a bulk layer result"""
+        if batch_result["status"] == "failed":
+            return {"status": "failed", "error": batch_result["error"], "batch": True}
+        result = {"status": "success", "batch": True}
+        if point_id is not None:
+            result["point_id"] = point_id
+        return result
+    
+    def _save_many_to_postgresql(self, events: List[Dict[str, Any]]) -> Dict:
+        """One transaction, one multi-row INSERT per table"""
+        decision_rows = []
+        message_rows = []
+        context_rows = {}
+        
+        for e in events:
+            data = e["additional_data"]
+            if e["event_type"] == "decision":
+                decision_rows.append((
+                    self.project_id,
+                    e["content"],
+                    data.get("decision_type", "general"),
+                    e["made_by"],
+                    data.get("approved_by", [e["made_by"]]),
+                    e["timestamp"],
+                    json.dumps(data)
+                ))
+            elif e["event_type"] == "message":
+                message_rows.append((
+                    e["event_id"],
+                    self.project_id,
+                    e["made_by"],
+                    data.get("recipient", "Team"),
+                    data.get("message_type", "NOTIFICATION"),
+                    e["content"],
+                    e["importance"],
+                    e["timestamp"]
+                ))
+            elif e["event_type"] == "agent_context":
+                agent_name = data.get("agent_name", e["made_by"])
+                context_key = data.get("context_key", "general_update")
+                # Last write wins - one statement can't upsert a key twice
+                context_rows[(agent_name, context_key)] = (
+                    agent_name,
+                    self.project_id,
+                    context_key,
+                    json.dumps({"content": e["content"], **data}),
+                    e["timestamp"]
+                )
+        
+        try:
+            with self._pg_connection() as conn:
+                cur = conn.cursor()
+                
+                if decision_rows:
+                    execute_values(cur, """
+                        INSERT INTO decisions 
+                        (project_id, decision_text, decision_type, made_by, 
+                         approved_by, timestamp, context)
+                        VALUES %s
+                    """, decision_rows, page_size=len(decision_rows))
+                
+                if message_rows:
+                    self._ensure_message_partitions(cur, [row[7] for row in message_rows])
+                    execute_values(cur, """
+                        INSERT INTO messages 
+                        (id, project_id, sender, recipient, message_type, 
+                         content, importance, timestamp)
+                        VALUES %s
+                    """, message_rows, page_size=len(message_rows))
+                
+                if context_rows:
+                    execute_values(cur, """
+                        INSERT INTO agent_contexts 
+                        (agent_name, project_id, context_key, context_value, updated_at)
+                        VALUES %s
+                        ON CONFLICT (agent_name, project_id, context_key)
+                        DO UPDATE SET context_value = EXCLUDED.context_value, 
+                                      updated_at = EXCLUDED.updated_at
+                    """, list(context_rows.values()), page_size=len(context_rows))
+                
+                cur.close()
+            
+            return {
+                "status": "success",
+                "rows": len(decision_rows) + len(message_rows) + len(context_rows)
+            }
+            
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+    
+    def _save_many_to_neo4j(self, decisions: List[Dict[str, Any]]) -> Dict:
+        """All decision chains in one UNWIND statement"""
+        try:
+            rows = [
+                {
+                    "event_id": e["event_id"],
+                    "text": e["content"],
+                    "made_by": e["made_by"],
+                    "importance": e["additional_data"].get("importance", 0.8),
+                    "reasons": list(e["additional_data"].get("reasons", []))
+                }
+                for e in decisions
+            ]
+            
+            cypher = """
+            MATCH (p:Project {id: $project_id})
+            UNWIND $decisions AS d
+            CREATE (decision:Decision {
+              id: d.event_id,
+              text: d.text,
+              made_by: d.made_by,
+              project_id: $project_id,
+              timestamp: datetime(),
+              importance: d.importance
+            })
+            CREATE (decision)-[:IN_PROJECT]->(p)
+            FOREACH (reason_text IN d.reasons |
+              CREATE (decision)-[:BECAUSE]->(:Reason {text: reason_text})
+            )
+            """
+            
+            with self.clients.neo4j.session() as session:
+                session.run(
+                    cypher, project_id=self.project_id, decisions=rows
+                ).consume()
+            
+            return {
+                "status": "success",
+                "nodes": sum(1 + len(r["reasons"]) for r in rows)
+            }
+            
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+    
+    def _save_many_to_qdrant(self, events: List[Dict[str, Any]]) -> Dict:
+        """One embedding request and one upsert for all important events"""
+        try:
+            from qdrant_client.models import PointStruct
+            
+            embeddings = self.clients.embed_many([
+                f"{e['event_type']}: {e['content']}" for e in events
+            ])
+            
+            points = []
+            point_ids = {}
+            for e, embedding in zip(events, embeddings):
+                point_id = self._qdrant_point_id(e["event_id"])
+                point_ids[e["event_id"]] = point_id
+                points.append(PointStruct(
+                    id=point_id,
+                    vector=embedding,
+                    payload=self._qdrant_payload(
+                        e["event_type"], e["content"], e["importance"],
+                        e["made_by"], e["event_id"], e["timestamp"],
+                        e["additional_data"]
+                    )
+                ))
+            
+            self.clients.qdrant.upsert(
+                collection_name=self.collection_name,
+                points=points
+            )
+            
+            return {"status": "success", "point_ids": point_ids}
+            
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+    
+    def _save_many_to_redis(self, events: List[Dict[str, Any]]) -> Dict:
+        """One pipelined LPUSH + LTRIM (only the newest 10 can survive), or XADDs"""
+        try:
+            if self.hot_memory_mode == "stream":
+                # Streams keep history, so every event is appended
+                key = f"destiny:hot_stream:{self.project_id}"
+                pipe = self.clients.redis.pipeline(transaction=False)
+                for e in events[-self.stream_maxlen:]:
+                    pipe.xadd(
+                        key,
+                        {"data": self._redis_event_json(
+                            e["event_type"], e["content"], e["importance"],
+                            e["made_by"], e["event_id"], e["timestamp"]
+                        )},
+                        maxlen=self.stream_maxlen,
+                        approximate=True
+                    )
+                pipe.execute()
+                return {"status": "success", "cached": True}
+            
+            key = f"destiny:hot_memory:{self.project_id}"
+            
+            pipe = self.clients.redis.pipeline(transaction=False)
+            pipe.lpush(key, *[
+                self._redis_event_json(
+                    e["event_type"], e["content"], e["importance"],
+                    e["made_by"], e["event_id"], e["timestamp"]
+                )
+                for e in events[-10:]
+            ])
+            pipe.ltrim(key, 0, 9)
+            pipe.execute()
+            
+            return {"status": "success", "cached": True}
+            
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+    
     def _print_save_summary(self, results: Dict):
         """Print summary of save operation"""
         print(f"\n{'─'*80}")
@@ -481,6 +1115,36 @@ class HelenaCore:
     
     def _search_qdrant(self, query: str, limit: int) -> List[Dict]:
         """Semantic search in Qdrant"""
+        if self.backend == "subprocess":
+            return self._search_qdrant_subprocess(query, limit)
+        
+        try:
+            embedding = self.clients.embed(query)
+            
+            response = self.clients.qdrant.query_points(
+                collection_name=self.collection_name,
+                query=embedding,
+                limit=limit,
+                with_payload=True
+            )
+            
+            # Same shape as the REST API's search result
+            return [
+                {
+                    "id": point.id,
+                    "version": point.version,
+                    "score": point.score,
+                    "payload": point.payload
+                }
+                for point in response.points
+            ]
+            
+        except Exception as e:
+            print(f"⚠️  Qdrant search error: {e}")
+            return []
+    
+    def _search_qdrant_subprocess(self, query: str, limit: int) -> List[Dict]:
+        """Semantic search in Qdrant via curl"""
         try:
             # Generate embedding for query
             result = subprocess.run([
@@ -488,7 +1152,7 @@ class HelenaCore:
                 '-H', 'Content-Type: application/json',
                 '-d', json.dumps({
                     "input": query,
-                    "model": "text-embedding-intfloat-multilingual-e5-large-instruct"
+                    "model": EMBEDDING_MODEL
                 })
             ], capture_output=True, text=True)
             
@@ -523,19 +1187,21 @@ class HelenaCore:
     def _query_postgresql(self, query: str, limit: int) -> List[Dict]:
         """Query PostgreSQL for relevant records"""
         try:
-            conn = psycopg2.connect(self.postgres_conn)
-            cur = conn.cursor()
-            
-            # Get recent decisions
-            cur.execute("""
-                SELECT decision_text, decision_type, made_by, timestamp, context
-                FROM decisions
-                WHERE project_id = %s
-                ORDER BY timestamp DESC
-                LIMIT %s
-            """, (self.project_id, limit))
-            
-            rows = cur.fetchall()
+            with self._pg_connection() as conn:
+                cur = conn.cursor()
+                
+                # Get recent decisions
+                cur.execute("""
+                    SELECT decision_text, decision_type, made_by, timestamp, context
+                    FROM decisions
+                    WHERE project_id = %s
+                    ORDER BY timestamp DESC
+                    LIMIT %s
+                """, (self.project_id, limit))
+                
+                rows = cur.fetchall()
+                cur.close()
+            
             results = []
             
             for row in rows:
@@ -548,9 +1214,6 @@ class HelenaCore:
                     "context": row[4]
                 })
             
-            cur.close()
-            conn.close()
-            
             return results
             
         except Exception as e:
@@ -633,26 +1296,25 @@ class HelenaCore:
     def _get_agent_context(self, agent_name: str) -> Dict:
         """Get agent's personal context from PostgreSQL"""
         try:
-            conn = psycopg2.connect(self.postgres_conn)
-            cur = conn.cursor()
-            
-            cur.execute("""
-                SELECT context_key, context_value, updated_at
-                FROM agent_contexts
-                WHERE agent_name = %s AND project_id = %s
-                ORDER BY updated_at DESC
-                LIMIT 5
-            """, (agent_name, self.project_id))
+            with self._pg_connection() as conn:
+                cur = conn.cursor()
+                
+                cur.execute("""
+                    SELECT context_key, context_value, updated_at
+                    FROM agent_contexts
+                    WHERE agent_name = %s AND project_id = %s
+                    ORDER BY updated_at DESC
+                    LIMIT 5
+                """, (agent_name, self.project_id))
+                
+                rows = cur.fetchall()
+                cur.close()
             
-            rows = cur.fetchall()
             context = {}
             
             for row in rows:
                 context[row[0]] = json.loads(row[1]) if row[1] else {}
             
-            cur.close()
-            conn.close()
-            
             return context
             
         except Exception as e:
@@ -114,7 +114,7 @@ class KnowledgeManagerAgent:
         end = date.replace(hour=23, minute=59, second=59)
         
         # Query PostgreSQL for messages
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT id, sender, content, message_type, importance
                 FROM messages
@@ -174,7 +174,7 @@ class KnowledgeManagerAgent:
         Example: "Architecture Phase" (weeks 2-4)
         """
         # Get all messages from phase
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT id, sender, content, message_type, importance
                 FROM messages
@@ -286,7 +286,7 @@ class KnowledgeManagerAgent:
     def _generate_decision_log(self, project_id: str) -> str:
         """Generate decision log document"""
         # Get all decisions from PostgreSQL
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT decision_text, decision_type, made_by, approved_by, timestamp, context
                 FROM decisions
@@ -569,7 +569,7 @@ class KnowledgeManagerAgent:
     
     def _store_summary(self, summary: ProjectSummary):
         """Store summary in PostgreSQL"""
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 INSERT INTO agent_contexts (agent_name, project_id, context_key, context_value, importance)
                 VALUES (%s, %s, %s, %s, %s)
@@ -588,7 +588,6 @@ class KnowledgeManagerAgent:
                 }),
                 summary.importance
             ))
-            self.postgres.conn.commit()
     
     def _extract_concepts_simple(self, text: str) -> List[str]:
         """Simple concept extraction"""
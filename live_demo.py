@@ -550,7 +550,7 @@ Full summary będzie na end of session.
     print()
     
     # Query stats
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         # Total messages today
         cur.execute("""
             SELECT COUNT(*) 
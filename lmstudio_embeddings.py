@@ -6,9 +6,14 @@ for FREE, private, unlimited embeddings.
 """
 
 import requests
-from typing import List, Union
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import numpy as np
 
+from embedding_cache import EmbeddingCache
+
 
 class LMStudioEmbeddings:
     """
@@ -22,7 +27,15 @@ class LMStudioEmbeddings:
     def __init__(
         self,
         base_url: str = "http://localhost:1234/v1",
-        model: str = "text-embedding-intfloat-multilingual-e5-large-instruct"
+        model: str = "text-embedding-intfloat-multilingual-e5-large-instruct",
+        cache: Optional[EmbeddingCache] = None,
+        cache_size: int = 4096,
+        cache_path: Optional[Union[str, Path]] = None,
+        max_batch_chars: int = 16000,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        timeout: float = 30
     ):
         """
         Initialize LM Studio embeddings client.
@@ -30,10 +43,34 @@ class LMStudioEmbeddings:
         Args:
             base_url: LM Studio server URL (default: http://localhost:1234/v1)
             model: Embedding model name
+            cache: Shared embedding cache (default: a private one built
+                from cache_size / cache_path)
+            cache_size: In-memory LRU entries (0 disables the memory tier)
+            cache_path: SQLite file for a persistent cache tier
+            max_batch_chars: Max total characters per embed_batch request
+                (keeps each request well inside the model's context)
+            max_workers: Batches in flight at once in embed_batch
+            max_retries: Retries on 5xx responses, timeouts and
+                connection errors
+            retry_backoff: Base delay (seconds) between retries, doubled
+                on each attempt
+            timeout: Seconds per request
         """
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.dimension = 1024  # E5-Large dimension
+        self.cache = cache or EmbeddingCache(max_entries=cache_size, path=cache_path)
+        self.max_batch_chars = max_batch_chars
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        
+        # Keep-alive: one TCP connection per worker instead of one per request
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(max_workers, 10))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def embed(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
         """
@@ -49,52 +86,127 @@ class LMStudioEmbeddings:
         texts = [text] if isinstance(text, str) else text
         single_input = isinstance(text, str)
         
-        # Call LM Studio API (OpenAI compatible)
-        response = requests.post(
-            f"{self.base_url}/embeddings",
-            json={
-                "model": self.model,
-                "input": texts
-            },
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"LM Studio error: {response.text}")
+        # Only texts the cache hasn't seen go to the server (once each)
+        embeddings = self.cache.get_many(self.model, texts)
+        missing = list(dict.fromkeys(
+            t for t, e in zip(texts, embeddings) if e is None
+        ))
         
-        data = response.json()
-        embeddings = [item['embedding'] for item in data['data']]
+        if missing:
+            fresh = dict(zip(missing, self._request_embeddings(missing)))
+            self.cache.put_many(self.model, missing, list(fresh.values()))
+            embeddings = [
+                e if e is not None else fresh[t]
+                for t, e in zip(texts, embeddings)
+            ]
         
         # Return single embedding if single input
         return embeddings[0] if single_input else embeddings
     
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Call LM Studio API (OpenAI compatible) for `texts`
+        
+        Retries 5xx responses, timeouts and connection errors with
+        exponential backoff; 4xx errors fail immediately.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/embeddings",
+                    json={
+                        "model": self.model,
+                        "input": texts
+                    },
+                    timeout=self.timeout
+                )
+                retryable = response.status_code >= 500
+                error = f"LM Studio error: {response.text}"
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                response, retryable, error = None, True, f"LM Studio unreachable: {e}"
+            
+            if response is not None and response.status_code == 200:
+                data = response.json()
+                return [item['embedding'] for item in data['data']]
+            
+            if not retryable or attempt == self.max_retries:
+                raise Exception(error)
+            time.sleep(self.retry_backoff * (2 ** attempt))
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Embedding cache hits, misses and hit rate"""
+        return self.cache.get_stats()
+    
     def embed_batch(
         self,
         texts: List[str],
-        batch_size: int = 10
+        batch_size: int = 64,
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> List[List[float]]:
         """
         Generate embeddings in batches (for large datasets).
         
+        Batches are capped by total characters (max_batch_chars) as well
+        as by count, and up to max_workers batches are in flight at once.
+        Cached texts are not sent.
+        
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts per batch
+            batch_size: Max number of texts per batch
+            progress_callback: Called as callback(done, total) after each
+                batch (default: print progress every ~100 texts)
             
         Returns:
-            List of embeddings
+            List of embeddings (same order as texts)
         """
-        all_embeddings = []
+        embeddings = self.cache.get_many(self.model, texts)
+        missing = list(dict.fromkeys(
+            t for t, e in zip(texts, embeddings) if e is None
+        ))
+        if not missing:
+            return embeddings
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            embeddings = self.embed(batch)
-            all_embeddings.extend(embeddings)
-            
-            # Progress
-            if (i + batch_size) % 100 == 0:
-                print(f"Embedded {min(i + batch_size, len(texts))}/{len(texts)} texts")
+        batches = self._plan_batches(missing, batch_size)
+        fresh: Dict[str, List[float]] = {}
+        done = 0
+        
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(batches)),
+            thread_name_prefix="lmstudio-embed"
+        ) as pool:
+            futures = {pool.submit(self._request_embeddings, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                vectors = future.result()
+                self.cache.put_many(self.model, batch, vectors)
+                fresh.update(zip(batch, vectors))
+                
+                # Progress
+                previous, done = done, done + len(batch)
+                if progress_callback is not None:
+                    progress_callback(done, len(missing))
+                elif done // 100 > previous // 100 or done == len(missing):
+                    print(f"Embedded {done}/{len(missing)} texts")
+        
+        return [e if e is not None else fresh[t] for t, e in zip(texts, embeddings)]
+    
+    def _plan_batches(self, texts: List[str], batch_size: int) -> List[List[str]]:
+        """Split texts into batches of <= batch_size texts and <= max_batch_chars"""
+        batches = []
+        current, chars = [], 0
+        
+        for text in texts:
+            if current and (
+                len(current) >= batch_size or chars + len(text) > self.max_batch_chars
+            ):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(text)
+            chars += len(text)
         
-        return all_embeddings
+        if current:
+            batches.append(current)
+        return batches
     
     def similarity(
         self,
@@ -122,11 +234,93 @@ class LMStudioEmbeddings:
         
         return dot_product / (norm1 * norm2)
     
+    # ==================== MATRIX OPERATIONS ====================
+    
+    def embed_matrix(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """
+        Embed texts into one float32 matrix (one row per text).
+        
+        Args:
+            texts: Texts to embed (uses embed_batch, so cached and batched)
+            normalize: L2-normalize rows so dot product == cosine similarity
+            
+        Returns:
+            ndarray of shape (len(texts), dimension), dtype float32
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        matrix = np.asarray(
+            self.embed_batch(texts, progress_callback=lambda done, total: None),
+            dtype=np.float32
+        )
+        return self.normalize(matrix) if normalize else matrix
+    
+    @staticmethod
+    def normalize(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize vectors (rows) as float32; zero vectors stay zero"""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def cosine_matrix(
+        self,
+        a: np.ndarray,
+        b: np.ndarray,
+        normalized: bool = False
+    ) -> np.ndarray:
+        """
+        Pairwise cosine similarity in one matrix multiply.
+        
+        Args:
+            a: (n, d) vectors
+            b: (m, d) vectors
+            normalized: Rows are already unit length (skip normalization)
+            
+        Returns:
+            (n, m) float32 matrix, result[i, j] = cos(a[i], b[j])
+        """
+        a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+        b = np.atleast_2d(np.asarray(b, dtype=np.float32))
+        if not normalized:
+            a, b = self.normalize(a), self.normalize(b)
+        return a @ b.T
+    
+    def top_k(
+        self,
+        query_vec: np.ndarray,
+        matrix: np.ndarray,
+        k: int = 5,
+        normalized: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Most similar rows of `matrix` to `query_vec`.
+        
+        Uses argpartition (O(n)) and sorts only the k winners.
+        
+        Args:
+            query_vec: (d,) query vector
+            matrix: (n, d) candidate vectors
+            k: Number of results
+            normalized: Query and rows are already unit length
+            
+        Returns:
+            (indices, scores) - int64 and float32 arrays, best first
+        """
+        scores = self.cosine_matrix(query_vec, matrix, normalized=normalized)[0]
+        k = min(k, scores.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        order = candidates[np.argsort(-scores[candidates])]
+        return order.astype(np.int64), scores[order]
+    
     def test_connection(self) -> bool:
         """Test if LM Studio server is running"""
         try:
             # Try to get models list
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/models",
                 timeout=5
             )
@@ -0,0 +1,617 @@
+"""
+Local in-process vector index for Destiny Team
+
+Drop-in storage for QdrantSemanticStore when no Qdrant server is
+available (tests, CI, offline analysis):
+- Vectors: L2-normalized float32 matrix, memory-mapped from disk
+  (or plain in-memory arrays when no path is given)
+- Payloads: JSON-lines sidecar next to the matrix
+- Search: exact brute-force cosine (one matrix-vector product), or an
+  optional IVF index (k-means partitions) for large collections
+- Quantization (optional): int8 ("scalar", 4x smaller) or 1-bit
+  ("binary", 32x smaller) codes kept in RAM and searched first; the
+  best candidates are rescored with the float32 originals, which stay
+  memory-mapped on disk
+
+Payload filters follow QdrantSemanticStore's `filters` dict semantics:
+{"sender": "Architect"} matches payloads whose value equals the filter
+value, or - for list fields such as tags - contains it. Range conditions
+({"importance": (0.8, None)}) are inclusive, with None as an open bound;
+datetime bounds are compared against ISO-format payload timestamps.
+Filtered fields are kept as NumPy columns, so filters run as array
+masks rather than a per-row Python loop.
+"""
+
+import json
+import threading
+from collections.abc import Hashable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+QUANTIZATION_MODES = ("scalar", "binary")
+
+# Bit counts for every byte value (popcount lookup for binary codes)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+_NAT = np.datetime64("NaT", "us")
+
+
+def _to_datetime64(value: Any) -> np.datetime64:
+    """datetime / ISO string -> datetime64 (aware values in UTC), else NaT"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return _NAT
+    if not isinstance(value, datetime):
+        return _NAT
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+class _PayloadColumn:
+    """One payload field as NumPy arrays, for vectorised filters"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.values = np.empty(0, dtype=object)               # raw values (None = missing)
+        self.numbers = np.empty(0, dtype=np.float64)          # NaN = missing/not numeric
+        self.times = np.empty(0, dtype="datetime64[us]")      # NaT = missing/not a datetime
+        self.members: Dict[Any, set] = {}                     # value / list element -> rows
+        self.row_members: Dict[int, List[Any]] = {}
+
+    def _grow(self, size: int):
+        capacity = max(size, 2 * len(self.values), 1024)
+        self.values = np.concatenate([self.values, np.full(capacity - len(self.values), None)])
+        self.numbers = np.concatenate([self.numbers, np.full(capacity - len(self.numbers), np.nan)])
+        self.times = np.concatenate([self.times, np.full(capacity - len(self.times), _NAT)])
+
+    def update(self, rows: Iterable[int], payloads: Iterable[Dict[str, Any]]):
+        """(Re)index `rows` from their payloads"""
+        for row, payload in zip(rows, payloads):
+            if row >= len(self.values):
+                self._grow(row + 1)
+            for element in self.row_members.pop(row, ()):
+                self.members[element].discard(row)
+
+            value = payload.get(self.key)
+            elements = []
+            for element in (value if isinstance(value, list) else (value,)):
+                try:
+                    self.members.setdefault(element, set()).add(row)
+                except TypeError:  # unhashable - only matched by the slow path
+                    continue
+                elements.append(element)
+            self.row_members[row] = elements
+
+            self.values[row] = value
+            self.numbers[row] = np.nan
+            self.times[row] = _NAT
+            if isinstance(value, (int, float)):
+                self.numbers[row] = value
+            elif isinstance(value, (str, datetime)):
+                self.times[row] = _to_datetime64(value)
+
+    def equals(self, value: Any, count: int) -> np.ndarray:
+        """Rows whose value equals `value` or whose list contains it"""
+        if not isinstance(value, Hashable):
+            return np.fromiter(
+                (v == value or (isinstance(v, list) and value in v) for v in self.values[:count]),
+                dtype=bool, count=count
+            )
+        mask = np.zeros(count, dtype=bool)
+        mask[np.fromiter(self.members.get(value, ()), dtype=np.int64)] = True
+        return mask
+
+    def within(self, low: Any, high: Any, count: int) -> np.ndarray:
+        """Rows inside the inclusive [low, high] range (None = open)"""
+        if isinstance(low, datetime) or isinstance(high, datetime):
+            column = self.times[:count]
+            mask = ~np.isnat(column)
+            low = _to_datetime64(low) if low is not None else None
+            high = _to_datetime64(high) if high is not None else None
+        else:
+            column = self.numbers[:count]
+            mask = ~np.isnan(column)
+        if low is not None:
+            mask &= column >= low
+        if high is not None:
+            mask &= column <= high
+        return mask
+
+
+class _Collection:
+    """One collection: vector matrix + payloads (+ optional IVF index)"""
+
+    def __init__(
+        self,
+        dimension: int,
+        directory: Optional[Path] = None,
+        quantization: Optional[str] = None
+    ):
+        self.dimension = dimension
+        self.directory = directory
+        self.quantization = quantization
+        self.ids: List[Any] = []
+        self.rows: Dict[Any, int] = {}
+        self.payloads: List[Dict[str, Any]] = []
+        self.vectors = np.zeros((0, dimension), dtype=np.float32)
+
+        # Filtered payload fields (built on first use, kept current by upsert)
+        self.columns: Dict[str, _PayloadColumn] = {}
+
+        # IVF index (built on demand); assigned[row] = the row's list
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[List[int]] = []
+        self.assigned: List[int] = []
+
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+        # Quantized codes (in RAM) - rebuilt from the originals on load
+        self.codes = self._encode(np.asarray(self.vectors[:len(self.ids)]))
+        self.scales = self._scales(np.asarray(self.vectors[:len(self.ids)]))
+
+    # ---------- persistence ----------
+
+    @property
+    def _vector_file(self) -> Path:
+        return self.directory / "vectors.f32"
+
+    @property
+    def _payload_file(self) -> Path:
+        return self.directory / "payloads.jsonl"
+
+    def _load(self):
+        """Replay the payload sidecar and map the vector matrix"""
+        meta_file = self.directory / "meta.json"
+        if not meta_file.exists():
+            meta_file.write_text(json.dumps({
+                "dimension": self.dimension,
+                "quantization": self.quantization
+            }))
+        meta = json.loads(meta_file.read_text())
+        self.dimension = meta["dimension"]
+        self.quantization = meta.get("quantization")
+
+        if self._payload_file.exists():
+            with open(self._payload_file, encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    row = entry["row"]
+                    if row == len(self.ids):
+                        self.ids.append(entry["id"])
+                        self.payloads.append(entry["payload"])
+                    else:
+                        self.payloads[row] = entry["payload"]
+                    self.rows[entry["id"]] = row
+
+        existing = self._vector_file.stat().st_size if self._vector_file.exists() else 0
+        self._map_vectors(max(existing // (self.dimension * 4), len(self.ids), 1))
+
+    def _map_vectors(self, capacity: int):
+        """(Re)open the memory-mapped matrix with room for `capacity` rows"""
+        if self.directory is None:
+            grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+            grown[:len(self.ids)] = self.vectors[:len(self.ids)]
+            self.vectors = grown
+            return
+
+        needed = capacity * self.dimension * 4
+        with open(self._vector_file, "ab") as f:
+            if f.tell() < needed:
+                f.truncate(needed)
+        self.vectors = np.memmap(
+            self._vector_file, dtype=np.float32, mode="r+",
+            shape=(capacity, self.dimension)
+        )
+
+    def _reserve(self, count: int):
+        """Grow the matrix (doubling) so `count` rows fit"""
+        capacity = self.vectors.shape[0]
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity = max(capacity * 2, 1024)
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+        self._map_vectors(capacity)
+
+    # ---------- quantization ----------
+
+    def _encode(self, matrix: np.ndarray) -> Optional[np.ndarray]:
+        """Quantized codes for normalized vectors (None = no quantization)"""
+        if self.quantization == "scalar":
+            # Per-vector symmetric int8: v ~= codes * max|v| / 127
+            peak = np.abs(matrix).max(axis=1, keepdims=True) if len(matrix) else 1.0
+            peak = np.where(peak == 0, 1.0, peak)
+            return np.round(matrix / peak * 127).astype(np.int8)
+        if self.quantization == "binary":
+            return np.packbits(matrix > 0, axis=1)
+        return None
+
+    def _scales(self, matrix: np.ndarray) -> Optional[np.ndarray]:
+        """Per-vector dequantization scale for scalar codes"""
+        if self.quantization != "scalar":
+            return None
+        peak = np.abs(matrix).max(axis=1) if len(matrix) else np.zeros(0)
+        return (np.where(peak == 0, 1.0, peak) / 127).astype(np.float32)
+
+    def _store_codes(self, rows: List[int], matrix: np.ndarray):
+        """Write codes for `rows` (appending new rows in order)"""
+        if self.quantization is None:
+            return
+        codes = self._encode(matrix)
+        scales = self._scales(matrix)
+        total = len(self.ids)
+        if self.codes.shape[0] < total:
+            grown = np.zeros((total, self.codes.shape[1] or codes.shape[1]), dtype=self.codes.dtype)
+            grown[:self.codes.shape[0]] = self.codes
+            self.codes = grown
+            if scales is not None:
+                self.scales = np.concatenate([
+                    self.scales, np.zeros(total - self.scales.shape[0], dtype=np.float32)
+                ])
+        self.codes[rows] = codes
+        if scales is not None:
+            self.scales[rows] = scales
+
+    def approximate_scores(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Similarity estimated from the quantized codes"""
+        if self.quantization == "scalar":
+            query_codes = self._encode(query[None, :])[0].astype(np.float32)
+            query_scale = self._scales(query[None, :])[0]
+            return (self.codes[rows].astype(np.float32) @ query_codes) * self.scales[rows] * query_scale
+        # binary: cosine ~ 1 - 2 * hamming / dimension
+        query_bits = np.packbits(query > 0)
+        hamming = _POPCOUNT[np.bitwise_xor(self.codes[rows], query_bits)].sum(axis=1)
+        return 1.0 - 2.0 * hamming.astype(np.float32) / self.dimension
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Bytes held in RAM vs left on disk for this collection's vectors"""
+        originals = len(self.ids) * self.dimension * 4
+        codes = 0
+        if self.quantization is not None:
+            codes = self.codes[:len(self.ids)].nbytes
+            if self.scales is not None:
+                codes += self.scales[:len(self.ids)].nbytes
+        on_disk = self.directory is not None and self.quantization is not None
+        return {
+            "ram": codes + (0 if on_disk else originals),
+            "disk": originals if self.directory is not None else 0
+        }
+
+    # ---------- writes ----------
+
+    def upsert(self, ids: List[Any], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        """Insert or overwrite points"""
+        new_rows = [i for i in dict.fromkeys(ids) if i not in self.rows]
+        self._reserve(len(self.ids) + len(new_rows))
+
+        log = []
+        written = []
+        for point_id, vector, payload in zip(ids, vectors, payloads):
+            row = self.rows.get(point_id)
+            if row is None:
+                row = len(self.ids)
+                self.ids.append(point_id)
+                self.payloads.append(payload)
+                self.rows[point_id] = row
+                if self.centroids is not None:
+                    nearest = int(np.argmax(self.centroids @ vector))
+                    self.lists[nearest].append(row)
+                    self.assigned.append(nearest)
+            else:
+                self.payloads[row] = payload
+                if self.centroids is not None:
+                    # The new vector may belong to another partition
+                    nearest = int(np.argmax(self.centroids @ vector))
+                    if nearest != self.assigned[row]:
+                        self.lists[self.assigned[row]].remove(row)
+                        self.lists[nearest].append(row)
+                        self.assigned[row] = nearest
+            self.vectors[row] = vector
+            written.append(row)
+            log.append({"row": row, "id": point_id, "payload": payload})
+
+        self._store_codes(written, np.asarray(vectors, dtype=np.float32))
+        for column in self.columns.values():
+            column.update(written, [self.payloads[row] for row in written])
+
+        if self.directory is not None:
+            self.vectors.flush()
+            with open(self._payload_file, "a", encoding="utf-8") as f:
+                for entry in log:
+                    f.write(json.dumps(entry, default=str) + "\n")
+
+    # ---------- search ----------
+
+    def column(self, key: str) -> _PayloadColumn:
+        """NumPy column for a payload field (built on first use)"""
+        if key not in self.columns:
+            column = _PayloadColumn(key)
+            column.update(range(len(self.ids)), self.payloads)
+            self.columns[key] = column
+        return self.columns[key]
+
+    def filter_mask(
+        self,
+        filters: Optional[Dict[str, Any]],
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None
+    ) -> np.ndarray:
+        """Boolean mask over all rows - Qdrant MatchValue / Range semantics"""
+        count = len(self.ids)
+        mask = np.ones(count, dtype=bool)
+        for key, value in (filters or {}).items():
+            mask &= self.column(key).equals(value, count)
+        for key, (low, high) in (ranges or {}).items():
+            mask &= self.column(key).within(low, high, count)
+        return mask
+
+    def candidate_rows(self, vector: np.ndarray, nprobe: int) -> Optional[np.ndarray]:
+        """Rows in the nprobe closest IVF partitions (None = no index)"""
+        if self.centroids is None:
+            return None
+        probe = np.argsort(-(self.centroids @ vector))[:nprobe]
+        rows = [row for p in probe for row in self.lists[p]]
+        return np.asarray(rows, dtype=np.int64)
+
+    def build_ivf(self, nlist: int, iterations: int = 10, seed: int = 0):
+        """Partition vectors with spherical k-means"""
+        count = len(self.ids)
+        nlist = max(1, min(nlist, count))
+        matrix = np.asarray(self.vectors[:count])
+        rng = np.random.default_rng(seed)
+        centroids = matrix[rng.choice(count, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.argmax(matrix @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = matrix[assignment == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[c] = centroid / norm
+
+        assignment = np.argmax(matrix @ centroids.T, axis=1)
+        self.centroids = centroids
+        self.lists = [np.flatnonzero(assignment == c).tolist() for c in range(nlist)]
+        self.assigned = assignment.tolist()
+
+
+class LocalVectorIndex:
+    """
+    In-process vector collections with Qdrant-like semantics.
+
+    Usage:
+        index = LocalVectorIndex("~/.destiny/vectors")   # or None = in-memory
+        index.create_collection("destiny-team-demo", dimension=1024)
+        index.upsert("destiny-team-demo", ids, vectors, payloads)
+        hits = index.search("destiny-team-demo", query_vec, limit=5,
+                            filters={"sender": "Architect"})
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ivf_threshold: int = 50000,
+        nprobe: int = 8,
+        oversampling: float = 2.0
+    ):
+        """
+        Initialize local index.
+
+        Args:
+            path: Directory for memory-mapped collections (None = in-memory)
+            ivf_threshold: Build an IVF index automatically once a collection
+                reaches this many points (0 disables)
+            nprobe: IVF partitions scanned per query
+            oversampling: Quantized collections rescore limit * oversampling
+                candidates with the original vectors
+        """
+        self.path = Path(path).expanduser() if path else None
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.oversampling = oversampling
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.RLock()
+
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for directory in sorted(self.path.iterdir()):
+                if (directory / "meta.json").exists():
+                    self._collections[directory.name] = _Collection(0, directory)
+
+    # ==================== COLLECTIONS ====================
+
+    def collection_names(self) -> List[str]:
+        with self._lock:
+            return list(self._collections)
+
+    def collection_exists(self, name: str) -> bool:
+        with self._lock:
+            return name in self._collections
+
+    def create_collection(self, name: str, dimension: int, quantization: Optional[str] = None):
+        """
+        Create an empty collection (no-op if it exists)
+
+        Args:
+            name: Collection name
+            dimension: Vector size
+            quantization: None, "scalar" (int8) or "binary" (1 bit)
+        """
+        if quantization not in (None, *QUANTIZATION_MODES):
+            raise ValueError(f"quantization must be one of {QUANTIZATION_MODES}, got {quantization!r}")
+        with self._lock:
+            if name not in self._collections:
+                directory = self.path / name if self.path is not None else None
+                self._collections[name] = _Collection(dimension, directory, quantization)
+
+    def delete_collection(self, name: str):
+        """Drop a collection and its files"""
+        with self._lock:
+            collection = self._collections.pop(name)
+            if collection.directory is not None:
+                del collection.vectors
+                for file in collection.directory.iterdir():
+                    file.unlink()
+                collection.directory.rmdir()
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return len(self._collection(name).ids)
+
+    def memory_bytes(self, name: str) -> Dict[str, int]:
+        """{"ram": ..., "disk": ...} bytes used by a collection's vectors"""
+        with self._lock:
+            return self._collection(name).memory_bytes()
+
+    def _collection(self, name: str) -> _Collection:
+        if name not in self._collections:
+            raise KeyError(f"Collection {name} not found")
+        return self._collections[name]
+
+    # ==================== POINTS ====================
+
+    def upsert(
+        self,
+        name: str,
+        ids: List[Any],
+        vectors: Union[np.ndarray, List[List[float]]],
+        payloads: List[Dict[str, Any]]
+    ):
+        """Insert or overwrite points (vectors are normalized on write)"""
+        matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        with self._lock:
+            collection = self._collection(name)
+            collection.upsert(list(ids), matrix / norms, payloads)
+
+            if (
+                self.ivf_threshold
+                and collection.centroids is None
+                and len(collection.ids) >= self.ivf_threshold
+            ):
+                self.build_index(name)
+
+    def retrieve(self, name: str, point_id: Any) -> Optional[Tuple[List[float], Dict[str, Any]]]:
+        """(vector, payload) of a point, or None"""
+        with self._lock:
+            collection = self._collection(name)
+            row = collection.rows.get(point_id)
+            if row is None:
+                return None
+            return collection.vectors[row].tolist(), collection.payloads[row]
+
+    # ==================== SEARCH ====================
+
+    def search(
+        self,
+        name: str,
+        vector: Union[np.ndarray, List[float]],
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        exclude_ids: Optional[List[Any]] = None,
+        exact: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Cosine similarity search.
+
+        Args:
+            name: Collection name
+            vector: Query vector
+            limit: Max results
+            score_threshold: Minimum similarity score
+            filters: Payload filters (exact match / list contains)
+            ranges: Inclusive (min, max) bounds per field, None = open
+            exclude_ids: Point IDs to leave out (e.g. the query's own point)
+            exact: Brute-force on the original vectors, ignoring the IVF
+                index and quantized codes
+
+        Returns:
+            [{"id", "score", "payload"}], best first
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        with self._lock:
+            collection = self._collection(name)
+            count = len(collection.ids)
+            if count == 0:
+                return []
+
+            rows = None if exact else collection.candidate_rows(query, self.nprobe)
+            if rows is None:
+                rows = np.arange(count)
+
+            excluded = [collection.rows[i] for i in (exclude_ids or []) if i in collection.rows]
+            if filters or ranges or excluded:
+                mask = collection.filter_mask(filters, ranges)
+                mask[excluded] = False
+                rows = rows[mask[rows]]
+            if len(rows) == 0:
+                return []
+
+            if collection.quantization is not None and not exact:
+                # Shortlist on the codes, rescore with the originals
+                approx = collection.approximate_scores(rows, query)
+                shortlist = min(len(rows), max(limit, int(np.ceil(limit * self.oversampling))))
+                keep = np.argpartition(-approx, shortlist - 1)[:shortlist]
+                rows = np.sort(rows[keep])
+
+            scores = np.asarray(collection.vectors[rows]) @ query
+            if score_threshold is not None:
+                keep = scores >= score_threshold
+                rows, scores = rows[keep], scores[keep]
+
+            k = min(limit, len(scores))
+            if k <= 0:
+                return []
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+
+            return [
+                {
+                    "id": collection.ids[rows[i]],
+                    "score": float(scores[i]),
+                    "payload": collection.payloads[rows[i]]
+                }
+                for i in best
+            ]
+
+    def build_index(self, name: str, nlist: Optional[int] = None):
+        """
+        Build an IVF index for approximate search.
+
+        Args:
+            name: Collection name
+            nlist: Number of partitions (default: ~sqrt(points))
+        """
+        with self._lock:
+            collection = self._collection(name)
+            count = len(collection.ids)
+            if count == 0:
+                return
+            collection.build_ivf(nlist or max(1, int(np.sqrt(count))))
+
+    def drop_index(self, name: str):
+        """Go back to exact search"""
+        with self._lock:
+            collection = self._collection(name)
+            collection.centroids = None
+            collection.lists = []
+            collection.assigned = []
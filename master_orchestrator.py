@@ -33,6 +33,7 @@ class MasterOrchestrator:
         self,
         # PostgreSQL
         postgres_conn: str,
+        postgres_pool_size: int = 10,
         
         # Neo4j
         neo4j_uri: str = "bolt://localhost:7687",
@@ -45,6 +46,8 @@ class MasterOrchestrator:
         # Redis
         redis_host: str = "localhost",
         redis_port: int = 6379,
+        redis_l1_size: int = 0,
+        redis_hot_memory_mode: str = "list",
         
         # LM Studio
         lmstudio_url: str = "http://localhost:1234/v1"
@@ -54,12 +57,17 @@ class MasterOrchestrator:
         
         Args:
             postgres_conn: PostgreSQL connection string
+            postgres_pool_size: Pooled PostgreSQL connections for concurrent
+                agents (0 = one shared connection)
             neo4j_uri: Neo4j Bolt URI
             neo4j_user: Neo4j username
             neo4j_password: Neo4j password
             qdrant_url: Qdrant HTTP endpoint
             redis_host: Redis host
             redis_port: Redis port
+            redis_l1_size: In-process L1 entries in front of Redis (0 = off;
+                enabling it starts a pub/sub invalidation listener thread)
+            redis_hot_memory_mode: "list" or "stream" (followable hot memory)
             lmstudio_url: LM Studio API endpoint
         """
         print("🚀 Initializing Master Orchestrator...")
@@ -67,11 +75,20 @@ class MasterOrchestrator:
         
         # Layer 1: Hot Cache (Redis)
         print("  [1/4] Redis cache...")
-        self.cache = RedisCache(host=redis_host, port=redis_port)
+        self.cache = RedisCache(
+            host=redis_host,
+            port=redis_port,
+            l1_size=redis_l1_size,
+            hot_memory_mode=redis_hot_memory_mode
+        )
         
         # Layer 2: Structured Data (PostgreSQL)
         print("  [2/4] PostgreSQL store...")
-        self.postgres = PostgresContextStore(postgres_conn)
+        self.postgres = PostgresContextStore(
+            postgres_conn,
+            pooled=postgres_pool_size > 0,
+            maxconn=max(postgres_pool_size, 1)
+        )
         
         # Layer 3: Semantic Search (Qdrant + LM Studio)
         print("  [3/4] Qdrant + LM Studio...")
@@ -151,51 +168,56 @@ class MasterOrchestrator:
         timestamp = datetime.now()
         tags = tags or []
         
-        # Layer 1: Hot cache (instant access)
-        self.cache.add_to_hot_memory(project_id, {
-            "id": message_id,
-            "sender": sender,
-            "content": content,
-            "timestamp": timestamp.isoformat()
-        })
-        
-        # Layer 2: PostgreSQL (structured storage)
-        from postgres_context_store import StoredMessage
-        postgres_msg = StoredMessage(
-            id=message_id,
-            project_id=project_id,
-            sender=sender,
-            recipient=recipient,
-            message_type=message_type,
-            content=content,
-            context={},
-            timestamp=timestamp,
-            importance=importance,
-            tags=tags
-        )
-        self.postgres.store_message(postgres_msg)
-        
-        # Layer 3: Qdrant (semantic search)
-        self.qdrant.store_message(
-            project_id=project_id,
-            message_id=message_id,
-            content=content,
-            sender=sender,
-            timestamp=timestamp,
-            message_type=message_type,
-            importance=importance,
-            tags=tags
-        )
+        try:
+            # Layer 1: Hot cache (instant access)
+            self.cache.add_to_hot_memory(project_id, {
+                "id": message_id,
+                "sender": sender,
+                "content": content,
+                "timestamp": timestamp.isoformat()
+            })
         
-        # Layer 4: Neo4j (knowledge graph)
-        self.neo4j.add_message_to_graph(
-            message_id=message_id,
-            project_id=project_id,
-            sender=sender,
-            content=content,
-            timestamp=timestamp,
-            message_type=message_type
-        )
+            # Layer 2: PostgreSQL (structured storage)
+            from postgres_context_store import StoredMessage
+            postgres_msg = StoredMessage(
+                id=message_id,
+                project_id=project_id,
+                sender=sender,
+                recipient=recipient,
+                message_type=message_type,
+                content=content,
+                context={},
+                timestamp=timestamp,
+                importance=importance,
+                tags=tags
+            )
+            self.postgres.store_message(postgres_msg)
+        
+            # Layer 3: Qdrant (semantic search)
+            self.qdrant.store_message(
+                project_id=project_id,
+                message_id=message_id,
+                content=content,
+                sender=sender,
+                timestamp=timestamp,
+                message_type=message_type,
+                importance=importance,
+                tags=tags
+            )
+        
+            # Layer 4: Neo4j (knowledge graph)
+            self.neo4j.add_message_to_graph(
+                message_id=message_id,
+                project_id=project_id,
+                sender=sender,
+                content=content,
+                timestamp=timestamp,
+                message_type=message_type
+            )
+        finally:
+            # Cached searches of this project no longer see everything -
+            # bumped even if a later layer fails after an earlier write landed
+            self.cache.bump_search_generation(project_id)
         
         return message_id
     
@@ -226,10 +248,10 @@ class MasterOrchestrator:
             Ranked results from appropriate layer(s)
         """
         # Check cache first
-        cached = self.cache.get_cached_search(query, project_id)
-        if cached:
+        cached = self.cache.get_cached_search(query, project_id, search_type, limit)
+        if cached is not None:
             print("  ⚡ Cache hit!")
-            return cached[:limit]
+            return cached
         
         results = []
         
@@ -254,7 +276,13 @@ class MasterOrchestrator:
             results = self._search_hybrid(project_id, query, limit)
         
         # Cache results
-        self.cache.cache_search_results(query, project_id, results, ttl=300)
+        # Long TTL is safe: store_message bumps the project's generation
+        self.cache.cache_search_results(
+            query, project_id, results,
+            ttl=3600,
+            search_type=search_type,
+            limit=limit
+        )
         
         return results
     
@@ -36,9 +36,11 @@ def migrate_all_to_qdrant():
     )
     print("  ✅ PostgreSQL connected")
     
+    # Re-running the migration reuses embeddings from earlier runs
     qdrant = QdrantSemanticStore(
         qdrant_url="http://localhost:6333",
-        lmstudio_url="http://localhost:1234/v1"
+        lmstudio_url="http://localhost:1234/v1",
+        embedding_cache_path="~/.destiny/embeddings.db"
     )
     print("  ✅ Qdrant connected")
     print("  ✅ LM Studio connected")
@@ -50,7 +52,7 @@ def migrate_all_to_qdrant():
     print("=" * 70)
     print()
     
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         cur.execute("""
             SELECT project_id, project_name
             FROM projects
@@ -86,7 +88,7 @@ def migrate_all_to_qdrant():
         print()
         
         # Get all messages for this project
-        with postgres.conn.cursor() as cur:
+        with postgres.cursor() as cur:
             cur.execute("""
                 SELECT id, sender, recipient, content, message_type, 
                        timestamp, importance, tags
@@ -498,7 +498,7 @@ class PostgresNeo4jBridge:
         Returns stats: messages_synced, concepts_extracted, decisions_added
         """
         # Get all messages for project
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT id, sender, content, timestamp, message_type
                 FROM messages
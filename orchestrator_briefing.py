@@ -226,7 +226,7 @@ class OrchestratorBriefingGenerator:
     
     def _get_project_info(self, project_id: str) -> Dict:
         """Get basic project info"""
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT project_name, current_phase, metadata
                 FROM projects
@@ -246,7 +246,7 @@ class OrchestratorBriefingGenerator:
     def _get_team_status(self, project_id: str) -> Dict:
         """Get team status"""
         # Get all agents from messages
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT DISTINCT sender
                 FROM messages
@@ -276,7 +276,7 @@ class OrchestratorBriefingGenerator:
     
     def _get_work_status(self, project_id: str) -> Dict:
         """Get work/task status"""
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             # Get tasks from work queue
             cur.execute("""
                 SELECT task, status, agent_name
@@ -292,7 +292,7 @@ class OrchestratorBriefingGenerator:
         pending = [t[0] for t in tasks if t[1] == 'pending']
         
         # Get blockers from messages
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT content
                 FROM messages
@@ -314,7 +314,7 @@ class OrchestratorBriefingGenerator:
     
     def _get_recent_decisions(self, project_id: str, days: int = 7) -> List[Dict]:
         """Get recent decisions"""
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT decision_text, made_by, timestamp, context
                 FROM decisions
@@ -337,7 +337,7 @@ class OrchestratorBriefingGenerator:
     def _get_plans(self, project_id: str) -> Dict:
         """Get plans and goals"""
         # Get from agent contexts (where plans are stored)
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT context_key, context_value
                 FROM agent_contexts
@@ -366,7 +366,7 @@ class OrchestratorBriefingGenerator:
     
     def _get_last_session_summary(self, project_id: str) -> str:
         """Get summary of last work session"""
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT context_value
                 FROM agent_contexts
@@ -388,7 +388,7 @@ class OrchestratorBriefingGenerator:
         notes = []
         
         # Check for high-importance unresolved items
-        with self.postgres.conn.cursor() as cur:
+        with self.postgres.cursor() as cur:
             cur.execute("""
                 SELECT content
                 FROM messages
@@ -14,15 +14,30 @@ Key Features:
 """
 
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
-from typing import List, Dict, Any, Optional, Tuple
+from psycopg2 import sql as psql
+from psycopg2.extras import RealDictCursor, Json, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from itertools import islice
+import io
 import json
 import hashlib
-from dataclasses import dataclass, asdict
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 
 
+# Text search configs folded into messages.search_vector: 'simple' (no
+# stemming - works for Polish and identifiers) and 'english' (stemmed).
+# 'polish' is not built into PostgreSQL; it is used when the server has
+# one installed (e.g. a hunspell-based config).
+TEXT_SEARCH_CONFIGS = ("simple", "english", "polish")
+
+
 class MessageType(Enum):
     REQUEST = "REQUEST"
     ANNOUNCEMENT = "ANNOUNCEMENT"
@@ -53,6 +68,125 @@ class StoredMessage:
             self.tags = []
 
 
+_MESSAGE_FIELDS = {f.name for f in fields(StoredMessage)}
+
+# Insert column order shared by store_message and store_messages
+_MESSAGE_COLUMNS = (
+    "id", "project_id", "sender", "recipient", "message_type", "content",
+    "context", "timestamp", "requires_response", "response_to", "importance", "tags"
+)
+
+
+# Conflict target of the messages upsert: a partitioned table's primary
+# key has to include the partition key
+_MESSAGE_KEYS = {None: ("id",), "month": ("id", "timestamp"), "project": ("id", "project_id")}
+
+# Partitions live in the same schema as messages; detached ones are moved here
+ARCHIVE_SCHEMA = "messages_archive"
+
+_MONTH_PARTITION = re.compile(r"^messages_y(\d{4})m(\d{2})$")
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def _next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _month_partition_name(month: datetime) -> str:
+    return f"messages_y{month.year:04d}m{month.month:02d}"
+
+
+def _project_partition_name(project_id: str) -> str:
+    # Identifiers max out at 63 bytes; the hash keeps truncated or
+    # sanitized ids apart
+    slug = re.sub(r"[^a-z0-9]+", "_", project_id.lower()).strip("_")[:40]
+    digest = hashlib.md5(project_id.encode()).hexdigest()[:8]
+    return f"messages_p_{slug}_{digest}"
+
+
+def messages_layout(cur) -> Optional[str]:
+    """
+    Layout of the messages table
+    
+    Returns:
+        "month", "project", "plain", or None if there is no table yet
+    """
+    cur.execute("""
+        SELECT c.relkind, p.partstrat
+        FROM pg_class c
+        LEFT JOIN pg_partitioned_table p ON p.partrelid = c.oid
+        WHERE c.oid = to_regclass('messages')
+    """)
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return {"r": "month", "l": "project"}.get(row[1], "plain")
+
+
+def ensure_message_partitions(cur, layout: Optional[str], rows: Iterable[Tuple[str, datetime]]) -> List[str]:
+    """
+    Create the messages partitions that (project_id, timestamp) rows need
+    
+    For everything that INSERTs into messages - PostgresContextStore and
+    HelenaCore's direct inserts alike. Runs in the caller's transaction,
+    right before its INSERT. Existence is checked against the catalog
+    each time (one query), so partitions archived or dropped by another
+    process are recreated rather than assumed.
+    
+    Args:
+        cur: Cursor (not in autocommit mode)
+        layout: messages_layout(); anything but "month"/"project" is a no-op
+        rows: (project_id, timestamp) of the rows about to be inserted
+        
+    Returns:
+        Names of the partitions created
+    """
+    needed = {}
+    for project_id, timestamp in rows:
+        if layout == "month":
+            month = _month_start(timestamp)
+            needed[_month_partition_name(month)] = psql.SQL("FOR VALUES FROM ({}) TO ({})").format(
+                psql.Literal(month), psql.Literal(_next_month(month))
+            )
+        elif layout == "project":
+            needed[_project_partition_name(project_id)] = psql.SQL("FOR VALUES IN ({})").format(
+                psql.Literal(project_id)
+            )
+    if not needed:
+        return []
+    
+    cur.execute("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass('messages') AND c.relname = ANY(%s)
+    """, (list(needed),))
+    existing = {row[0] for row in cur.fetchall()}
+    
+    created = []
+    for name, bounds in needed.items():
+        if name in existing:
+            continue
+        # A concurrent writer may create it first; don't abort the caller's INSERT
+        cur.execute("SAVEPOINT ensure_partition")
+        try:
+            cur.execute(psql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF messages {}").format(
+                psql.Identifier(name), bounds
+            ))
+            created.append(name)
+        except (psycopg2.errors.DuplicateTable, psycopg2.errors.UniqueViolation):
+            cur.execute("ROLLBACK TO SAVEPOINT ensure_partition")
+        cur.execute("RELEASE SAVEPOINT ensure_partition")
+    return created
+
+
+def _row_to_message(row: Dict[str, Any]) -> StoredMessage:
+    """Row -> StoredMessage (ignores extra columns like search_vector, rank)"""
+    return StoredMessage(**{k: v for k, v in row.items() if k in _MESSAGE_FIELDS})
+
+
 class PostgresContextStore:
     """
     Manages unlimited context storage in PostgreSQL
@@ -61,48 +195,166 @@ class PostgresContextStore:
     Uses semantic relevance scoring to fetch most pertinent messages.
     """
     
-    def __init__(self, connection_string: str):
+    # Declarative partitioning of messages: monthly timestamp ranges, or
+    # one partition per project
+    PARTITIONING_MODES = ("month", "project")
+    
+    def __init__(
+        self,
+        connection_string: str,
+        pooled: bool = False,
+        minconn: int = 1,
+        maxconn: int = 10,
+        pool_timeout: float = 10.0,
+        statement_timeout_ms: Optional[int] = None,
+        partitioning: Optional[str] = None,
+        partitions_ahead: int = 2,
+        retention_months: Optional[int] = None
+    ):
         """
         Initialize connection to PostgreSQL
         
         Args:
             connection_string: PostgreSQL connection string
                 Example: "dbname=destiny_team user=artur password=xxx host=localhost"
+            pooled: Use a ThreadedConnectionPool so concurrent agents each
+                get their own connection (default: one shared connection,
+                used by one thread at a time)
+            minconn / maxconn: Pool size bounds (pooled mode)
+            pool_timeout: Seconds to wait for a free pooled connection
+            statement_timeout_ms: Server-side limit per statement
+                (None = server default)
+            partitioning: Create messages partitioned by "month" or
+                "project" (None = plain table). Only applies when the
+                table is created; an existing table keeps its layout.
+            partitions_ahead: Monthly partitions created ahead of time
+            retention_months: Detach monthly partitions older than this
+                into the messages_archive schema on startup (None = keep)
         """
+        if partitioning not in (None,) + self.PARTITIONING_MODES:
+            raise ValueError(
+                f"partitioning must be None or one of {self.PARTITIONING_MODES}, got {partitioning!r}"
+            )
+        
         self.conn_string = connection_string
-        self.conn = None
+        self.conn = None  # shared connection (non-pooled mode)
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self.pooled = pooled
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.pool_timeout = pool_timeout
+        self.statement_timeout_ms = statement_timeout_ms
+        self._lock = threading.RLock()
+        self.full_text_search = False  # messages.search_vector present
+        self.trigram_search = False     # pg_trgm index on content
+        self._search_configs: List[str] = ["simple"]
+        self.partitioning = partitioning  # actual layout, set by _ensure_schema
+        self.partitions_ahead = partitions_ahead
+        self.retention_months = retention_months
         self._connect()
         self._ensure_schema()
     
+    def _connect_kwargs(self) -> Dict[str, Any]:
+        if self.statement_timeout_ms is None:
+            return {}
+        return {"options": f"-c statement_timeout={int(self.statement_timeout_ms)}"}
+    
     def _connect(self):
-        """Establish database connection"""
+        """Establish database connection (or the pool)"""
         try:
-            self.conn = psycopg2.connect(self.conn_string)
-            self.conn.autocommit = False
+            if self.pooled:
+                self.pool = ThreadedConnectionPool(
+                    self.minconn, self.maxconn, self.conn_string,
+                    **self._connect_kwargs()
+                )
+            else:
+                self.conn = psycopg2.connect(self.conn_string, **self._connect_kwargs())
+                self.conn.autocommit = False
         except Exception as e:
             raise ConnectionError(f"Failed to connect to PostgreSQL: {e}")
     
+    def _getconn(self):
+        """Take a pooled connection, waiting up to pool_timeout if exhausted"""
+        deadline = time.monotonic() + self.pool_timeout
+        while True:
+            try:
+                return self.pool.getconn()
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+    
+    @contextmanager
+    def _connection(self, autocommit: bool = False):
+        """
+        Connection for one unit of work
+        
+        Pooled: a connection of its own. Otherwise: the shared connection,
+        held under a lock. Commits on success, rolls back on error (so a
+        failed statement never leaves an aborted transaction behind), and
+        drops connections that broke so the next call reconnects.
+        """
+        if self.pool is not None:
+            conn = self._getconn()
+        else:
+            self._lock.acquire()
+            try:
+                if self.conn is None or self.conn.closed:
+                    self._connect()
+            except Exception:
+                self._lock.release()
+                raise
+            conn = self.conn
+        
+        broken = False
+        try:
+            conn.autocommit = autocommit
+            yield conn
+            if not autocommit:
+                conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        except Exception:
+            if not autocommit and not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            broken = broken or bool(conn.closed)
+            if not broken:
+                conn.autocommit = False
+            if self.pool is not None:
+                self.pool.putconn(conn, close=broken)
+            else:
+                if broken:
+                    try:
+                        conn.close()
+                    except psycopg2.Error:
+                        pass
+                    self.conn = None
+                self._lock.release()
+    
+    @contextmanager
+    def cursor(self, dict_rows: bool = False):
+        """
+        Cursor for one unit of work (commit on success, rollback on error)
+        
+        Usage:
+            with store.cursor(dict_rows=True) as cur:
+                cur.execute("SELECT ...")
+                rows = cur.fetchall()
+        
+        Args:
+            dict_rows: Return rows as dicts (RealDictCursor)
+        """
+        with self._connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor if dict_rows else None) as cur:
+                yield cur
+    
     def _ensure_schema(self):
         """Create tables if they don't exist"""
         schema_sql = """
-        -- Main messages table
-        CREATE TABLE IF NOT EXISTS messages (
-            id VARCHAR(255) PRIMARY KEY,
-            project_id VARCHAR(255) NOT NULL,
-            sender VARCHAR(255) NOT NULL,
-            recipient VARCHAR(255),
-            message_type VARCHAR(50) NOT NULL,
-            content TEXT NOT NULL,
-            context JSONB,
-            timestamp TIMESTAMP NOT NULL DEFAULT NOW(),
-            requires_response BOOLEAN DEFAULT FALSE,
-            response_to VARCHAR(255),
-            importance FLOAT DEFAULT 0.5,
-            tags TEXT[],
-            
-            -- Indexes for fast queries
-            CONSTRAINT fk_response_to FOREIGN KEY (response_to) REFERENCES messages(id) ON DELETE SET NULL
-        );
+        -- Main messages table: see _messages_table_sql
         
         CREATE INDEX IF NOT EXISTS idx_messages_project ON messages(project_id);
         CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages(sender);
@@ -111,6 +363,11 @@ class PostgresContextStore:
         CREATE INDEX IF NOT EXISTS idx_messages_type ON messages(message_type);
         CREATE INDEX IF NOT EXISTS idx_messages_tags ON messages USING GIN(tags);
         CREATE INDEX IF NOT EXISTS idx_messages_context ON messages USING GIN(context);
+        -- Candidate sets of get_relevant_context_for_agent
+        CREATE INDEX IF NOT EXISTS idx_messages_project_importance
+            ON messages(project_id, importance DESC, timestamp DESC);
+        CREATE INDEX IF NOT EXISTS idx_messages_project_timestamp
+            ON messages(project_id, timestamp DESC);
         
         -- Agent context table (each agent's personal knowledge)
         CREATE TABLE IF NOT EXISTS agent_contexts (
@@ -175,9 +432,354 @@ class PostgresContextStore:
         -- );
         """
         
-        with self.conn.cursor() as cur:
+        with self.cursor() as cur:
+            layout = self._messages_layout(cur) or self._create_messages_table(cur)
+            self.partitioning = None if layout == "plain" else layout
             cur.execute(schema_sql)
-            self.conn.commit()
+        
+        if self.partitioning == "month":
+            now = datetime.now()
+            self.ensure_partitions(now, now + timedelta(days=31 * self.partitions_ahead))
+            if self.retention_months:
+                self.archive_partitions(self._retention_cutoff())
+        
+        self._ensure_text_search()
+    
+    # ==================== PARTITIONING ====================
+    
+    def _messages_layout(self, cur) -> Optional[str]:
+        """messages_layout(), warning when it differs from the requested one"""
+        layout = messages_layout(cur)
+        if layout and self.partitioning is not None and layout != self.partitioning:
+            print(f"ℹ️  messages already exists ({layout}); partitioning={self.partitioning!r} ignored")
+        return layout
+    
+    def _create_messages_table(self, cur) -> str:
+        """Create messages with the requested layout; returns the layout"""
+        columns = """
+            id VARCHAR(255) NOT NULL,
+            project_id VARCHAR(255) NOT NULL,
+            sender VARCHAR(255) NOT NULL,
+            recipient VARCHAR(255),
+            message_type VARCHAR(50) NOT NULL,
+            content TEXT NOT NULL,
+            context JSONB,
+            timestamp TIMESTAMP NOT NULL DEFAULT NOW(),
+            requires_response BOOLEAN DEFAULT FALSE,
+            response_to VARCHAR(255),
+            importance FLOAT DEFAULT 0.5,
+            tags TEXT[],
+        """
+        if self.partitioning is None:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS messages (
+                    {columns}
+                    PRIMARY KEY (id),
+                    CONSTRAINT fk_response_to FOREIGN KEY (response_to) REFERENCES messages(id) ON DELETE SET NULL
+                )
+            """)
+            return "plain"
+        
+        # No response_to foreign key: id alone is not unique across partitions
+        key = ", ".join(_MESSAGE_KEYS[self.partitioning])
+        partition_by = "RANGE (timestamp)" if self.partitioning == "month" else "LIST (project_id)"
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS messages (
+                {columns}
+                PRIMARY KEY ({key})
+            ) PARTITION BY {partition_by}
+        """)
+        return self.partitioning
+    
+    def ensure_partitions(self, start: datetime, end: Optional[datetime] = None) -> List[str]:
+        """
+        Create the monthly partitions covering start..end (month mode)
+        
+        Called on startup for the next partitions_ahead months; writes
+        create any other month they touch on the fly.
+        
+        Returns:
+            Names of the partitions created
+        """
+        months = []
+        month = _month_start(start)
+        while month <= (end or start):
+            months.append(month)
+            month = _next_month(month)
+        with self.cursor() as cur:
+            return ensure_message_partitions(cur, self.partitioning, [(None, m) for m in months])
+    
+    def ensure_project_partition(self, project_id: str) -> List[str]:
+        """Create the partition for project_id (project mode)"""
+        with self.cursor() as cur:
+            return ensure_message_partitions(cur, self.partitioning, [(project_id, None)])
+    
+    def _ensure_partitions_for(self, cur, messages: List[StoredMessage]):
+        """Partitions for a batch about to be written (in its transaction)"""
+        ensure_message_partitions(cur, self.partitioning, ((m.project_id, m.timestamp) for m in messages))
+    
+    def list_partitions(self) -> List[Dict[str, Any]]:
+        """
+        Attached partitions of messages
+        
+        Returns:
+            [{"name", "bounds", "rows" (planner estimate), "month" (month
+            mode: first day of the partition's month, else None)}]
+        """
+        with self.cursor(dict_rows=True) as cur:
+            cur.execute("""
+                SELECT c.relname AS name,
+                       pg_get_expr(c.relpartbound, c.oid) AS bounds,
+                       GREATEST(c.reltuples, 0)::BIGINT AS rows
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = to_regclass('messages')
+                ORDER BY c.relname
+            """)
+            partitions = [dict(row) for row in cur.fetchall()]
+        
+        for partition in partitions:
+            match = _MONTH_PARTITION.match(partition["name"])
+            partition["month"] = datetime(int(match[1]), int(match[2]), 1) if match else None
+        return partitions
+    
+    def _retention_cutoff(self) -> datetime:
+        month = _month_start(datetime.now())
+        for _ in range(self.retention_months):
+            month = _month_start(month - timedelta(days=1))
+        return month
+    
+    def expired_partitions(self, before: datetime) -> List[Dict[str, Any]]:
+        """Monthly partitions holding only rows older than `before`"""
+        return [
+            p for p in self.list_partitions()
+            if p["month"] is not None and _next_month(p["month"]) <= before
+        ]
+    
+    def _remove_partition(self, name: str, archive: bool):
+        """Detach a partition, then drop it or move it to ARCHIVE_SCHEMA"""
+        with self.cursor() as cur:
+            cur.execute(psql.SQL("ALTER TABLE messages DETACH PARTITION {}").format(psql.Identifier(name)))
+            if archive:
+                cur.execute(psql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(psql.Identifier(ARCHIVE_SCHEMA)))
+                cur.execute(psql.SQL("ALTER TABLE {} SET SCHEMA {}").format(
+                    psql.Identifier(name), psql.Identifier(ARCHIVE_SCHEMA)
+                ))
+            else:
+                cur.execute(psql.SQL("DROP TABLE {}").format(psql.Identifier(name)))
+    
+    def archive_partitions(self, before: datetime, drop: bool = False) -> List[str]:
+        """
+        Detach monthly partitions that end before `before`
+        
+        Detached partitions keep their rows as plain tables in the
+        messages_archive schema (or are dropped with drop=True) - no
+        row-by-row DELETE, no table bloat.
+        
+        Args:
+            before: Cutoff; partitions whose whole month precedes it go
+            drop: Drop instead of archiving
+            
+        Returns:
+            Names of the removed partitions
+        """
+        removed = []
+        for partition in self.expired_partitions(before):
+            self._remove_partition(partition["name"], archive=not drop)
+            removed.append(partition["name"])
+        if removed:
+            print(f"🗄️  {'Dropped' if drop else 'Archived'} {len(removed)} message partitions before {before:%Y-%m}")
+        return removed
+    
+    def cleanup_messages(
+        self,
+        older_than: datetime,
+        project_id: Optional[str] = None,
+        archive: bool = False,
+        dry_run: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Remove messages older than a cutoff, by whole partitions where the
+        layout allows it
+        
+        - month partitioning, all projects: detach whole months before the
+          cutoff (rows of the month containing it stay until that month
+          expires)
+        - project partitioning: a project whose newest message is older
+          than the cutoff loses its partition; other projects DELETE
+          (pruned to their own partition)
+        - otherwise: DELETE
+        
+        Args:
+            older_than: Cutoff timestamp
+            project_id: Limit to one project (None = all projects)
+            archive: Move removed partitions to messages_archive instead
+                of dropping them
+            dry_run: Only report what would be removed
+            
+        Returns:
+            {"partitioning", "partitions": [names], "partition_rows",
+             "deleted_rows", "dry_run"}
+        """
+        report = {
+            "partitioning": self.partitioning, "partitions": [],
+            "partition_rows": 0, "deleted_rows": 0, "dry_run": dry_run
+        }
+        partitions = []
+        delete_rows = True
+        
+        with self.cursor() as cur:
+            if self.partitioning == "month" and project_id is None:
+                partitions = [p["name"] for p in self.expired_partitions(older_than)]
+                delete_rows = False
+            elif self.partitioning == "project":
+                cur.execute("""
+                    SELECT project_id FROM messages
+                    WHERE project_id = COALESCE(%s, project_id)
+                    GROUP BY project_id
+                    HAVING MAX(timestamp) < %s
+                """, (project_id, older_than))
+                partitions = [_project_partition_name(row[0]) for row in cur.fetchall()]
+            
+            for name in partitions:
+                cur.execute(psql.SQL("SELECT COUNT(*) FROM {}").format(psql.Identifier(name)))
+                report["partition_rows"] += cur.fetchone()[0]
+            report["partitions"] = partitions
+            
+            if delete_rows:
+                # Rows in the partitions above are counted there
+                cur.execute("""
+                    SELECT COUNT(*) FROM messages
+                    WHERE timestamp < %s AND project_id = COALESCE(%s, project_id)
+                """, (older_than, project_id))
+                report["deleted_rows"] = cur.fetchone()[0] - report["partition_rows"]
+        
+        if dry_run:
+            return report
+        
+        for name in partitions:
+            self._remove_partition(name, archive=archive)
+        if delete_rows and report["deleted_rows"]:
+            with self.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM messages
+                    WHERE timestamp < %s AND project_id = COALESCE(%s, project_id)
+                """, (older_than, project_id))
+                report["deleted_rows"] = cur.rowcount
+        return report
+    
+    # ==================== FULL-TEXT SEARCH SCHEMA ====================
+    
+    def _available_search_configs(self, cur) -> List[str]:
+        """TEXT_SEARCH_CONFIGS that exist on this server"""
+        cur.execute(
+            "SELECT cfgname FROM pg_ts_config WHERE cfgname = ANY(%s)",
+            (list(TEXT_SEARCH_CONFIGS),)
+        )
+        available = {row[0] for row in cur.fetchall()}
+        return [cfg for cfg in TEXT_SEARCH_CONFIGS if cfg in available]
+    
+    def _search_vector_sql(self) -> str:
+        """Generated-column expression for messages.search_vector"""
+        return " || ".join(
+            f"to_tsvector('{cfg}', coalesce(content, ''))"
+            for cfg in self._search_configs
+        )
+    
+    def _has_search_vector(self, cur) -> bool:
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'messages' AND column_name = 'search_vector'
+        """)
+        return cur.fetchone() is not None
+    
+    def _ensure_text_search(self):
+        """
+        Enable tsvector/GIN and pg_trgm search where it is cheap.
+        
+        Fresh (empty) messages tables get the generated column straight
+        away; populated ones need migrate_full_text_search(), which
+        rewrites the table and builds the indexes concurrently. Until
+        then search_messages() keeps using ILIKE.
+        """
+        with self.cursor() as cur:
+            self._search_configs = self._available_search_configs(cur)
+            
+            if not self._has_search_vector(cur):
+                cur.execute("SELECT EXISTS (SELECT 1 FROM messages)")
+                if cur.fetchone()[0]:
+                    print("ℹ️  messages has no full-text index yet - run: "
+                          "python postgres_context_store.py --migrate-fts")
+                    return
+                cur.execute(f"""
+                    ALTER TABLE messages ADD COLUMN search_vector tsvector
+                    GENERATED ALWAYS AS ({self._search_vector_sql()}) STORED
+                """)
+            
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_messages_search_vector
+                ON messages USING GIN(search_vector)
+            """)
+        self.full_text_search = True
+        
+        self.trigram_search = self._ensure_trigram_index()
+    
+    def _ensure_trigram_index(self, concurrently: bool = False) -> bool:
+        """pg_trgm index on content for fuzzy matches (needs the extension)"""
+        try:
+            # CONCURRENTLY can't run in a transaction
+            with self._connection(autocommit=concurrently) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                    cur.execute(f"""
+                        CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS idx_messages_content_trgm
+                        ON messages USING GIN(content gin_trgm_ops)
+                    """)
+            return True
+        except psycopg2.Error as e:
+            print(f"⚠️  pg_trgm unavailable, fuzzy matching disabled: {e}")
+            return False
+    
+    def migrate_full_text_search(self) -> Dict[str, Any]:
+        """
+        Add full-text search to an existing (populated) messages table.
+        
+        Adds the generated search_vector column (one table rewrite, under
+        an exclusive lock) and builds the GIN and trigram indexes with
+        CREATE INDEX CONCURRENTLY so writes continue meanwhile.
+        
+        Returns:
+            What was done: column_added, configs, trigram
+        """
+        report = {"column_added": False, "configs": None, "trigram": False}
+        
+        # CONCURRENTLY can't run in a transaction
+        with self._connection(autocommit=True) as conn:
+            with conn.cursor() as cur:
+                self._search_configs = self._available_search_configs(cur)
+                report["configs"] = list(self._search_configs)
+                
+                if not self._has_search_vector(cur):
+                    print(f"🔧 Adding messages.search_vector ({', '.join(self._search_configs)})...")
+                    cur.execute(f"""
+                        ALTER TABLE messages ADD COLUMN search_vector tsvector
+                        GENERATED ALWAYS AS ({self._search_vector_sql()}) STORED
+                    """)
+                    report["column_added"] = True
+                
+                print("🔧 Building GIN index on search_vector...")
+                cur.execute("""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_search_vector
+                    ON messages USING GIN(search_vector)
+                """)
+        
+        print("🔧 Building trigram index on content...")
+        report["trigram"] = self._ensure_trigram_index(concurrently=True)
+        
+        self.full_text_search = True
+        self.trigram_search = report["trigram"]
+        print("✅ Full-text search ready")
+        return report
     
     # ==================== MESSAGE STORAGE ====================
     
@@ -191,50 +793,164 @@ class PostgresContextStore:
         Returns:
             True if successful
         """
-        sql = """
-        INSERT INTO messages (
-            id, project_id, sender, recipient, message_type, content,
-            context, timestamp, requires_response, response_to, importance, tags
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (id) DO UPDATE SET
-            content = EXCLUDED.content,
-            context = EXCLUDED.context,
-            importance = EXCLUDED.importance
-        """
+        sql = self._upsert_messages_sql(
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
         
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(sql, (
-                    message.id,
-                    message.project_id,
-                    message.sender,
-                    message.recipient,
-                    message.message_type,
-                    message.content,
-                    Json(message.context),
-                    message.timestamp,
-                    message.requires_response,
-                    message.response_to,
-                    message.importance,
-                    message.tags
-                ))
-                self.conn.commit()
-                return True
+            with self.cursor() as cur:
+                self._ensure_partitions_for(cur, [message])
+                cur.execute(sql, self._message_row(message))
+            return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error storing message: {e}")
             return False
     
+    def store_messages(
+        self,
+        messages: Iterable[StoredMessage],
+        batch_size: int = 5000,
+        method: str = "copy",
+        page_size: int = 500
+    ) -> int:
+        """
+        Store many messages, one transaction per batch.
+        
+        Same upsert semantics as store_message (existing ids get the new
+        content, context and importance; within a batch the last copy of
+        an id wins), without a round-trip and commit per message.
+        
+        Args:
+            messages: StoredMessage objects (any iterable, consumed lazily)
+            batch_size: Messages per transaction
+            method: "copy" (COPY into a temp staging table, then one
+                INSERT ... ON CONFLICT) or "values" (execute_values)
+            page_size: Rows per INSERT statement for method="values"
+            
+        Returns:
+            Number of messages stored (failed batches are rolled back)
+        """
+        if method not in ("copy", "values"):
+            raise ValueError(f"method must be 'copy' or 'values', got {method!r}")
+        
+        stored = 0
+        iterator = iter(messages)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            
+            # ON CONFLICT DO UPDATE can't touch the same row twice per statement
+            batch = list({message.id: message for message in batch}.values())
+            try:
+                with self.cursor() as cur:
+                    self._ensure_partitions_for(cur, batch)
+                    if method == "copy":
+                        self._copy_messages(cur, batch)
+                    else:
+                        execute_values(
+                            cur,
+                            self._upsert_messages_sql("VALUES %s"),
+                            [self._message_row(message) for message in batch],
+                            page_size=page_size
+                        )
+                stored += len(batch)
+            except Exception as e:
+                print(f"Error storing batch of {len(batch)} messages: {e}")
+        
+        return stored
+    
+    def _upsert_messages_sql(self, source: str) -> str:
+        """INSERT INTO messages ... <source> with store_message's conflict rule"""
+        return f"""
+        INSERT INTO messages ({", ".join(_MESSAGE_COLUMNS)})
+        {source}
+        ON CONFLICT ({", ".join(_MESSAGE_KEYS[self.partitioning])}) DO UPDATE SET
+            content = EXCLUDED.content,
+            context = EXCLUDED.context,
+            importance = EXCLUDED.importance
+        """
+    
+    @staticmethod
+    def _message_row(message: StoredMessage) -> tuple:
+        return (
+            message.id,
+            message.project_id,
+            message.sender,
+            message.recipient,
+            message.message_type,
+            message.content,
+            Json(message.context),
+            message.timestamp,
+            message.requires_response,
+            message.response_to,
+            message.importance,
+            message.tags
+        )
+    
+    def _copy_messages(self, cur, batch: List[StoredMessage]):
+        """COPY a batch into a temp staging table, then merge it"""
+        columns = ", ".join(_MESSAGE_COLUMNS)
+        cur.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS messages_staging
+            (LIKE messages INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+        """)
+        
+        buffer = io.StringIO()
+        for message in batch:
+            buffer.write(self._copy_line(message))
+        buffer.seek(0)
+        
+        cur.copy_expert(f"COPY messages_staging ({columns}) FROM STDIN", buffer)
+        cur.execute(self._upsert_messages_sql(f"SELECT {columns} FROM messages_staging"))
+    
+    @staticmethod
+    def _copy_line(message: StoredMessage) -> str:
+        """One row in COPY text format (tab-separated, \\N = NULL)"""
+        def text(value) -> str:
+            if value is None:
+                return "\\N"
+            return (
+                str(value)
+                .replace("\\", "\\\\")
+                .replace("\t", "\\t")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r")
+            )
+        
+        def array(values: List[str]) -> str:
+            items = (
+                '"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"'
+                for v in values or []
+            )
+            return "{" + ",".join(items) + "}"
+        
+        row = [
+            message.id,
+            message.project_id,
+            message.sender,
+            message.recipient,
+            message.message_type,
+            message.content,
+            json.dumps(message.context, default=str),
+            message.timestamp.isoformat(),
+            "t" if message.requires_response else "f",
+            message.response_to,
+            repr(float(message.importance)),
+            array(message.tags)
+        ]
+        return "\t".join(text(value) for value in row) + "\n"
+    
     def get_message(self, message_id: str) -> Optional[StoredMessage]:
         """Retrieve a specific message by ID"""
         sql = "SELECT * FROM messages WHERE id = %s"
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, (message_id,))
             row = cur.fetchone()
             
             if row:
-                return StoredMessage(**row)
+                return _row_to_message(row)
             return None
     
     # ==================== CONTEXT RETRIEVAL ====================
@@ -265,71 +981,107 @@ class PostgresContextStore:
         Returns:
             List of relevant messages, sorted by relevance score
         """
-        # Build query with relevance scoring
+        # Keyword extraction for simple relevance
+        query_keywords = self._extract_keywords(query)
+        
+        # Optional window - a fixed SQL fragment, the value is a parameter
         time_filter = ""
         if time_window_days:
-            time_filter = f"AND timestamp > NOW() - INTERVAL '{time_window_days} days'"
+            time_filter = "AND timestamp > NOW() - make_interval(days => %(time_window_days)s)"
         
-        # Keyword extraction for simple relevance
-        query_keywords = self._extract_keywords(query)
+        # Only messages in one of these candidate sets can reach the top
+        # max_messages, so only they are scored. Any other message is
+        # "background" (no tag match, older than a week): its score is
+        # 0.04 + importance * 0.3 (+ 0.02 if the agent is involved), and
+        # the top-by-importance sets already hold max_messages messages
+        # that score at least as high.
+        candidate_filter = f"""
+            project_id = %(project_id)s
+            AND importance >= %(min_importance)s
+            {time_filter}
+        """
         
         sql = f"""
-        WITH relevance_scored AS (
+        WITH candidates AS (
+            -- Tag overlap (GIN on tags)
+            (SELECT id FROM messages
+             WHERE {candidate_filter} AND tags && %(keywords)s)
+            UNION
+            -- Recency bucket above the floor (project_id, timestamp)
+            (SELECT id FROM messages
+             WHERE {candidate_filter} AND timestamp > NOW() - INTERVAL '7 days')
+            UNION
+            -- Most important (project_id, importance, timestamp)
+            (SELECT id FROM messages
+             WHERE {candidate_filter}
+             ORDER BY importance DESC, timestamp DESC
+             LIMIT %(max_messages)s)
+            UNION
+            -- Most important involving the agent
+            (SELECT id FROM messages
+             WHERE {candidate_filter} AND sender = %(agent_name)s
+             ORDER BY importance DESC, timestamp DESC
+             LIMIT %(max_messages)s)
+            UNION
+            (SELECT id FROM messages
+             WHERE {candidate_filter} AND recipient = %(agent_name)s
+             ORDER BY importance DESC, timestamp DESC
+             LIMIT %(max_messages)s)
+        ),
+        relevance_scored AS (
             SELECT 
-                *,
+                m.*,
                 -- Relevance scoring algorithm
                 (
                     -- Factor 1: Keyword overlap (0-1)
-                    (SELECT COUNT(*)::FLOAT FROM unnest(tags) tag WHERE tag = ANY(%s)) 
-                    / GREATEST(array_length(tags, 1), 1)
+                    (SELECT COUNT(*)::FLOAT FROM unnest(m.tags) tag WHERE tag = ANY(%(keywords)s)) 
+                    / GREATEST(array_length(m.tags, 1), 1)
                     * 0.3
                     
                     -- Factor 2: Recency (0-1, exponential decay)
                     + (
                         CASE 
-                            WHEN EXTRACT(EPOCH FROM (NOW() - timestamp)) < 3600 THEN 1.0
-                            WHEN EXTRACT(EPOCH FROM (NOW() - timestamp)) < 86400 THEN 0.7
-                            WHEN EXTRACT(EPOCH FROM (NOW() - timestamp)) < 604800 THEN 0.4
+                            WHEN EXTRACT(EPOCH FROM (NOW() - m.timestamp)) < 3600 THEN 1.0
+                            WHEN EXTRACT(EPOCH FROM (NOW() - m.timestamp)) < 86400 THEN 0.7
+                            WHEN EXTRACT(EPOCH FROM (NOW() - m.timestamp)) < 604800 THEN 0.4
                             ELSE 0.2
                         END
                     ) * 0.2
                     
                     -- Factor 3: Importance (stored in message)
-                    + importance * 0.3
+                    + m.importance * 0.3
                     
                     -- Factor 4: Agent involvement (higher if agent sent/received)
                     + (
                         CASE 
-                            WHEN sender = %s THEN 0.1
-                            WHEN recipient = %s THEN 0.1
+                            WHEN m.sender = %(agent_name)s THEN 0.1
+                            WHEN m.recipient = %(agent_name)s THEN 0.1
                             ELSE 0.0
                         END
                     ) * 0.2
                     
                 ) as relevance_score
-            FROM messages
-            WHERE project_id = %s
-                AND importance >= %s
-                {time_filter}
+            FROM messages m
+            JOIN candidates c ON c.id = m.id
         )
         SELECT * FROM relevance_scored
         WHERE relevance_score > 0.1
         ORDER BY relevance_score DESC, timestamp DESC
-        LIMIT %s
+        LIMIT %(max_messages)s
         """
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(sql, (
-                query_keywords,
-                agent_name,
-                agent_name,
-                project_id,
-                min_importance,
-                max_messages
-            ))
+        with self.cursor(dict_rows=True) as cur:
+            cur.execute(sql, {
+                "keywords": query_keywords,
+                "agent_name": agent_name,
+                "project_id": project_id,
+                "min_importance": min_importance,
+                "time_window_days": time_window_days,
+                "max_messages": max_messages
+            })
             
             rows = cur.fetchall()
-            return [StoredMessage(**row) for row in rows]
+            return [_row_to_message(row) for row in rows]
     
     def get_conversation_thread(
         self,
@@ -357,10 +1109,10 @@ class PostgresContextStore:
         ORDER BY timestamp ASC
         """
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, (message_id,))
             rows = cur.fetchall()
-            return [StoredMessage(**row) for row in rows]
+            return [_row_to_message(row) for row in rows]
     
     def get_agent_conversation_history(
         self,
@@ -380,10 +1132,10 @@ class PostgresContextStore:
         LIMIT %s OFFSET %s
         """
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, (project_id, agent_name, agent_name, limit, offset))
             rows = cur.fetchall()
-            return [StoredMessage(**row) for row in rows]
+            return [_row_to_message(row) for row in rows]
     
     def get_messages_by_type(
         self,
@@ -399,10 +1151,10 @@ class PostgresContextStore:
         LIMIT %s
         """
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, (project_id, message_type, limit))
             rows = cur.fetchall()
-            return [StoredMessage(**row) for row in rows]
+            return [_row_to_message(row) for row in rows]
     
     # ==================== AGENT CONTEXT MANAGEMENT ====================
     
@@ -431,7 +1183,7 @@ class PostgresContextStore:
         """
         
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute(sql, (
                     agent_name,
                     project_id,
@@ -439,10 +1191,8 @@ class PostgresContextStore:
                     Json(context_value),
                     importance
                 ))
-                self.conn.commit()
-                return True
+            return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error storing agent context: {e}")
             return False
     
@@ -473,7 +1223,7 @@ class PostgresContextStore:
             """
             params = (agent_name, project_id)
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, params)
             rows = cur.fetchall()
             
@@ -505,17 +1255,15 @@ class PostgresContextStore:
         """
         
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute(sql, (
                     project_id,
                     project_name,
                     description,
                     Json(metadata or {})
                 ))
-                self.conn.commit()
-                return True
+            return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error creating project: {e}")
             return False
     
@@ -528,12 +1276,10 @@ class PostgresContextStore:
         """
         
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute(sql, (new_phase, project_id))
-                self.conn.commit()
-                return True
+            return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error updating project phase: {e}")
             return False
     
@@ -554,7 +1300,7 @@ class PostgresContextStore:
         WHERE project_id = %s
         """
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, (project_id,))
             return dict(cur.fetchone())
     
@@ -575,7 +1321,7 @@ class PostgresContextStore:
         WHERE project_id = %s AND sender = %s
         """
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, (project_id, agent_name))
             return dict(cur.fetchone())
     
@@ -605,15 +1351,72 @@ class PostgresContextStore:
         # Return unique keywords, limited to max_keywords
         return list(set(keywords))[:max_keywords]
     
+    def _tsquery_terms(self, keywords: List[str]) -> str:
+        """Keywords -> to_tsquery() input: prefix terms OR-ed together"""
+        terms = [re.sub(r"[^\w]", "", kw) for kw in keywords]
+        return " | ".join(f"{term}:*" for term in terms if term)
+    
     def search_messages(
         self,
         project_id: str,
         search_query: str,
         limit: int = 50
     ) -> List[StoredMessage]:
-        """Full-text search across message content"""
+        """
+        Full-text search across message content.
+        
+        With the search_vector column: any keyword matching the tsvector
+        (GIN index), a tag, or - with pg_trgm - fuzzily a word in the
+        content; ranked by ts_rank_cd. Without it: ILIKE, newest first.
+        """
         keywords = self._extract_keywords(search_query)
+        terms = self._tsquery_terms(keywords)
+        
+        if not self.full_text_search or not terms:
+            return self._search_messages_ilike(project_id, keywords, limit)
+        
+        tsquery = " || ".join(
+            f"to_tsquery('{cfg}', %(terms)s)" for cfg in self._search_configs
+        )
+        params = {
+            "project_id": project_id,
+            "terms": terms,
+            "keywords": keywords,
+            "limit": limit
+        }
         
+        # One OR-ed clause per keyword: GIN can't index "<% ANY(array)"
+        fuzzy = ""
+        if self.trigram_search:
+            for i, kw in enumerate(keywords):
+                params[f"kw{i}"] = kw
+                fuzzy += f"\n                OR %(kw{i})s <%% m.content"
+        
+        sql = f"""
+        WITH q AS (SELECT {tsquery} AS query)
+        SELECT m.*, ts_rank_cd(m.search_vector, q.query) AS rank
+        FROM messages m, q
+        WHERE m.project_id = %(project_id)s
+            AND (
+                m.search_vector @@ q.query
+                OR m.tags && %(keywords)s{fuzzy}
+            )
+        ORDER BY rank DESC, m.timestamp DESC
+        LIMIT %(limit)s
+        """
+        
+        with self.cursor(dict_rows=True) as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+            return [_row_to_message(row) for row in rows]
+    
+    def _search_messages_ilike(
+        self,
+        project_id: str,
+        keywords: List[str],
+        limit: int
+    ) -> List[StoredMessage]:
+        """Pre-migration search: ILIKE patterns (sequential scan)"""
         sql = """
         SELECT * FROM messages
         WHERE project_id = %s
@@ -627,13 +1430,16 @@ class PostgresContextStore:
         
         like_patterns = [f"%{kw}%" for kw in keywords]
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(dict_rows=True) as cur:
             cur.execute(sql, (project_id, like_patterns, keywords, limit))
             rows = cur.fetchall()
-            return [StoredMessage(**row) for row in rows]
+            return [_row_to_message(row) for row in rows]
     
     def close(self):
-        """Close database connection"""
+        """Close database connection (and every pooled one)"""
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
         if self.conn:
             self.conn.close()
 
@@ -759,6 +1565,15 @@ class AgentWithUnlimitedContext:
 
 
 if __name__ == "__main__":
+    import sys
+    
+    if "--migrate-fts" in sys.argv:
+        # Add tsvector/trigram search to a populated messages table
+        PostgresContextStore(
+            "dbname=destiny_team user=user password=password host=localhost port=5432"
+        ).migrate_full_text_search()
+        sys.exit(0)
+    
     # Example usage
     print("PostgreSQL Unlimited Context Store for Multi-Agent System")
     print("=" * 60)
@@ -6,7 +6,10 @@ This module adapts the existing Agent classes to use PostgreSQL for unlimited co
 
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+import atexit
+import threading
 import uuid
+import weakref
 
 from postgres_context_store import PostgresContextStore, StoredMessage, AgentWithUnlimitedContext
 from destiny_team import (
@@ -15,6 +18,19 @@ from destiny_team import (
 )
 
 
+# Buses with buffered messages, flushed at interpreter exit
+_open_buses = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_buses():
+    for bus in list(_open_buses):
+        try:
+            bus.close()
+        except Exception as e:
+            print(f"⚠️  {len(bus._pending)} buffered messages not stored: {e}")
+
+
 class PostgresMessageBus(MessageBus):
     """
     Enhanced MessageBus that stores all messages in PostgreSQL.
@@ -23,10 +39,29 @@ class PostgresMessageBus(MessageBus):
     across sessions and can be queried intelligently.
     """
     
-    def __init__(self, context_store: PostgresContextStore, project_id: str):
+    def __init__(
+        self,
+        context_store: PostgresContextStore,
+        project_id: str,
+        batch_size: int = 1
+    ):
+        """
+        Args:
+            context_store: Where messages are persisted
+            project_id: Project the messages belong to
+            batch_size: Messages buffered before one batched write
+                (1 = store each message immediately). Buffered messages
+                aren't visible to context queries until flush(); close()
+                (or interpreter exit) flushes the rest.
+        """
         super().__init__()
         self.context_store = context_store
         self.project_id = project_id
+        self.batch_size = batch_size
+        self._pending: List[StoredMessage] = []
+        self._pending_lock = threading.Lock()
+        if batch_size > 1:
+            _open_buses.add(self)
     
     def post(self, message):
         """Post message and store in PostgreSQL"""
@@ -46,11 +81,45 @@ class PostgresMessageBus(MessageBus):
             tags=self._extract_tags(message)
         )
         
-        self.context_store.store_message(stored_msg)
+        if self.batch_size <= 1:
+            self.context_store.store_message(stored_msg)
+        else:
+            with self._pending_lock:
+                self._pending.append(stored_msg)
+                full = len(self._pending) >= self.batch_size
+            if full:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # Kept in the buffer; the next flush() retries
+                    print(f"⚠️  message batch write failed, will retry: {e}")
         
         # Also route through regular message bus
         super().post(message)
     
+    def flush(self) -> int:
+        """
+        Write buffered messages in one batch; returns how many were stored
+        
+        On failure the batch goes back to the front of the buffer (so
+        the next flush retries it) and the error is re-raised.
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            return self.context_store.store_messages(pending)
+        except Exception:
+            with self._pending_lock:
+                self._pending[:0] = pending
+            raise
+    
+    def close(self):
+        """Store any buffered messages (the context store stays open)"""
+        self.flush()
+        _open_buses.discard(self)
+    
     def _calculate_importance(self, message) -> float:
         """Calculate message importance score"""
         importance = 0.5  # Base importance
@@ -414,8 +483,11 @@ class DestinyTeamWithPostgres:
         )
     
     def close(self):
-        """Close PostgreSQL connection"""
-        self.context_store.close()
+        """Store buffered messages and close PostgreSQL connection"""
+        try:
+            self.message_bus.close()
+        finally:
+            self.context_store.close()
 
 
 # ==================== EXAMPLE USAGE ====================
@@ -30,7 +30,7 @@ def test():
         print("✅ Połączenie udane!")
         print("\n📊 Utworzone tabele:")
         
-        with store.conn.cursor() as cur:
+        with store.cursor() as cur:
             cur.execute("""
                 SELECT tablename 
                 FROM pg_tables 
@@ -46,7 +46,7 @@ def test():
                 print("  (brak tabel - uruchom inicjalizację)")
         
         # Pokaż statystyki
-        with store.conn.cursor() as cur:
+        with store.cursor() as cur:
             cur.execute("SELECT COUNT(*) FROM messages;")
             msg_count = cur.fetchone()[0]
             print(f"\n📨 Wiadomości w bazie: {msg_count}")
@@ -8,13 +8,20 @@ for semantic search with ZERO external API costs.
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance, VectorParams, PointStruct, Filter, 
-    FieldCondition, MatchValue, SearchRequest
+    FieldCondition, MatchValue, Range, DatetimeRange, PayloadSchemaType,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig,
+    SearchParams, QuantizationSearchParams, QueryRequest, HasIdCondition
 )
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime
+import queue
+import threading
+import time
 import uuid
 
 from lmstudio_embeddings import LMStudioEmbeddings
+from local_vector_index import LocalVectorIndex
 
 
 class QdrantSemanticStore:
@@ -23,13 +30,37 @@ class QdrantSemanticStore:
     
     Stores message embeddings in Qdrant for fast semantic search.
     Uses local multilingual E5-large model (1024 dimensions).
+    
+    Backends:
+        "qdrant": Qdrant server (default)
+        "local":  In-process LocalVectorIndex (no server; for tests, CI
+                  and offline analysis) - same API and filter semantics
     """
     
+    BACKENDS = ("qdrant", "local")
+    QUANTIZATION_MODES = (None, "scalar", "binary")
+    
+    # Payload fields used in filters - indexed so filtered search stays fast
+    PAYLOAD_INDEXES = {
+        "sender": PayloadSchemaType.KEYWORD,
+        "message_type": PayloadSchemaType.KEYWORD,
+        "tags": PayloadSchemaType.KEYWORD,
+        "project_id": PayloadSchemaType.KEYWORD,
+        "importance": PayloadSchemaType.FLOAT,
+        "timestamp": PayloadSchemaType.DATETIME
+    }
+    
     def __init__(
         self,
         qdrant_url: str = "http://localhost:6333",
         lmstudio_url: str = "http://localhost:1234/v1",
-        collection_prefix: str = "destiny-team"
+        collection_prefix: str = "destiny-team",
+        embedding_cache_path: Optional[str] = None,
+        backend: str = "qdrant",
+        local_path: Optional[str] = None,
+        quantization: Optional[str] = None,
+        on_disk: bool = False,
+        oversampling: float = 2.0
     ):
         """
         Initialize Qdrant semantic store.
@@ -38,27 +69,84 @@ class QdrantSemanticStore:
             qdrant_url: Qdrant server URL
             lmstudio_url: LM Studio server URL
             collection_prefix: Prefix for collection names
+            embedding_cache_path: SQLite file that keeps embeddings across
+                runs (None = in-memory cache only)
+            backend: "qdrant" (server) or "local" (in-process index)
+            local_path: Directory for the local backend's memory-mapped
+                collections (None = in-memory only)
+            quantization: Default for new collections - None (float32),
+                "scalar" (int8, ~4x less RAM) or "binary" (1 bit, ~32x
+                less RAM); searches rescore with the original vectors
+            on_disk: Keep original vectors on disk for new collections
+                (only the quantized codes stay in RAM)
+            oversampling: Candidates rescored per result on quantized
+                collections
         """
-        self.qdrant = QdrantClient(url=qdrant_url)
-        self.embedder = LMStudioEmbeddings(base_url=lmstudio_url)
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, got {backend!r}")
+        if quantization not in self.QUANTIZATION_MODES:
+            raise ValueError(
+                f"quantization must be one of {self.QUANTIZATION_MODES}, got {quantization!r}"
+            )
+        self.backend = backend
+        self.quantization = quantization
+        self.on_disk = on_disk
+        self.oversampling = oversampling
+        
+        if backend == "local":
+            self.qdrant = None
+            self.local = LocalVectorIndex(local_path, oversampling=oversampling)
+        else:
+            self.qdrant = QdrantClient(url=qdrant_url)
+            self.local = None
+        self.embedder = LMStudioEmbeddings(
+            base_url=lmstudio_url,
+            cache_path=embedding_cache_path
+        )
         self.collection_prefix = collection_prefix
         self.dimension = 1024  # E5-large dimension
+        # collection name -> whether it was created with quantization
+        self._quantized: Dict[str, bool] = {}
     
     # ==================== COLLECTION MANAGEMENT ====================
     
-    def create_collection(self, project_id: str) -> bool:
+    def create_collection(
+        self,
+        project_id: str,
+        quantization: Optional[str] = "default",
+        on_disk: Optional[bool] = None
+    ) -> bool:
         """
         Create a Qdrant collection for a project.
         
         Args:
             project_id: Project identifier
+            quantization: None, "scalar" or "binary" (default: the
+                store's quantization setting)
+            on_disk: Keep original vectors on disk (default: the store's
+                on_disk setting)
             
         Returns:
             True if created successfully
         """
         collection_name = f"{self.collection_prefix}-{project_id}"
+        if quantization == "default":
+            quantization = self.quantization
+        if on_disk is None:
+            on_disk = self.on_disk
         
         try:
+            if self.backend == "local":
+                if self.local.collection_exists(collection_name):
+                    print(f"Collection {collection_name} already exists")
+                else:
+                    # Local originals are always memory-mapped when a path is set
+                    self.local.create_collection(
+                        collection_name, self.dimension, quantization=quantization
+                    )
+                    print(f"✅ Created collection: {collection_name}")
+                return True
+            
             # Check if exists
             collections = self.qdrant.get_collections().collections
             if any(c.name == collection_name for c in collections):
@@ -70,9 +158,13 @@ class QdrantSemanticStore:
                 collection_name=collection_name,
                 vectors_config=VectorParams(
                     size=self.dimension,
-                    distance=Distance.COSINE
-                )
+                    distance=Distance.COSINE,
+                    on_disk=on_disk
+                ),
+                quantization_config=self._quantization_config(quantization)
             )
+            self._quantized[collection_name] = quantization is not None
+            self.ensure_payload_indexes(project_id)
             
             print(f"✅ Created collection: {collection_name}")
             return True
@@ -81,12 +173,88 @@ class QdrantSemanticStore:
             print(f"❌ Error creating collection: {e}")
             return False
     
+    @staticmethod
+    def _quantization_config(quantization: Optional[str]):
+        """Qdrant quantization config; codes always stay in RAM"""
+        if quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+        if quantization == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+    
+    def ensure_payload_indexes(self, project_id: str) -> List[str]:
+        """
+        Create any missing payload indexes on a project's collection.
+        
+        Safe to run repeatedly (migration for collections created before
+        indexes were declared). The local backend filters in-process and
+        needs no indexes.
+        
+        Args:
+            project_id: Project identifier
+            
+        Returns:
+            Fields that were indexed by this call
+        """
+        if self.backend == "local":
+            return []
+        
+        collection_name = f"{self.collection_prefix}-{project_id}"
+        existing = self.qdrant.get_collection(collection_name).payload_schema or {}
+        
+        created = []
+        for field, schema in self.PAYLOAD_INDEXES.items():
+            if field in existing:
+                continue
+            self.qdrant.create_payload_index(
+                collection_name=collection_name,
+                field_name=field,
+                field_schema=schema
+            )
+            created.append(field)
+        return created
+    
+    def migrate_payload_indexes(self) -> Dict[str, List[str]]:
+        """
+        Add missing payload indexes to every collection with our prefix.
+        
+        Returns:
+            {collection_name: [fields indexed]}
+        """
+        if self.backend == "local":
+            return {}
+        
+        prefix = f"{self.collection_prefix}-"
+        migrated = {}
+        for collection in self.qdrant.get_collections().collections:
+            if not collection.name.startswith(prefix):
+                continue
+            created = self.ensure_payload_indexes(collection.name[len(prefix):])
+            migrated[collection.name] = created
+            if created:
+                print(f"✅ {collection.name}: indexed {', '.join(created)}")
+            else:
+                print(f"ℹ️  {collection.name}: indexes up to date")
+        return migrated
+    
     def delete_collection(self, project_id: str) -> bool:
         """Delete a project's collection"""
         collection_name = f"{self.collection_prefix}-{project_id}"
         
         try:
-            self.qdrant.delete_collection(collection_name)
+            if self.backend == "local":
+                self.local.delete_collection(collection_name)
+            else:
+                self.qdrant.delete_collection(collection_name)
+                self._quantized.pop(collection_name, None)
             print(f"✅ Deleted collection: {collection_name}")
             return True
         except Exception as e:
@@ -128,26 +296,17 @@ class QdrantSemanticStore:
             # Generate embedding
             embedding = self.embedder.embed(content)
             
-            # Create point
-            point = PointStruct(
-                id=message_id,
-                vector=embedding,
-                payload={
-                    "content": content,
-                    "sender": sender,
-                    "timestamp": timestamp.isoformat(),
-                    "message_type": message_type,
-                    "importance": importance,
-                    "tags": tags or [],
-                    "project_id": project_id
-                }
-            )
+            payload = {
+                "content": content,
+                "sender": sender,
+                "timestamp": timestamp.isoformat(),
+                "message_type": message_type,
+                "importance": importance,
+                "tags": tags or [],
+                "project_id": project_id
+            }
             
-            # Upsert to Qdrant
-            self.qdrant.upsert(
-                collection_name=collection_name,
-                points=[point]
-            )
+            self._upsert(collection_name, [message_id], [embedding], [payload])
             
             return True
             
@@ -158,66 +317,179 @@ class QdrantSemanticStore:
     def store_messages_batch(
         self,
         project_id: str,
-        messages: List[Dict[str, Any]],
-        batch_size: int = 10
-    ) -> Dict[str, int]:
+        messages: Iterable[Dict[str, Any]],
+        batch_size: int = 64,
+        upsert_batch_size: int = 256,
+        embed_workers: int = 2,
+        queue_depth: int = 4,
+        wait: bool = False
+    ) -> Dict[str, Any]:
         """
-        Store multiple messages in batches.
+        Store many messages with a pipelined embed -> upsert flow.
+        
+        The caller's thread reads `messages` (any iterable, e.g. a
+        generator over a server-side cursor) in chunks of batch_size and
+        hands them to embed_workers threads; embedded points go to one
+        upsert thread that writes upsert_batch_size points per request.
+        Queues are bounded, so memory stays flat however many messages
+        are streamed through.
         
         Args:
             project_id: Project identifier
-            messages: List of message dicts
-            batch_size: Batch size for embedding generation
+            messages: Iterable of message dicts (id, content, sender,
+                timestamp, optional message_type/importance/tags)
+            batch_size: Messages per embedding request
+            upsert_batch_size: Points per upsert request
+            embed_workers: Embedding requests in flight at once
+            queue_depth: Batches buffered between stages
+            wait: Wait for Qdrant to apply each upsert. With False only
+                the final upsert waits (Qdrant applies updates in order,
+                so everything is searchable once the call returns)
             
         Returns:
-            Stats: stored, failed
+            Stats: stored, failed, seconds, messages_per_sec,
+            embed_seconds / upsert_seconds (time spent in each stage),
+            embed_batches, upsert_batches
         """
         collection_name = f"{self.collection_prefix}-{project_id}"
         
-        stats = {"stored": 0, "failed": 0}
+        stats = {
+            "stored": 0, "failed": 0,
+            "embed_seconds": 0.0, "upsert_seconds": 0.0,
+            "embed_batches": 0, "upsert_batches": 0
+        }
+        lock = threading.Lock()
+        embed_queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(queue_depth)
+        upsert_queue: "queue.Queue[Optional[Tuple[list, list, list]]]" = queue.Queue(queue_depth)
         
-        # Process in batches
-        for i in range(0, len(messages), batch_size):
-            batch = messages[i:i + batch_size]
-            
-            try:
-                # Generate embeddings for batch
-                contents = [msg['content'] for msg in batch]
-                embeddings = self.embedder.embed(contents)
-                
-                # Create points
-                points = []
-                for msg, embedding in zip(batch, embeddings):
-                    point = PointStruct(
-                        id=msg['id'],
-                        vector=embedding,
-                        payload={
-                            "content": msg['content'],
-                            "sender": msg['sender'],
-                            "timestamp": msg['timestamp'].isoformat(),
-                            "message_type": msg.get('message_type', 'UNKNOWN'),
-                            "importance": msg.get('importance', 0.5),
-                            "tags": msg.get('tags', []),
-                            "project_id": project_id
-                        }
+        def count(**amounts):
+            with lock:
+                for key, amount in amounts.items():
+                    stats[key] += amount
+        
+        def embed_worker():
+            while True:
+                batch = embed_queue.get()
+                if batch is None:
+                    return
+                try:
+                    start = time.perf_counter()
+                    # embed_batch splits by max_batch_chars, so long
+                    # messages can't overflow one request
+                    embeddings = self.embedder.embed_batch(
+                        [msg['content'] for msg in batch],
+                        batch_size=len(batch),
+                        progress_callback=lambda done, total: None
                     )
-                    points.append(point)
-                
-                # Upsert batch
-                self.qdrant.upsert(
-                    collection_name=collection_name,
-                    points=points
+                    count(embed_seconds=time.perf_counter() - start, embed_batches=1)
+                    payloads = [self._message_payload(project_id, msg) for msg in batch]
+                    upsert_queue.put(([msg['id'] for msg in batch], embeddings, payloads))
+                except Exception as e:
+                    print(f"❌ Error embedding batch: {e}")
+                    count(failed=len(batch))
+        
+        def write(ids, vectors, payloads, wait_for_result):
+            try:
+                start = time.perf_counter()
+                self._upsert(collection_name, ids, vectors, payloads, wait=wait_for_result)
+                count(
+                    stored=len(ids), upsert_batches=1,
+                    upsert_seconds=time.perf_counter() - start
                 )
-                
-                stats["stored"] += len(points)
-                print(f"✅ Stored batch {i//batch_size + 1}: {len(points)} messages")
-                
             except Exception as e:
-                print(f"❌ Error in batch {i//batch_size + 1}: {e}")
-                stats["failed"] += len(batch)
+                print(f"❌ Error upserting batch: {e}")
+                count(failed=len(ids))
+        
+        def upsert_worker():
+            ids, vectors, payloads = [], [], []
+            while True:
+                item = upsert_queue.get()
+                if item is None:
+                    break
+                ids.extend(item[0])
+                vectors.extend(item[1])
+                payloads.extend(item[2])
+                # Keep a remainder back so the final upsert can wait
+                while len(ids) > upsert_batch_size:
+                    write(
+                        ids[:upsert_batch_size], vectors[:upsert_batch_size],
+                        payloads[:upsert_batch_size], wait
+                    )
+                    del ids[:upsert_batch_size], vectors[:upsert_batch_size]
+                    del payloads[:upsert_batch_size]
+            if ids:
+                write(ids, vectors, payloads, True)
         
+        started = time.perf_counter()
+        embedders = [
+            threading.Thread(target=embed_worker, name=f"qdrant-embed-{n}", daemon=True)
+            for n in range(embed_workers)
+        ]
+        upserter = threading.Thread(target=upsert_worker, name="qdrant-upsert", daemon=True)
+        for thread in embedders + [upserter]:
+            thread.start()
+        
+        try:
+            batch = []
+            for msg in messages:
+                batch.append(msg)
+                if len(batch) >= batch_size:
+                    embed_queue.put(batch)
+                    batch = []
+            if batch:
+                embed_queue.put(batch)
+        finally:
+            for _ in embedders:
+                embed_queue.put(None)
+            for thread in embedders:
+                thread.join()
+            upsert_queue.put(None)
+            upserter.join()
+        
+        stats["seconds"] = time.perf_counter() - started
+        stats["messages_per_sec"] = (
+            stats["stored"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        )
+        print(
+            f"✅ Stored {stats['stored']} messages ({stats['failed']} failed) "
+            f"in {stats['seconds']:.1f}s - {stats['messages_per_sec']:.0f} msg/s"
+        )
         return stats
     
+    def _message_payload(self, project_id: str, msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Qdrant payload for a message dict"""
+        return {
+            "content": msg['content'],
+            "sender": msg['sender'],
+            "timestamp": msg['timestamp'].isoformat(),
+            "message_type": msg.get('message_type', 'UNKNOWN'),
+            "importance": msg.get('importance', 0.5),
+            "tags": msg.get('tags', []),
+            "project_id": project_id
+        }
+    
+    def _upsert(
+        self,
+        collection_name: str,
+        ids: List[Any],
+        vectors: List[List[float]],
+        payloads: List[Dict[str, Any]],
+        wait: bool = True
+    ):
+        """Write points to the active backend"""
+        if self.backend == "local":
+            self.local.upsert(collection_name, ids, vectors, payloads)
+            return
+        
+        self.qdrant.upsert(
+            collection_name=collection_name,
+            wait=wait,
+            points=[
+                PointStruct(id=point_id, vector=vector, payload=payload)
+                for point_id, vector, payload in zip(ids, vectors, payloads)
+            ]
+        )
+    
     # ==================== SEMANTIC SEARCH ====================
     
     def search(
@@ -226,17 +498,26 @@ class QdrantSemanticStore:
         query: str,
         limit: int = 20,
         score_threshold: float = 0.7,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        min_importance: Optional[float] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Semantic search for messages.
         
+        Range conditions are applied inside the vector search (indexed),
+        so "important and recent" needs no post-filtering.
+        
         Args:
             project_id: Project identifier
             query: Search query (natural language)
             limit: Max results
             score_threshold: Minimum similarity score
             filters: Optional filters (sender, message_type, etc.)
+            min_importance: Only messages with importance >= this
+            since: Only messages at or after this time
+            until: Only messages at or before this time
             
         Returns:
             List of matching messages with scores
@@ -247,40 +528,30 @@ class QdrantSemanticStore:
             # Generate query embedding
             query_embedding = self.embedder.embed(query)
             
-            # Build filter
-            filter_conditions = []
-            if filters:
-                for key, value in filters.items():
-                    filter_conditions.append(
-                        FieldCondition(
-                            key=key,
-                            match=MatchValue(value=value)
-                        )
-                    )
-            
-            query_filter = Filter(must=filter_conditions) if filter_conditions else None
-            
             # Search
-            results = self.qdrant.search(
-                collection_name=collection_name,
-                query_vector=query_embedding,
-                limit=limit,
-                score_threshold=score_threshold,
-                query_filter=query_filter
+            ranges = {}
+            if min_importance is not None:
+                ranges["importance"] = (min_importance, None)
+            if since is not None or until is not None:
+                ranges["timestamp"] = (since, until)
+            
+            results = self._search_vectors(
+                collection_name, query_embedding, limit,
+                score_threshold=score_threshold, filters=filters, ranges=ranges
             )
             
             # Format results
             formatted = []
             for result in results:
                 formatted.append({
-                    "id": result.id,
-                    "score": result.score,
-                    "content": result.payload.get("content"),
-                    "sender": result.payload.get("sender"),
-                    "timestamp": result.payload.get("timestamp"),
-                    "message_type": result.payload.get("message_type"),
-                    "importance": result.payload.get("importance"),
-                    "tags": result.payload.get("tags", [])
+                    "id": result["id"],
+                    "score": result["score"],
+                    "content": result["payload"].get("content"),
+                    "sender": result["payload"].get("sender"),
+                    "timestamp": result["payload"].get("timestamp"),
+                    "message_type": result["payload"].get("message_type"),
+                    "importance": result["payload"].get("importance"),
+                    "tags": result["payload"].get("tags", [])
                 })
             
             return formatted
@@ -306,44 +577,190 @@ class QdrantSemanticStore:
         Returns:
             List of similar messages
         """
+        return self.find_similar_many(project_id, [message_id], limit).get(message_id, [])
+    
+    def find_similar_many(
+        self,
+        project_id: str,
+        message_ids: List[str],
+        limit: int = 10,
+        batch_size: int = 64
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Find similar messages for many reference messages at once.
+        
+        Queries by point ID (Qdrant looks up the stored vector itself)
+        in batches of batch_size - one round-trip per batch - and
+        excludes each reference message server-side.
+        
+        Args:
+            project_id: Project identifier
+            message_ids: Reference message IDs
+            limit: Max results per message
+            batch_size: Queries per request
+            
+        Returns:
+            {message_id: [similar messages]} - IDs not in the collection
+            are left out
+        """
         collection_name = f"{self.collection_prefix}-{project_id}"
+        ids = list(dict.fromkeys(message_ids))
+        similar = {}
         
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            try:
+                results = self._recommend_batch(collection_name, batch, limit)
+            except Exception as e:
+                print(f"❌ Error finding similar: {e}")
+                continue
+            
+            for message_id, hits in results.items():
+                similar[message_id] = [
+                    {
+                        "id": r["id"],
+                        "score": r["score"],
+                        "content": r["payload"].get("content"),
+                        "sender": r["payload"].get("sender")
+                    }
+                    for r in hits
+                ]
+        
+        return similar
+    
+    def _recommend_batch(
+        self,
+        collection_name: str,
+        message_ids: List[Any],
+        limit: int
+    ) -> Dict[Any, List[Dict[str, Any]]]:
+        """Nearest neighbours of stored points, excluding each point itself"""
+        if self.backend == "local":
+            results = {}
+            for message_id in message_ids:
+                point = self.local.retrieve(collection_name, message_id)
+                if point is not None:
+                    results[message_id] = self.local.search(
+                        collection_name, point[0], limit, exclude_ids=[message_id]
+                    )
+            return results
+        
+        requests = [
+            QueryRequest(
+                query=message_id,
+                filter=Filter(must_not=[HasIdCondition(has_id=[message_id])]),
+                limit=limit,
+                params=self._search_params(collection_name),
+                with_payload=True
+            )
+            for message_id in message_ids
+        ]
         try:
-            # Get reference message
-            result = self.qdrant.retrieve(
+            responses = self.qdrant.query_batch_points(
                 collection_name=collection_name,
-                ids=[message_id]
+                requests=requests
             )
-            
-            if not result:
-                return []
-            
-            # Get its vector
-            vector = result[0].vector
-            
-            # Search for similar
-            results = self.qdrant.search(
-                collection_name=collection_name,
-                query_vector=vector,
-                limit=limit + 1  # +1 because it will include itself
+        except Exception:
+            # A missing reference point fails the whole batch - drop
+            # unknown IDs and retry once
+            found = {
+                str(point.id) for point in self.qdrant.retrieve(
+                    collection_name=collection_name, ids=message_ids,
+                    with_payload=False, with_vectors=False
+                )
+            }
+            known = [m for m in message_ids if str(m) in found]
+            if len(known) == len(message_ids):
+                raise
+            return self._recommend_batch(collection_name, known, limit) if known else {}
+        
+        return {
+            message_id: [
+                {"id": point.id, "score": point.score, "payload": point.payload or {}}
+                for point in response.points
+            ]
+            for message_id, response in zip(message_ids, responses)
+        }
+    
+    def _search_vectors(
+        self,
+        collection_name: str,
+        vector: List[float],
+        limit: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Nearest points on the active backend as {"id", "score", "payload"}
+        
+        `ranges` maps a field to inclusive (min, max) bounds (None = open);
+        datetime bounds are compared as datetimes.
+        """
+        if self.backend == "local":
+            return self.local.search(
+                collection_name, vector, limit,
+                score_threshold=score_threshold, filters=filters, ranges=ranges
             )
-            
-            # Format and exclude self
-            formatted = []
-            for r in results:
-                if r.id != message_id:
-                    formatted.append({
-                        "id": r.id,
-                        "score": r.score,
-                        "content": r.payload.get("content"),
-                        "sender": r.payload.get("sender")
-                    })
-            
-            return formatted[:limit]
-            
-        except Exception as e:
-            print(f"❌ Error finding similar: {e}")
-            return []
+        
+        # Build filter
+        filter_conditions = []
+        if filters:
+            for key, value in filters.items():
+                filter_conditions.append(
+                    FieldCondition(
+                        key=key,
+                        match=MatchValue(value=value)
+                    )
+                )
+        for key, (low, high) in (ranges or {}).items():
+            if isinstance(low, datetime) or isinstance(high, datetime):
+                condition = DatetimeRange(gte=low, lte=high)
+            else:
+                condition = Range(gte=low, lte=high)
+            filter_conditions.append(FieldCondition(key=key, range=condition))
+        
+        query_filter = Filter(must=filter_conditions) if filter_conditions else None
+        
+        response = self.qdrant.query_points(
+            collection_name=collection_name,
+            query=vector,
+            limit=limit,
+            score_threshold=score_threshold,
+            query_filter=query_filter,
+            search_params=self._search_params(collection_name),
+            with_payload=True
+        )
+        return [
+            {"id": point.id, "score": point.score, "payload": point.payload or {}}
+            for point in response.points
+        ]
+    
+    def _search_params(self, collection_name: str) -> Optional[SearchParams]:
+        """
+        Rescore quantized candidates with the original vectors
+        
+        Uses the collection's own quantization config (cached per
+        collection), not the store default - collections created
+        before or with an explicit override may differ.
+        """
+        quantized = self._quantized.get(collection_name)
+        if quantized is None:
+            try:
+                config = self.qdrant.get_collection(collection_name).config
+            except Exception:
+                return None  # missing collection - the query reports it
+            quantized = config.quantization_config is not None
+            self._quantized[collection_name] = quantized
+        
+        if not quantized:
+            return None
+        return SearchParams(
+            quantization=QuantizationSearchParams(
+                rescore=True,
+                oversampling=self.oversampling
+            )
+        )
     
     # ==================== STATISTICS ====================
     
@@ -352,11 +769,21 @@ class QdrantSemanticStore:
         collection_name = f"{self.collection_prefix}-{project_id}"
         
         try:
+            if self.backend == "local":
+                count = self.local.count(collection_name)
+                return {
+                    "collection_name": collection_name,
+                    "vectors_count": count,
+                    "points_count": count,
+                    "status": "green",
+                    "backend": "local"
+                }
+            
             info = self.qdrant.get_collection(collection_name)
             
             return {
                 "collection_name": collection_name,
-                "vectors_count": info.vectors_count,
+                "vectors_count": info.points_count,  # one vector per point
                 "points_count": info.points_count,
                 "status": info.status
             }
@@ -375,6 +802,9 @@ class QdrantSemanticStore:
         
         # Test Qdrant
         print("\n2. Qdrant Vector Store:")
+        if self.backend == "local":
+            print(f"✅ Local vector index ({len(self.local.collection_names())} collections)")
+            return lm_ok
         try:
             collections = self.qdrant.get_collections()
             print(f"✅ Qdrant connected!")
@@ -464,4 +894,10 @@ def example_usage():
 
 
 if __name__ == "__main__":
-    example_usage()
+    import sys
+    
+    if "--migrate-indexes" in sys.argv:
+        # Add payload indexes to collections created before they existed
+        QdrantSemanticStore().migrate_payload_indexes()
+    else:
+        example_usage()
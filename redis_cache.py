@@ -3,14 +3,36 @@ Redis Caching Layer for Destiny Team
 
 Ultra-fast caching for frequently accessed data, reducing load on
 PostgreSQL, Neo4j, and Qdrant.
+
+Optional L1 tier: a size-bounded in-process LRU in front of Redis (L2)
+for get()/get_cached_search(). L1 entries never outlive the Redis TTL,
+and writes/deletes are broadcast on a pub/sub channel so every process
+drops its stale copy.
 """
 
 import redis
 import json
-import pickle
-from typing import Any, Optional, List, Dict
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Iterable, List, Dict
 from datetime import timedelta
 
+from cache_codec import CacheCodec, LegacyPickleError
+
+
+# SET value keeping the key's remaining TTL (ARGV[2] seconds if it has none)
+_UPDATE_SESSION_LUA = """
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl > 0 then
+    redis.call('PSETEX', KEYS[1], ttl, ARGV[1])
+else
+    redis.call('SETEX', KEYS[1], ARGV[2], ARGV[1])
+end
+return ttl
+"""
+
 
 class RedisCache:
     """
@@ -19,12 +41,20 @@ class RedisCache:
     Provides sub-millisecond access to frequently used data.
     """
     
+    HOT_MEMORY_MODES = ("list", "stream")
+    
     def __init__(
         self,
         host: str = "localhost",
         port: int = 6379,
         db: int = 0,
-        prefix: str = "destiny:"
+        prefix: str = "destiny:",
+        codec: Optional[CacheCodec] = None,
+        l1_size: int = 0,
+        l1_ttl: float = 30.0,
+        hot_memory_mode: str = "list",
+        stream_maxlen: int = 1000,
+        index_prune_interval: int = 1000
     ):
         """
         Initialize Redis cache.
@@ -34,7 +64,23 @@ class RedisCache:
             port: Redis port
             db: Redis database number (0-15)
             prefix: Key prefix for namespacing
+            codec: Value codec (default: orjson/JSON with compression
+                for large values; legacy pickled values read as misses)
+            l1_size: Entries kept in the in-process L1 cache (0 = disabled)
+            l1_ttl: Max seconds an L1 entry lives (capped by the Redis TTL)
+            hot_memory_mode: "list" (last N messages) or "stream" (Redis
+                Stream with tail() and per-agent consumer groups)
+            stream_maxlen: Approximate number of entries a hot-memory
+                stream retains (stream mode)
+            index_prune_interval: Indexed set() calls per project between
+                prunes of its key index (0 = never prune automatically)
         """
+        if hot_memory_mode not in self.HOT_MEMORY_MODES:
+            raise ValueError(
+                f"Unknown hot_memory_mode '{hot_memory_mode}' "
+                f"(expected one of {self.HOT_MEMORY_MODES})"
+            )
+
         self.client = redis.Redis(
             host=host,
             port=port,
@@ -42,33 +88,172 @@ class RedisCache:
             decode_responses=False  # We'll handle encoding
         )
         self.prefix = prefix
+        self.codec = codec or CacheCodec()
+        self.hot_memory_mode = hot_memory_mode
+        self.stream_maxlen = stream_maxlen
+        
+        # L1: full_key -> (expires_at, raw bytes); raw so callers can't
+        # mutate the cached copy
+        self.l1_size = l1_size
+        self.l1_ttl = l1_ttl
+        self._l1: "OrderedDict[str, tuple]" = OrderedDict()
+        self._l1_lock = threading.Lock()
+        self._origin = uuid.uuid4().hex
+        self._invalidation_channel = f"{prefix}l1:invalidate"
+        self._listener = None
+        self.tier_stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "invalidations": 0}
+        self._update_session_script = None
+        self.index_prune_interval = index_prune_interval
+        self._index_adds: Dict[str, int] = {}
+        self._index_lock = threading.Lock()
     
     def _make_key(self, key: str) -> str:
         """Create prefixed key"""
         return f"{self.prefix}{key}"
     
+    # ==================== L1 (IN-PROCESS) TIER ====================
+    
+    def _l1_get(self, full_key: str) -> Optional[bytes]:
+        """Raw value from L1, or None if missing/expired"""
+        with self._l1_lock:
+            entry = self._l1.get(full_key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._l1[full_key]
+                return None
+            self._l1.move_to_end(full_key)
+            return entry[1]
+    
+    def _l1_put(self, full_key: str, raw: bytes, ttl_ms: Optional[int] = None):
+        """Remember a raw value; lifetime = min(l1_ttl, remaining Redis TTL)"""
+        lifetime = self.l1_ttl
+        if ttl_ms is not None and ttl_ms > 0:
+            lifetime = min(lifetime, ttl_ms / 1000)
+        
+        with self._l1_lock:
+            self._l1[full_key] = (time.monotonic() + lifetime, raw)
+            self._l1.move_to_end(full_key)
+            while len(self._l1) > self.l1_size:
+                self._l1.popitem(last=False)
+    
+    def _l1_invalidate(self, full_key: Optional[str] = None, broadcast: bool = True):
+        """
+        Drop one key (or everything if None) from L1, and tell other
+        processes to do the same.
+        """
+        if not self.l1_size:
+            return
+        with self._l1_lock:
+            if full_key is None:
+                self._l1.clear()
+            else:
+                self._l1.pop(full_key, None)
+        
+        if broadcast:
+            message = f"{self._origin} {full_key or '*'}"
+            try:
+                self.client.publish(self._invalidation_channel, message)
+            except redis.RedisError as e:
+                print(f"⚠️  L1 invalidation not published: {e}")
+    
+    def _on_invalidation(self, message: Dict[str, Any]):
+        """Pub/sub handler: evict keys written by other processes"""
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        if not isinstance(data, str):
+            return
+        
+        origin, _, full_key = data.partition(" ")
+        if origin == self._origin:
+            return  # our own write - L1 already up to date
+        
+        self._count_tier("invalidations")
+        self._l1_invalidate(None if full_key == "*" else full_key, broadcast=False)
+    
+    def _on_listener_error(self, error, pubsub, thread):
+        """Connection to the invalidation channel dropped: L1 may be stale"""
+        with self._l1_lock:
+            self._l1.clear()
+    
+    def _ensure_listener(self):
+        """Subscribe to the invalidation channel (lazily, once)"""
+        if self._listener is not None or not self.l1_size:
+            return
+        try:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self._invalidation_channel: self._on_invalidation})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=0.5,
+                daemon=True,
+                exception_handler=self._on_listener_error
+            )
+        except redis.RedisError as e:
+            # Stay correct without cross-process invalidation: L1 entries
+            # still expire after l1_ttl
+            print(f"⚠️  L1 invalidation listener unavailable: {e}")
+            self._listener = False
+    
+    def _count_tier(self, name: str):
+        """Bump a tier_stats counter (caller and listener threads both do)"""
+        with self._l1_lock:
+            self.tier_stats[name] += 1
+    
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """L1/L2 hit counters for get()"""
+        with self._l1_lock:
+            stats = dict(self.tier_stats)
+            l1_entries = len(self._l1)
+        lookups = stats["l1_hits"] + stats["l2_hits"] + stats["misses"]
+        return {
+            **stats,
+            "l1_entries": l1_entries,
+            "l1_hit_rate": stats["l1_hits"] / lookups * 100 if lookups else 0.0,
+            "hit_rate": (lookups - stats["misses"]) / lookups * 100 if lookups else 0.0
+        }
+    
     # ==================== BASIC OPERATIONS ====================
     
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        """Get value from cache (L1 first when enabled, then Redis)"""
         full_key = self._make_key(key)
-        value = self.client.get(full_key)
+        
+        if self.l1_size:
+            self._ensure_listener()
+            value = self._l1_get(full_key)
+            if value is not None:
+                self._count_tier("l1_hits")
+            else:
+                # Value and remaining TTL in one round-trip
+                pipe = self.client.pipeline(transaction=False)
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                value, ttl_ms = pipe.execute()
+                if value is not None:
+                    self._count_tier("l2_hits")
+                    self._l1_put(full_key, value, ttl_ms)
+        else:
+            value = self.client.get(full_key)
+            if value is not None:
+                self._count_tier("l2_hits")
         
         if value is None:
+            self._count_tier("misses")
             return None
         
         try:
-            # Try JSON first (for simple types)
-            return json.loads(value)
-        except:
-            # Fall back to pickle (for complex objects)
-            return pickle.loads(value)
+            return self.codec.decode(value)
+        except LegacyPickleError:
+            # Pre-codec pickled value - treat as a miss, it gets rewritten
+            return None
     
     def set(
         self,
         key: str,
         value: Any,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        project_id: Optional[str] = None
     ) -> bool:
         """
         Set value in cache.
@@ -77,43 +262,163 @@ class RedisCache:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (None = no expiration)
+            project_id: Record the key in the project's key index so
+                clear_project_cache() can find it
             
         Returns:
             True if successful
         """
         full_key = self._make_key(key)
+        serialized = self.codec.encode(value)
         
-        # Serialize value
-        try:
-            # Try JSON first (faster, more readable)
-            serialized = json.dumps(value)
-        except:
-            # Fall back to pickle (for complex objects)
-            serialized = pickle.dumps(value)
-        
-        if ttl:
-            return self.client.setex(full_key, ttl, serialized)
+        if project_id is None:
+            if ttl:
+                result = self.client.setex(full_key, ttl, serialized)
+            else:
+                result = self.client.set(full_key, serialized)
         else:
-            return self.client.set(full_key, serialized)
+            # Value + index membership in one round-trip
+            pipe = self.client.pipeline(transaction=False)
+            if ttl:
+                pipe.setex(full_key, ttl, serialized)
+            else:
+                pipe.set(full_key, serialized)
+            pipe.sadd(self._project_index_key(project_id), full_key)
+            result = pipe.execute()[0]
+            self._count_index_add(project_id)
+        
+        if self.l1_size:
+            self._ensure_listener()
+            self._l1_invalidate(full_key)
+            self._l1_put(full_key, serialized, ttl * 1000 if ttl else None)
+        
+        return result
     
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         full_key = self._make_key(key)
-        return self.client.delete(full_key) > 0
+        deleted = self.client.delete(full_key) > 0
+        self._l1_invalidate(full_key)
+        return deleted
     
     def exists(self, key: str) -> bool:
         """Check if key exists"""
         full_key = self._make_key(key)
         return self.client.exists(full_key) > 0
     
+    def _project_index_key(self, project_id: str) -> str:
+        """Set of full keys cached for a project"""
+        return self._make_key(f"project_keys:{project_id}")
+    
+    def _count_index_add(self, project_id: str):
+        """Prune the project's index every index_prune_interval adds"""
+        if not self.index_prune_interval:
+            return
+        with self._index_lock:
+            adds = self._index_adds.get(project_id, 0) + 1
+            due = adds >= self.index_prune_interval
+            self._index_adds[project_id] = 0 if due else adds
+        if due:
+            self.prune_project_index(project_id)
+    
+    def prune_project_index(self, project_id: str, batch_size: int = 500) -> int:
+        """
+        Remove index members whose keys no longer exist.
+        
+        Expired keys (TTLs, superseded search generations) stay in the
+        index until pruned; set() does this every index_prune_interval
+        adds, so the index stays proportional to the live keys.
+        
+        Returns:
+            Number of members removed
+        """
+        index_key = self._project_index_key(project_id)
+        removed = 0
+        batch = []
+        
+        def drop_dead(members):
+            pipe = self.client.pipeline(transaction=False)
+            for member in members:
+                pipe.exists(member)
+            dead = [m for m, alive in zip(members, pipe.execute()) if not alive]
+            return self.client.srem(index_key, *dead) if dead else 0
+        
+        for member in self.client.sscan_iter(index_key, count=batch_size):
+            batch.append(member)
+            if len(batch) >= batch_size:
+                removed += drop_dead(batch)
+                batch = []
+        if batch:
+            removed += drop_dead(batch)
+        return removed
+    
+    def _unlink_batched(self, keys: Iterable, batch_size: int = 500) -> int:
+        """UNLINK keys in batches (memory reclaimed in the background)"""
+        deleted = 0
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += self.client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += self.client.unlink(*batch)
+        return deleted
+    
     # ==================== SEARCH RESULT CACHING ====================
     
+    def get_search_generation(self, project_id: str) -> int:
+        """
+        Current search-cache generation of a project.
+        
+        The generation is part of every search key, so bumping it makes
+        all cached results of the project unreachable at once.
+        """
+        full_key = self._make_key(f"search_gen:{project_id}")
+        
+        raw = self._l1_get(full_key) if self.l1_size else None
+        if raw is None:
+            raw = self.client.get(full_key) or b"0"
+            if self.l1_size:
+                self._ensure_listener()
+                self._l1_put(full_key, raw)
+        return int(raw)
+    
+    def bump_search_generation(self, project_id: str) -> int:
+        """
+        Invalidate a project's cached search results (call on every write).
+        
+        Returns:
+            New generation
+        """
+        full_key = self._make_key(f"search_gen:{project_id}")
+        generation = self.client.incr(full_key)
+        self._l1_invalidate(full_key)
+        return generation
+    
+    def _search_key(
+        self,
+        query: str,
+        project_id: str,
+        search_type: str,
+        limit: int
+    ) -> str:
+        """search:{project}:{generation}:{hash of type/limit/query}"""
+        import hashlib
+        query_hash = hashlib.md5(
+            f"{search_type}:{limit}:{query}".encode()
+        ).hexdigest()
+        generation = self.get_search_generation(project_id)
+        return f"search:{project_id}:{generation}:{query_hash}"
+    
     def cache_search_results(
         self,
         query: str,
         project_id: str,
         results: List[Dict[str, Any]],
-        ttl: int = 300  # 5 minutes default
+        ttl: int = 3600,  # long: writes invalidate via the generation
+        search_type: str = "hybrid",
+        limit: int = 20
     ) -> bool:
         """
         Cache search results.
@@ -123,28 +428,21 @@ class RedisCache:
             project_id: Project ID
             results: Search results
             ttl: Cache duration in seconds
+            search_type: Search type the results came from
+            limit: Result limit of the search
         """
-        # Create cache key from query + project
-        import hashlib
-        query_hash = hashlib.md5(
-            f"{project_id}:{query}".encode()
-        ).hexdigest()
-        
-        key = f"search:{query_hash}"
-        return self.set(key, results, ttl=ttl)
+        key = self._search_key(query, project_id, search_type, limit)
+        return self.set(key, results, ttl=ttl, project_id=project_id)
     
     def get_cached_search(
         self,
         query: str,
-        project_id: str
+        project_id: str,
+        search_type: str = "hybrid",
+        limit: int = 20
     ) -> Optional[List[Dict[str, Any]]]:
-        """Get cached search results"""
-        import hashlib
-        query_hash = hashlib.md5(
-            f"{project_id}:{query}".encode()
-        ).hexdigest()
-        
-        key = f"search:{query_hash}"
+        """Get cached search results (None if missing or invalidated)"""
+        key = self._search_key(query, project_id, search_type, limit)
         return self.get(key)
     
     # ==================== AGENT STATE CACHING ====================
@@ -158,7 +456,7 @@ class RedisCache:
     ) -> bool:
         """Cache agent's current state"""
         key = f"agent_state:{project_id}:{agent_name}"
-        return self.set(key, state, ttl=ttl)
+        return self.set(key, state, ttl=ttl, project_id=project_id)
     
     def get_agent_state(
         self,
@@ -182,28 +480,68 @@ class RedisCache:
         
         Hot memory = last N messages for instant access.
         """
-        key = f"hot_memory:{project_id}"
+        return self.add_many_to_hot_memory(project_id, [message], max_size)
+    
+    def add_many_to_hot_memory(
+        self,
+        project_id: str,
+        messages: List[Dict[str, Any]],
+        max_size: int = 10
+    ) -> bool:
+        """
+        Add messages (oldest first) to hot memory.
         
-        # Add to list (left push)
-        self.client.lpush(
-            self._make_key(key),
-            json.dumps(message)
-        )
+        List mode: LPUSH + LTRIM run as one MULTI/EXEC round-trip, so
+        readers never see the list longer than max_size.
+        Stream mode: pipelined XADD with MAXLEN ~ stream_maxlen; max_size
+        is ignored, since tail() and consumer groups need more than the
+        hot window (get_hot_memory's count limits what it returns).
+        """
+        if not messages:
+            return True
         
-        # Trim to max size
-        self.client.ltrim(
-            self._make_key(key),
-            0,
-            max_size - 1
-        )
+        if self.hot_memory_mode == "stream":
+            key = self._make_key(f"hot_stream:{project_id}")
+            pipe = self.client.pipeline(transaction=False)
+            for message in messages:
+                pipe.xadd(
+                    key,
+                    {"data": json.dumps(message)},
+                    maxlen=self.stream_maxlen,
+                    approximate=True
+                )
+            pipe.execute()
+            return True
+        
+        key = self._make_key(f"hot_memory:{project_id}")
+        
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lpush(key, *[json.dumps(message) for message in messages])
+        pipe.ltrim(key, 0, max_size - 1)
+        pipe.execute()
         
         return True
     
     def get_hot_memory(
         self,
-        project_id: str
+        project_id: str,
+        count: int = 10
     ) -> List[Dict[str, Any]]:
-        """Get all messages from hot memory"""
+        """
+        Get recent messages from hot memory (newest first).
+        
+        Args:
+            project_id: Project ID
+            count: Max messages in stream mode (a list already holds
+                only the last max_size)
+        """
+        if self.hot_memory_mode == "stream":
+            entries = self.client.xrevrange(
+                self._make_key(f"hot_stream:{project_id}"),
+                count=count
+            )
+            return [self._stream_message(entry_id, fields) for entry_id, fields in entries]
+        
         key = f"hot_memory:{project_id}"
         
         messages = self.client.lrange(
@@ -214,6 +552,144 @@ class RedisCache:
         
         return [json.loads(msg) for msg in messages]
     
+    # ==================== HOT MEMORY STREAMS ====================
+    
+    @staticmethod
+    def _stream_message(entry_id, fields: Dict) -> Dict[str, Any]:
+        """Stream entry -> message dict with its `stream_id`"""
+        message = json.loads(fields[b"data"])
+        message["stream_id"] = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+        return message
+    
+    def _stream_key(self, project_id: str) -> str:
+        if self.hot_memory_mode != "stream":
+            raise RuntimeError("hot memory streams need hot_memory_mode='stream'")
+        return self._make_key(f"hot_stream:{project_id}")
+    
+    def tail(
+        self,
+        project_id: str,
+        since_id: str = "0-0",
+        count: int = 100,
+        block_ms: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Messages added after `since_id` (oldest first).
+        
+        Pass the last message's `stream_id` back in to follow the stream
+        without re-reading it; with block_ms the call waits for new
+        messages instead of polling.
+        
+        Args:
+            project_id: Project ID
+            since_id: Stream ID to read after ("0-0" = from the start,
+                "$" = only messages arriving while blocked)
+            count: Max messages returned
+            block_ms: Wait up to this long for new messages (None = don't)
+            
+        Returns:
+            Messages, each with a `stream_id`
+        """
+        response = self.client.xread(
+            {self._stream_key(project_id): since_id},
+            count=count,
+            block=block_ms
+        )
+        return [
+            self._stream_message(entry_id, fields)
+            for _, entries in response or []
+            for entry_id, fields in entries
+        ]
+    
+    def ensure_consumer_group(
+        self,
+        project_id: str,
+        agent_name: str,
+        start_id: str = "0"
+    ) -> bool:
+        """
+        Create an agent's consumer group on the project stream.
+        
+        Args:
+            start_id: "0" = agent first sees everything still retained,
+                "$" = only messages added from now on
+            
+        Returns:
+            True if created, False if it already existed
+        """
+        try:
+            self.client.xgroup_create(
+                self._stream_key(project_id),
+                agent_name,
+                id=start_id,
+                mkstream=True
+            )
+            return True
+        except redis.ResponseError as e:
+            if "BUSYGROUP" in str(e):
+                return False
+            raise
+    
+    def read_new(
+        self,
+        project_id: str,
+        agent_name: str,
+        consumer: Optional[str] = None,
+        count: int = 100,
+        block_ms: Optional[int] = None,
+        auto_ack: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Messages this agent hasn't seen yet (XREADGROUP, oldest first).
+        
+        Each agent is its own consumer group, so every agent sees every
+        message exactly once; processes of the same agent can share the
+        work via different `consumer` names.
+        
+        Args:
+            project_id: Project ID
+            agent_name: Consumer group (created on first read)
+            consumer: Consumer within the group (default: agent_name)
+            count: Max messages returned
+            block_ms: Wait up to this long for new messages (None = don't)
+            auto_ack: Acknowledge on delivery (NOACK); if False, call
+                ack() after processing
+            
+        Returns:
+            Messages, each with a `stream_id`
+        """
+        key = self._stream_key(project_id)
+        
+        def read():
+            return self.client.xreadgroup(
+                agent_name,
+                consumer or agent_name,
+                {key: ">"},
+                count=count,
+                block=block_ms,
+                noack=auto_ack
+            )
+        
+        try:
+            response = read()
+        except redis.ResponseError as e:
+            if "NOGROUP" not in str(e):
+                raise
+            self.ensure_consumer_group(project_id, agent_name)
+            response = read()
+        
+        return [
+            self._stream_message(entry_id, fields)
+            for _, entries in response or []
+            for entry_id, fields in entries
+        ]
+    
+    def ack(self, project_id: str, agent_name: str, stream_ids: List[str]) -> int:
+        """Acknowledge messages read with read_new(auto_ack=False)"""
+        if not stream_ids:
+            return 0
+        return self.client.xack(self._stream_key(project_id), agent_name, *stream_ids)
+    
     # ==================== ACTIVE PROJECTS ====================
     
     def mark_project_active(
@@ -228,13 +704,13 @@ class RedisCache:
     def get_active_projects(self) -> List[str]:
         """Get list of recently active projects"""
         pattern = self._make_key("active_project:*")
-        keys = self.client.keys(pattern)
         
-        # Extract project IDs
+        # SCAN walks the keyspace incrementally instead of blocking
+        # the server like KEYS
         prefix_len = len(self._make_key("active_project:"))
         return [
             key.decode('utf-8')[prefix_len:]
-            for key in keys
+            for key in self.client.scan_iter(match=pattern, count=500)
         ]
     
     # ==================== STATISTICS ====================
@@ -248,6 +724,14 @@ class RedisCache:
         key = f"stat:{stat_name}"
         return self.client.incrby(self._make_key(key), amount)
     
+    def increment_stats(self, amounts: Dict[str, int]) -> Dict[str, int]:
+        """Increment several counters in one round-trip"""
+        names = list(amounts)
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.incrby(self._make_key(f"stat:{name}"), amounts[name])
+        return dict(zip(names, pipe.execute()))
+    
     def get_stat(self, stat_name: str) -> int:
         """Get counter value"""
         key = f"stat:{stat_name}"
@@ -276,45 +760,101 @@ class RedisCache:
         session_id: str,
         data: Dict[str, Any]
     ) -> bool:
-        """Update session (preserves TTL)"""
-        key = f"session:{session_id}"
-        full_key = self._make_key(key)
-        
-        # Get current TTL
-        ttl = self.client.ttl(full_key)
-        if ttl < 0:
-            ttl = 3600  # Default if no TTL
+        """Update session (preserves TTL, atomically)"""
+        full_key = self._make_key(f"session:{session_id}")
+        if self._update_session_script is None:
+            # Registering doesn't touch the server; EVALSHA on first call
+            self._update_session_script = self.client.register_script(_UPDATE_SESSION_LUA)
         
-        return self.set(key, data, ttl=ttl)
+        # TTL read + write in one server-side step, so a concurrent
+        # expiry can't slip in between
+        self._update_session_script(
+            keys=[full_key],
+            args=[self.codec.encode(data), 3600]  # default if no TTL
+        )
+        self._l1_invalidate(full_key)
+        return True
     
     # ==================== UTILITIES ====================
     
     def clear_project_cache(self, project_id: str) -> int:
-        """Clear all cached data for a project"""
-        patterns = [
-            f"search:*{project_id}*",
-            f"agent_state:{project_id}:*",
-            f"hot_memory:{project_id}",
-            f"active_project:{project_id}"
+        """
+        Clear all cached data for a project.
+        
+        O(keys of that project): search results and agent states are
+        found through the project's key index set, hot memory and the
+        active marker have fixed names. Keys are UNLINKed in batches.
+        """
+        index_key = self._project_index_key(project_id)
+        fixed_keys = [
+            self._make_key(f"hot_memory:{project_id}"),
+            self._make_key(f"hot_stream:{project_id}"),
+            self._make_key(f"active_project:{project_id}")
         ]
         
-        deleted = 0
-        for pattern in patterns:
-            keys = self.client.keys(self._make_key(pattern))
-            if keys:
-                deleted += self.client.delete(*keys)
+        deleted = self._unlink_batched(self.client.sscan_iter(index_key, count=500))
+        deleted += self._unlink_batched(fixed_keys)
+        self.client.unlink(index_key)
+        
+        # Search keys are hashed, so flush L1 everywhere
+        self._l1_invalidate()
         
         return deleted
     
+    def migrate_legacy_values(self, pattern: str = "*") -> Dict[str, int]:
+        """
+        Re-encode pre-codec string values with the current codec.
+        
+        TTLs are preserved. Legacy pickled values are deleted unless the
+        codec allows legacy pickle (they would otherwise read as misses).
+        Lists (hot memory) and counters (stats) are left alone.
+        
+        Args:
+            pattern: Key pattern (without prefix) to migrate
+            
+        Returns:
+            Counts: migrated, dropped, skipped
+        """
+        counts = {"migrated": 0, "dropped": 0, "skipped": 0}
+        
+        for full_key in self.client.scan_iter(match=self._make_key(pattern), count=500):
+            if self.client.type(full_key) != b"string":
+                counts["skipped"] += 1
+                continue
+            raw = self.client.get(full_key)
+            if raw is None or raw.isdigit() or not self.codec.describe(raw)["legacy"]:
+                counts["skipped"] += 1
+                continue
+            
+            try:
+                value = self.codec.decode(raw)
+            except (LegacyPickleError, ValueError):
+                self.client.delete(full_key)
+                counts["dropped"] += 1
+                continue
+            
+            ttl = self.client.pttl(full_key)
+            if ttl > 0:
+                self.client.psetex(full_key, ttl, self.codec.encode(value))
+            else:
+                self.client.set(full_key, self.codec.encode(value))
+            counts["migrated"] += 1
+        
+        return counts
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get Redis cache statistics"""
-        info = self.client.info()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.info()
+        pipe.dbsize()
+        info, total_keys = pipe.execute()
         
         return {
             "used_memory": info.get('used_memory_human'),
             "connected_clients": info.get('connected_clients'),
-            "total_keys": self.client.dbsize(),
-            "hit_rate": self._calculate_hit_rate(info)
+            "total_keys": total_keys,
+            "hit_rate": self._calculate_hit_rate(info),
+            "tiers": self.get_tier_stats()
         }
     
     def _calculate_hit_rate(self, info: Dict) -> float:
@@ -345,7 +885,10 @@ class RedisCache:
             return False
     
     def close(self):
-        """Close Redis connection"""
+        """Close Redis connection (and the L1 invalidation listener)"""
+        if self._listener:
+            self._listener.stop()
+        self._listener = None
         self.client.close()
 
 
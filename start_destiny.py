@@ -63,7 +63,7 @@ class DestinyChat:
         
         # Pokaż istniejące projekty
         try:
-            with self.postgres.conn.cursor() as cur:
+            with self.postgres.cursor() as cur:
                 cur.execute("""
                     SELECT project_id, project_name, created_at 
                     FROM projects 
@@ -482,7 +482,7 @@ Co chcesz żebyśmy zrobili?
         print("="*70)
         
         try:
-            with self.postgres.conn.cursor() as cur:
+            with self.postgres.cursor() as cur:
                 # Liczba wiadomości
                 cur.execute("""
                     SELECT COUNT(*) FROM messages WHERE project_id = %s
@@ -514,7 +514,7 @@ Co chcesz żebyśmy zrobili?
         print("="*70)
         
         try:
-            with self.postgres.conn.cursor() as cur:
+            with self.postgres.cursor() as cur:
                 cur.execute("""
                     SELECT sender, content, timestamp 
                     FROM messages 
@@ -542,7 +542,7 @@ Co chcesz żebyśmy zrobili?
         
         try:
             # Podsumowanie sesji
-            with self.postgres.conn.cursor() as cur:
+            with self.postgres.cursor() as cur:
                 cur.execute("""
                     SELECT COUNT(*) FROM messages 
                     WHERE project_id = %s 
@@ -27,7 +27,7 @@ def test_postgres():
         )
         
         # Test query
-        with store.conn.cursor() as cur:
+        with store.cursor() as cur:
             cur.execute("SELECT COUNT(*) FROM messages")
             count = cur.fetchone()[0]
         
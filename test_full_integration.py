@@ -138,7 +138,7 @@ def test_full_integration():
     postgres.store_message(msg)
     
     # Verify in PostgreSQL
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         cur.execute("SELECT content FROM messages WHERE id = %s", (test_message['id'],))
         result = cur.fetchone()
     
@@ -254,14 +254,13 @@ def test_full_integration():
     
     # Store in PostgreSQL
     print("  [1/2] Saving to PostgreSQL decisions table...")
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         cur.execute("""
             INSERT INTO decisions (project_id, decision_text, made_by, timestamp)
             VALUES (%s, %s, %s, NOW())
             RETURNING id
         """, (project_id, decision['text'], decision['decided_by']))
         decision_id = cur.fetchone()[0]
-        postgres.conn.commit()
     
     print(f"    ✅ Saved to PostgreSQL (ID: {decision_id})")
     print()
@@ -419,7 +418,7 @@ def test_full_integration():
     print(f"🔍 Query: '{query_text}'")
     print()
     print("  [1/4] PostgreSQL (keyword)...")
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         cur.execute("""
             SELECT id, sender, content, importance
             FROM messages
@@ -499,7 +498,7 @@ def test_full_integration():
     print()
     
     print("**Statistics:**")
-    with postgres.conn.cursor() as cur:
+    with postgres.cursor() as cur:
         cur.execute("SELECT COUNT(*) FROM messages WHERE project_id = %s", (project_id,))
         msg_count = cur.fetchone()[0]
     
@@ -0,0 +1,230 @@
+"""
+Unit tests for AgentMemory write-behind mode
+HelenaCore is stubbed - no databases required
+"""
+
+import pytest
+import threading
+import time
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents import agent_memory
+from agents.agent_memory import AgentMemory
+from helena_clients import HelenaResourceManager
+
+
+class StubHelena:
+    """Records saves; optionally blocks or fails"""
+    
+    def __init__(self, gate: threading.Event = None, fail_times: int = 0):
+        self.saved = []
+        self.batches = []
+        self.gate = gate
+        self.fail_times = fail_times
+        
+    def save_to_all_layers(self, event_type, content, importance, made_by, additional_data=None):
+        if self.gate is not None:
+            self.gate.wait()
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            status = {"status": "failed", "error": "down"}
+            return {"success": False, "layers": {"postgresql": status, "redis": status}}
+        self.saved.append(content)
+        ok = {"status": "success"}
+        return {"success": True, "layers": {"postgresql": ok, "redis": ok}}
+    
+    def save_many(self, events):
+        self.batches.append(len(events))
+        results = [self.save_to_all_layers(**event) for event in events]
+        return {"success": all(r["success"] for r in results), "events": results}
+
+
+def make_memory(helena: StubHelena, **kwargs) -> AgentMemory:
+    memory = AgentMemory("Test Agent", "test-project", write_behind=True, **kwargs)
+    memory.helena = helena
+    return memory
+
+
+class TestWriteBehind:
+    """Background persistence of agent memories"""
+    
+    def test_save_returns_before_persisting(self):
+        """save() only enqueues; flush() waits for the worker"""
+        gate = threading.Event()
+        helena = StubHelena(gate=gate)
+        memory = make_memory(helena)
+        
+        result = memory.save("Received task", importance=0.7)
+        
+        assert result["queued"] is True
+        assert helena.saved == []
+        
+        gate.set()
+        assert memory.flush(timeout=5)
+        assert helena.saved == ["Received task"]
+        memory.close()
+        
+    def test_flush_persists_all_in_order(self):
+        """Every queued event is persisted, in order"""
+        helena = StubHelena()
+        memory = make_memory(helena, batch_size=4)
+        
+        for i in range(10):
+            memory.save(f"event {i}", importance=0.8)
+        memory.close(timeout=5)
+        
+        assert helena.saved == [f"event {i}" for i in range(10)]
+        metrics = memory.get_metrics()
+        assert metrics["enqueued"] == 10
+        assert metrics["saved"] == 10
+        assert metrics["queue_depth"] == 0
+        
+    def test_batches_use_save_many(self):
+        """Drained batches are persisted with one save_many call"""
+        gate = threading.Event()
+        helena = StubHelena(gate=gate)
+        memory = make_memory(helena, batch_size=5)
+        
+        memory.save("first", importance=0.8)
+        time.sleep(0.05)  # worker picks up "first" alone and blocks
+        for i in range(5):
+            memory.save(f"event {i}", importance=0.8)
+        gate.set()
+        memory.close(timeout=5)
+        
+        assert helena.batches == [1, 5]
+        assert memory.get_metrics()["saved"] == 6
+        
+    def test_full_queue_drops_after_timeout(self):
+        """Backpressure: a full queue blocks, then drops the event"""
+        gate = threading.Event()
+        helena = StubHelena(gate=gate)
+        memory = make_memory(helena, queue_size=1, batch_size=1, put_timeout=0.05)
+        
+        memory.save("in flight", importance=0.8)
+        time.sleep(0.05)  # worker picks it up and blocks on the gate
+        memory.save("queued", importance=0.8)
+        result = memory.save("overflow", importance=0.8)
+        
+        assert result["queued"] is False
+        assert memory.get_metrics()["dropped"] == 1
+        
+        gate.set()
+        memory.close(timeout=5)
+        assert helena.saved == ["in flight", "queued"]
+        
+    def test_retry_when_nothing_saved(self):
+        """Events no layer accepted are retried"""
+        helena = StubHelena(fail_times=2)
+        memory = make_memory(helena, retry_backoff=0.001)
+        
+        memory.save("flaky", importance=0.8)
+        memory.close(timeout=5)
+        
+        metrics = memory.get_metrics()
+        assert helena.saved == ["flaky"]
+        assert metrics["retried"] == 2
+        assert metrics["saved"] == 1
+        
+    def test_close_gives_up_on_a_stalled_layer(self):
+        """A flush timeout doesn't block close() on a full queue"""
+        gate = threading.Event()
+        memory = make_memory(StubHelena(gate=gate), queue_size=1, batch_size=1)
+        memory.save("in flight", importance=0.8)
+        time.sleep(0.05)  # worker picks it up and blocks on the gate
+        memory.save("queued", importance=0.8)
+        
+        started = time.monotonic()
+        memory.close(timeout=0.1)
+        
+        assert time.monotonic() - started < 2
+        assert memory.get_metrics()["pending"] == 2
+        assert memory not in agent_memory._open_memories
+        gate.set()
+        
+    def test_save_after_close_raises(self):
+        """Closed memory rejects new writes"""
+        memory = make_memory(StubHelena())
+        memory.close()
+        
+        with pytest.raises(RuntimeError):
+            memory.save("late", importance=0.8)
+            
+    def test_save_racing_close_is_never_lost(self):
+        """A save either raises or is persisted before close() returns"""
+        helena = StubHelena()
+        memory = make_memory(helena, batch_size=1)
+        memory.save("warm-up", importance=0.8)
+        accepted = []
+        
+        def writer(n):
+            for i in range(200):
+                try:
+                    memory.save(f"{n}-{i}", importance=0.8)
+                except RuntimeError:
+                    return
+                accepted.append(f"{n}-{i}")
+        
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        memory.close(timeout=5)
+        for thread in threads:
+            thread.join()
+        
+        assert sorted(helena.saved) == sorted(["warm-up"] + accepted)
+        assert memory.get_metrics()["pending"] == 0
+        assert memory not in agent_memory._open_memories
+
+
+class TestSharedResources:
+    """One set of pools per process, one HelenaCore per project"""
+    
+    def test_agents_share_project_helena(self):
+        """Agents in a project share HelenaCore; projects share clients"""
+        resources = HelenaResourceManager()
+        
+        tomasz = AgentMemory("Tomasz", "project-a", resources=resources)
+        anna = AgentMemory("Anna", "project-a", resources=resources)
+        other = AgentMemory("Piotr", "project-b", resources=resources)
+        
+        assert tomasz.helena is anna.helena
+        assert tomasz.helena is not other.helena
+        assert tomasz.helena.clients is other.helena.clients
+        assert other.helena.project_id == "project-b"
+        assert resources.projects() == ["project-a", "project-b"]
+        resources.close()
+        
+    def test_settings_are_split_between_core_and_pools(self):
+        """Pool/timeout settings reach HelenaClients, the rest HelenaCore"""
+        resources = HelenaResourceManager(
+            redis_port=6380,
+            pg_maxconn=3,
+            pool_timeout=1.5
+        )
+        helena = resources.helena("project-a")
+        
+        assert helena.redis_port == 6380
+        assert resources.clients.redis_port == 6380
+        assert resources.clients.pg_maxconn == 3
+        assert resources.clients.pool_timeout == 1.5
+        resources.close()
+        
+    def test_configure_refuses_once_projects_exist(self, monkeypatch):
+        """Reconfiguring must not close clients agents still hold"""
+        monkeypatch.setattr(HelenaResourceManager, "_shared", None)
+        unused = HelenaResourceManager.configure(pg_maxconn=2)
+        resources = HelenaResourceManager.configure(pg_maxconn=3)
+        assert unused is not resources
+        
+        memory = AgentMemory("Tomasz", "project-a")
+        
+        with pytest.raises(RuntimeError, match="project-a"):
+            HelenaResourceManager.configure(pg_maxconn=5)
+        assert HelenaResourceManager.shared() is resources
+        assert memory.helena.clients is resources.clients
+        resources.close()
@@ -0,0 +1,128 @@
+"""
+Unit tests for the RedisCache value codec
+No Redis server required
+"""
+
+import json
+import pickle
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cache_codec
+from cache_codec import CacheCodec, LegacyPickleError, JSON, JSON_ZLIB, TAGGED
+from redis_cache import RedisCache
+
+
+SEARCH_RESULTS = [
+    {"id": f"msg-{i}", "score": 0.91 - i / 100, "content": "Wybraliśmy PostgreSQL " * 5,
+     "sender": "Architect", "tags": ["database", "decision"]}
+    for i in range(20)
+]
+
+
+class Priority(Enum):
+    HIGH = 1
+
+
+class Role(str, Enum):
+    ARCHITECT = "architect"
+
+
+class TestCacheCodec:
+    """Header-tagged encode/decode"""
+    
+    def test_round_trip_with_header(self):
+        codec = CacheCodec(compress_threshold=10 ** 6)
+        raw = codec.encode({"value": "test", "n": 3})
+        
+        assert raw[0] == JSON
+        assert codec.decode(raw) == {"value": "test", "n": 3}
+        
+    def test_large_values_are_compressed(self):
+        codec = CacheCodec(compression="zlib", compress_threshold=256)
+        raw = codec.encode(SEARCH_RESULTS)
+        
+        assert raw[0] == JSON_ZLIB
+        assert len(raw) < len(json.dumps(SEARCH_RESULTS))
+        assert codec.decode(raw) == SEARCH_RESULTS
+        
+    def test_datetimes_and_sets_round_trip(self):
+        codec = CacheCodec(compress_threshold=16)
+        original = {"at": datetime(2025, 11, 3, 12, 0), "tags": {"db"}, "results": SEARCH_RESULTS}
+        
+        raw = codec.encode(original)
+        
+        assert raw[0] == JSON_ZLIB | TAGGED
+        assert codec.decode(raw) == original
+        assert CacheCodec.describe(raw)["compression"] == "zlib"
+        
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_same_types_with_and_without_orjson(self, use_orjson, monkeypatch):
+        if not use_orjson:
+            monkeypatch.setattr(cache_codec, "orjson", None)
+        codec = CacheCodec()
+        original = {"id": uuid4(), "ids": [uuid4()], "score": np.float32(0.5)}
+        
+        assert codec.decode(codec.encode(original)) == original
+        for value in ({"price": Decimal("1.5")}, {"type": Priority.HIGH},
+                      {"type": Role.ARCHITECT}, {"vector": np.zeros(2)}):
+            with pytest.raises(TypeError):
+                codec.encode(value)
+        
+    def test_reads_legacy_json(self):
+        assert CacheCodec().decode(json.dumps([{"result": 1}]).encode()) == [{"result": 1}]
+        assert CacheCodec().decode(b"42") == 42
+        
+    def test_legacy_pickle_needs_opt_in(self):
+        raw = pickle.dumps({"legacy": True})
+        
+        with pytest.raises(LegacyPickleError):
+            CacheCodec().decode(raw)
+        assert CacheCodec(allow_legacy_pickle=True).decode(raw) == {"legacy": True}
+        
+    def test_msgpack_lz4(self):
+        pytest.importorskip("msgpack")
+        pytest.importorskip("lz4")
+        codec = CacheCodec(serializer="msgpack", compression="lz4", compress_threshold=256)
+        
+        assert codec.decode(codec.encode(SEARCH_RESULTS)) == SEARCH_RESULTS
+
+
+class DictRedis:
+    """Just enough of redis.Redis for get/set"""
+    
+    def __init__(self):
+        self.data = {}
+        
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value):
+        self.data[key] = value
+        return True
+    
+    def setex(self, key, ttl, value):
+        return self.set(key, value)
+
+
+class TestRedisCacheCodec:
+    
+    def test_legacy_pickle_reads_as_miss(self):
+        cache = RedisCache()
+        cache.client = DictRedis()
+        cache.client.set("destiny:old", pickle.dumps({"x": 1}))
+        cache.set("new", {"x": 2}, ttl=60)
+        
+        assert cache.get("old") is None
+        assert cache.get("new") == {"x": 2}
+        assert cache.client.data["destiny:new"][0] == JSON
@@ -0,0 +1,87 @@
+"""
+Unit tests for the embedding cache
+LM Studio is stubbed - no server required
+"""
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from embedding_cache import EmbeddingCache
+from lmstudio_embeddings import LMStudioEmbeddings
+
+
+MODEL = "text-embedding-intfloat-multilingual-e5-large-instruct"
+
+
+class TestEmbeddingCache:
+    """LRU + SQLite tiers"""
+    
+    def test_lru_evicts_oldest(self):
+        """Least recently used entry is evicted first"""
+        cache = EmbeddingCache(max_entries=2)
+        cache.put(MODEL, "a", [1.0])
+        cache.put(MODEL, "b", [2.0])
+        cache.get(MODEL, "a")            # "a" is now most recent
+        cache.put(MODEL, "c", [3.0])
+        
+        assert cache.get(MODEL, "a") == [1.0]
+        assert cache.get(MODEL, "b") is None
+        assert cache.get(MODEL, "c") == [3.0]
+        
+    def test_model_is_part_of_key(self):
+        """Switching models never returns the old model's vectors"""
+        cache = EmbeddingCache()
+        cache.put(MODEL, "PostgreSQL", [0.5, 0.5])
+        
+        assert cache.get("other-model", "PostgreSQL") is None
+        assert cache.get(MODEL, "PostgreSQL") == [0.5, 0.5]
+        
+    def test_memory_tier_holds_float32_arrays(self):
+        """LRU entries are compact read-only arrays, not tuples of floats"""
+        cache = EmbeddingCache()
+        cache.put(MODEL, "Qdrant", [0.1] * 1024)
+        
+        stored = next(iter(cache._lru.values()))
+        assert stored.dtype.name == "float32" and stored.nbytes == 4096
+        assert not stored.flags.writeable
+        assert cache.get(MODEL, "Qdrant") == pytest.approx([0.1] * 1024)
+        
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache on the same file serves earlier embeddings"""
+        path = tmp_path / "embeddings.db"
+        first = EmbeddingCache(path=path)
+        first.put(MODEL, "Redis for caching", [0.25, -1.5, 3.0])
+        first.close()
+        
+        second = EmbeddingCache(path=path)
+        assert second.get(MODEL, "Redis for caching") == [0.25, -1.5, 3.0]
+        assert second.get_stats()["disk_hits"] == 1
+        assert second.get(MODEL, "Redis for caching") == [0.25, -1.5, 3.0]
+        assert second.get_stats()["hits"] == 1
+        second.close()
+
+
+class TestCachedEmbeddings:
+    """LMStudioEmbeddings only calls the server for misses"""
+    
+    def test_repeat_embeddings_skip_server(self):
+        embedder = LMStudioEmbeddings()
+        requests_sent = []
+        
+        def request(texts):
+            requests_sent.append(list(texts))
+            return [[float(len(t))] for t in texts]
+        embedder._request_embeddings = request
+        
+        assert embedder.embed("PostgreSQL") == [10.0]
+        assert embedder.embed(["PostgreSQL", "Neo4j", "Neo4j"]) == [[10.0], [5.0], [5.0]]
+        assert embedder.embed("Neo4j") == [5.0]
+        
+        assert requests_sent == [["PostgreSQL"], ["Neo4j"]]
+        stats = embedder.get_cache_stats()
+        assert stats["hits"] == 2
+        assert stats["hit_rate"] == pytest.approx(40.0)
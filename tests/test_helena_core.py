@@ -0,0 +1,245 @@
+"""
+Unit tests for HelenaCore save fan-out
+Layer writers are stubbed - no databases required
+"""
+
+import pytest
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from helena_core import HelenaCore
+
+
+LAYER_DELAY = 0.05
+
+
+def make_helena(concurrent_layers: bool, failing_layer: str = None) -> HelenaCore:
+    """HelenaCore whose layer writers just sleep and report success"""
+    helena = HelenaCore(
+        project_id="test-project",
+        backend="subprocess",
+        concurrent_layers=concurrent_layers
+    )
+    
+    def writer(layer):
+        def write(*args, **kwargs):
+            time.sleep(LAYER_DELAY)
+            if layer == failing_layer:
+                return {"status": "failed", "error": "boom"}
+            return {"status": "success", "layer": layer}
+        return write
+    
+    helena._save_to_postgresql = writer("postgresql")
+    helena._save_to_neo4j = writer("neo4j")
+    helena._save_to_qdrant = writer("qdrant")
+    helena._save_to_redis = writer("redis")
+    return helena
+
+
+class TestSaveToAllLayers:
+    """save_to_all_layers result shape in both dispatch modes"""
+    
+    @pytest.mark.parametrize("concurrent_layers", [False, True])
+    def test_result_structure(self, concurrent_layers):
+        """Layer order, statuses and success flag match across modes"""
+        helena = make_helena(concurrent_layers)
+        
+        result = helena.save_to_all_layers(
+            event_type="decision",
+            content="Use PostgreSQL",
+            importance=0.9,
+            made_by="Aleksander Nowak"
+        )
+        helena.close()
+        
+        assert result["success"] is True
+        assert list(result["layers"]) == ["postgresql", "neo4j", "qdrant", "redis"]
+        assert all(r["status"] == "success" for r in result["layers"].values())
+        
+    @pytest.mark.parametrize("concurrent_layers", [False, True])
+    def test_skipped_layers(self, concurrent_layers):
+        """Non-decision, low-importance events skip Neo4j and Qdrant"""
+        helena = make_helena(concurrent_layers)
+        
+        result = helena.save_to_all_layers(
+            event_type="agent_context",
+            content="Received task",
+            importance=0.7,
+            made_by="Tomasz Kamiński"
+        )
+        helena.close()
+        
+        assert result["success"] is True
+        assert result["layers"]["neo4j"] == {"status": "skipped", "reason": "not a decision"}
+        assert result["layers"]["qdrant"]["status"] == "skipped"
+        
+    @pytest.mark.parametrize("concurrent_layers", [False, True])
+    def test_failed_layer_marks_partial(self, concurrent_layers):
+        """One failed layer flips overall success"""
+        helena = make_helena(concurrent_layers, failing_layer="qdrant")
+        
+        result = helena.save_to_all_layers(
+            event_type="decision",
+            content="Use PostgreSQL",
+            importance=0.9,
+            made_by="Aleksander Nowak"
+        )
+        helena.close()
+        
+        assert result["success"] is False
+        assert result["layers"]["qdrant"]["status"] == "failed"
+        assert result["layers"]["redis"]["status"] == "success"
+        
+    def test_concurrent_is_faster(self):
+        """Parallel dispatch costs ~one layer, not the sum of four"""
+        helena = make_helena(concurrent_layers=True)
+        
+        start = time.perf_counter()
+        helena.save_to_all_layers(
+            event_type="decision",
+            content="Use PostgreSQL",
+            importance=0.9,
+            made_by="Aleksander Nowak"
+        )
+        elapsed = time.perf_counter() - start
+        helena.close()
+        
+        assert elapsed < LAYER_DELAY * 3
+
+
+class TestSaveMany:
+    """Bulk save: one call per layer, per-event statuses"""
+    
+    def make_bulk_helena(self, failing_layer: str = None) -> HelenaCore:
+        """HelenaCore whose bulk writers record the events they receive"""
+        helena = HelenaCore(project_id="test-project", backend="client")
+        helena.bulk_calls = {}
+        
+        def writer(layer):
+            def write(events):
+                helena.bulk_calls.setdefault(layer, []).append(len(events))
+                if layer == failing_layer:
+                    return {"status": "failed", "error": "boom"}
+                if layer == "qdrant":
+                    return {
+                        "status": "success",
+                        "point_ids": {e["event_id"]: i for i, e in enumerate(events)}
+                    }
+                return {"status": "success"}
+            return write
+        
+        helena._save_many_to_postgresql = writer("postgresql")
+        helena._save_many_to_neo4j = writer("neo4j")
+        helena._save_many_to_qdrant = writer("qdrant")
+        helena._save_many_to_redis = writer("redis")
+        return helena
+    
+    def events(self):
+        return [
+            {"event_type": "decision", "content": "Use PostgreSQL",
+             "importance": 0.9, "made_by": "Aleksander Nowak"},
+            {"event_type": "message", "content": "Standup at 10",
+             "importance": 0.5, "made_by": "Anna Kowalczyk"},
+            {"event_type": "agent_context", "content": "Received task",
+             "importance": 0.8, "made_by": "Tomasz Kamiński"},
+        ]
+    
+    def test_one_call_per_layer(self):
+        """Each layer receives only its eligible events, in one call"""
+        helena = self.make_bulk_helena()
+        
+        result = helena.save_many(self.events())
+        helena.close()
+        
+        assert helena.bulk_calls == {
+            "postgresql": [3], "neo4j": [1], "qdrant": [2], "redis": [3]
+        }
+        assert result["success"] is True
+        assert result["saved"] == 3
+        
+    def test_per_event_statuses(self):
+        """Per-event layers mirror save_to_all_layers, in input order"""
+        helena = self.make_bulk_helena()
+        
+        statuses = helena.save_many(self.events())["events"]
+        helena.close()
+        
+        decision, message, context = statuses
+        assert decision["layers"]["neo4j"]["status"] == "success"
+        assert decision["layers"]["qdrant"]["point_id"] == 0
+        assert message["layers"]["neo4j"]["status"] == "skipped"
+        assert message["layers"]["qdrant"]["status"] == "skipped"
+        assert context["layers"]["qdrant"]["point_id"] == 1
+        assert len({s["event_id"] for s in statuses}) == 3
+        
+    def test_failed_layer_and_chunking(self):
+        """A failed bulk layer fails only the events that used it"""
+        helena = self.make_bulk_helena(failing_layer="neo4j")
+        
+        result = helena.save_many(self.events(), chunk_size=2)
+        helena.close()
+        
+        assert helena.bulk_calls["postgresql"] == [2, 1]
+        assert result["saved"] == 2
+        assert result["events"][0]["success"] is False
+        assert result["events"][0]["layers"]["neo4j"]["error"] == "boom"
+
+
+class TestQdrantPointIds:
+    """Deterministic point IDs - no read-before-write race"""
+    
+    def make_qdrant_helena(self) -> HelenaCore:
+        """Client-backend HelenaCore on an in-memory Qdrant"""
+        from qdrant_client import QdrantClient
+        from qdrant_client.models import Distance, VectorParams
+        
+        helena = HelenaCore(project_id="test-project", backend="client")
+        qdrant = QdrantClient(":memory:")
+        qdrant.create_collection(
+            helena.collection_name,
+            vectors_config=VectorParams(size=4, distance=Distance.COSINE)
+        )
+        helena.clients._qdrant = qdrant
+        helena.clients.embed = lambda text: [1.0, 0.5, 0.25, float(len(text))]
+        return helena
+    
+    def test_point_id_is_stable(self):
+        """Same event -> same ID; UUID event IDs are used as-is"""
+        event_id = str(uuid.uuid4())
+        
+        assert HelenaCore._qdrant_point_id(event_id) == event_id
+        assert HelenaCore._qdrant_point_id("legacy-42") == HelenaCore._qdrant_point_id("legacy-42")
+        assert HelenaCore._qdrant_point_id("legacy-42") != HelenaCore._qdrant_point_id("legacy-43")
+        
+    def test_parallel_writers_lose_no_points(self):
+        """N concurrent savers each keep their own point"""
+        helena = self.make_qdrant_helena()
+        writers, per_writer = 8, 25
+        barrier = threading.Barrier(writers)
+        
+        def write(writer):
+            barrier.wait()
+            return [
+                helena._save_to_qdrant(
+                    "decision", f"writer {writer} event {i}", 0.9, f"Writer {writer}",
+                    str(uuid.uuid4()), datetime.now(), {}
+                )
+                for i in range(per_writer)
+            ]
+        
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            results = [r for batch in pool.map(write, range(writers)) for r in batch]
+        
+        assert all(r["status"] == "success" for r in results)
+        count = helena.clients.qdrant.count(helena.collection_name).count
+        assert count == writers * per_writer
+        assert len({r["point_id"] for r in results}) == writers * per_writer
+        helena.close()
@@ -0,0 +1,141 @@
+"""
+Unit tests for LMStudioEmbeddings batching
+Runs against a local stub HTTP server - no LM Studio required
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lmstudio_embeddings import LMStudioEmbeddings
+
+
+class StubEmbeddingServer:
+    """OpenAI-style /v1/embeddings; the first `fail_times` requests get a 503"""
+    
+    def __init__(self, fail_times: int = 0):
+        self.requests = []
+        self.fail_times = fail_times
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body["input"])
+                if stub.fail_times > 0:
+                    stub.fail_times -= 1
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                data = [{"embedding": [float(len(t)), 1.0]} for t in body["input"]]
+                payload = json.dumps({"data": data}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server():
+    stub = StubEmbeddingServer()
+    yield stub
+    stub.close()
+
+
+class TestEmbedBatch:
+    """Char-capped, concurrent, retried batches"""
+    
+    def test_batches_capped_by_chars_and_count(self):
+        embedder = LMStudioEmbeddings(max_batch_chars=10)
+        
+        batches = embedder._plan_batches(["aaaa", "bbbb", "cccc", "d", "e", "f"], batch_size=2)
+        
+        assert batches == [["aaaa", "bbbb"], ["cccc", "d"], ["e", "f"]]
+        
+    def test_order_and_progress(self, server):
+        """Results keep input order whatever order batches finish in"""
+        embedder = LMStudioEmbeddings(base_url=server.base_url, max_workers=4)
+        texts = [f"message {i}" * (i % 3 + 1) for i in range(50)]
+        progress = []
+        
+        embeddings = embedder.embed_batch(
+            texts, batch_size=7,
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+        
+        assert embeddings == [[float(len(t)), 1.0] for t in texts]
+        assert len(server.requests) == 8
+        assert progress[-1] == (50, 50)
+        
+    def test_retries_server_errors(self, server):
+        """5xx responses are retried with backoff"""
+        server.fail_times = 2
+        embedder = LMStudioEmbeddings(base_url=server.base_url, retry_backoff=0.001)
+        
+        assert embedder.embed("PostgreSQL") == [10.0, 1.0]
+        assert len(server.requests) == 3
+        
+    def test_gives_up_after_max_retries(self, server):
+        server.fail_times = 5
+        embedder = LMStudioEmbeddings(
+            base_url=server.base_url, max_retries=1, retry_backoff=0.001
+        )
+        
+        with pytest.raises(Exception, match="LM Studio error"):
+            embedder.embed("PostgreSQL")
+        assert len(server.requests) == 2
+
+
+class TestMatrixOperations:
+    """float32 matrix similarity and top-k"""
+    
+    def test_cosine_matrix_matches_pairwise(self):
+        embedder = LMStudioEmbeddings()
+        rng = np.random.default_rng(0)
+        a, b = rng.normal(size=(3, 16)), rng.normal(size=(5, 16))
+        
+        matrix = embedder.cosine_matrix(a, b)
+        
+        assert matrix.dtype == np.float32
+        assert matrix.shape == (3, 5)
+        assert matrix[1, 4] == pytest.approx(embedder.similarity(a[1], b[4]), abs=1e-5)
+        
+    def test_top_k_matches_full_sort(self):
+        embedder = LMStudioEmbeddings()
+        rng = np.random.default_rng(1)
+        matrix = embedder.normalize(rng.normal(size=(1000, 32)))
+        query = embedder.normalize(rng.normal(size=32))
+        
+        indices, scores = embedder.top_k(query, matrix, k=10, normalized=True)
+        
+        expected = np.argsort(-(matrix @ query))[:10]
+        assert indices.tolist() == expected.tolist()
+        assert np.all(np.diff(scores) <= 0)
+        
+    def test_embed_matrix_is_normalized(self, server):
+        embedder = LMStudioEmbeddings(base_url=server.base_url)
+        
+        matrix = embedder.embed_matrix(["PostgreSQL", "Neo4j"])
+        
+        assert matrix.dtype == np.float32
+        assert np.linalg.norm(matrix, axis=1) == pytest.approx([1.0, 1.0])
@@ -0,0 +1,518 @@
+"""
+Tests for PostgresContextStore (DB-backed ones need DESTINY_TEST_POSTGRES_DSN)
+"""
+
+import os
+import random
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import psycopg2
+import pytest
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import postgres_integration
+from destiny_team import Message
+from helena_core import HelenaCore
+from postgres_integration import PostgresMessageBus
+from postgres_context_store import (
+    ARCHIVE_SCHEMA, PostgresContextStore, StoredMessage, _project_partition_name, _row_to_message
+)
+
+# Tests marked with this need a disposable PostgreSQL database
+POSTGRES_DSN = os.environ.get("DESTINY_TEST_POSTGRES_DSN")
+needs_postgres = pytest.mark.skipif(
+    not POSTGRES_DSN, reason="set DESTINY_TEST_POSTGRES_DSN to run against PostgreSQL"
+)
+
+
+class RecordingCursor:
+    """Cursor that records the last statement and returns no rows"""
+
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.log.append((sql, params))
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+    def copy_expert(self, sql, file):
+        self.log.append((sql, file.read()))
+
+    def close(self):
+        pass
+
+
+class PartitionedCursor(RecordingCursor):
+    """Cursor of a database whose messages table is LIST-partitioned"""
+
+    def fetchone(self):
+        return ("p", "l")
+
+
+class RecordingConnection:
+
+    def __init__(self):
+        self.log = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+        self.autocommit = False
+
+    def cursor(self, cursor_factory=None):
+        return RecordingCursor(self.log)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class RecordingPool:
+    """ThreadedConnectionPool stand-in handing out RecordingConnections"""
+
+    def __init__(self):
+        self.handed_out = []
+        self.returned = []
+
+    def getconn(self):
+        conn = RecordingConnection()
+        self.handed_out.append(conn)
+        return conn
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+
+def make_store(full_text_search=True, trigram_search=True):
+    """Store without __init__ (which would connect and create the schema)"""
+    store = PostgresContextStore.__new__(PostgresContextStore)
+    store.conn = RecordingConnection()
+    store.pool = None
+    store._lock = threading.RLock()
+    store.full_text_search = full_text_search
+    store.trigram_search = trigram_search
+    store._search_configs = ["simple", "english"]
+    store.partitioning = None
+    store._partitions = set()
+    return store
+
+
+class TestFullTextSearch:
+
+    def test_tsquery_terms_are_sanitized_prefixes(self):
+        store = make_store()
+
+        assert store._tsquery_terms(["baza", "o'reilly", "wdrożenie!", "::"]) == \
+            "baza:* | oreilly:* | wdrożenie:*"
+
+    def test_ranked_query_uses_search_vector(self):
+        store = make_store()
+        store.search_messages("proj", "database migration")
+
+        sql, params = store.conn.log[-1]
+        assert "to_tsquery('simple', %(terms)s) || to_tsquery('english', %(terms)s)" in sql
+        assert "ORDER BY rank DESC" in sql
+        assert "ILIKE" not in sql
+        assert sql.count("<%% m.content") == 2
+        assert sorted(params["keywords"]) == ["database", "migration"]
+
+    def test_falls_back_to_ilike_before_migration(self):
+        store = make_store(full_text_search=False)
+        store.search_messages("proj", "database migration")
+
+        sql, _ = store.conn.log[-1]
+        assert "ILIKE ANY" in sql
+
+    def test_rows_with_extra_columns_map_to_messages(self):
+        row = {
+            "id": "m1", "project_id": "proj", "sender": "Helena", "recipient": None,
+            "message_type": "UPDATE", "content": "text", "context": {},
+            "timestamp": datetime(2025, 11, 3), "requires_response": False,
+            "response_to": None, "importance": 0.5, "tags": [],
+            "search_vector": "'text':1", "rank": 0.1
+        }
+
+        assert _row_to_message(row).id == "m1"
+
+
+def message(i, content="text", **kwargs):
+    kwargs.setdefault("timestamp", datetime(2025, 11, 3, 12, 0, i))
+    return StoredMessage(
+        id=f"m{i}", project_id="proj", sender="Helena", recipient=None,
+        message_type="UPDATE", content=content, context={}, **kwargs
+    )
+
+
+class TestStoreMessages:
+
+    def test_copy_line_escapes_text_and_arrays(self):
+        line = PostgresContextStore._copy_line(
+            message(1, content="line one\nline\ttwo \\ end", tags=['a"b', "c,d"])
+        )
+        columns = line.rstrip("\n").split("\t")
+
+        assert len(columns) == 12
+        assert columns[3] == "\\N"  # recipient NULL
+        assert columns[5] == "line one\\nline\\ttwo \\\\ end"
+        assert columns[7] == "2025-11-03T12:00:01"
+        assert columns[11] == '{"a\\\\"b","c,d"}'
+
+    def test_one_transaction_per_batch_last_copy_wins(self):
+        store = make_store()
+        messages = [message(i) for i in range(5)] + [message(0, content="edited")]
+
+        assert store.store_messages(messages, batch_size=4) == 6
+        assert store.conn.commits == 2
+
+        store = make_store()
+        assert store.store_messages(messages, batch_size=10) == 5
+        copies = [data for sql, data in store.conn.log if sql.startswith("COPY")]
+        assert store.conn.commits == 1
+        assert "edited" in copies[0] and copies[0].count("\n") == 5
+
+    @needs_postgres
+    def test_copy_and_values_round_trip(self):
+        store = PostgresContextStore(POSTGRES_DSN)
+        project_id = f"test-ingest-{uuid.uuid4()}"
+        try:
+            for method in ("copy", "values"):
+                batch = [
+                    StoredMessage(
+                        id=f"{project_id}-{method}-{i}", project_id=project_id,
+                        sender="Helena", recipient=None if i % 2 else "Anna",
+                        message_type="UPDATE", content=f"tab\there {i} \\ \"quoted\"",
+                        context={"i": i}, timestamp=datetime.now(),
+                        importance=0.25, tags=["a,b", 'say "hi"']
+                    )
+                    for i in range(50)
+                ]
+                assert store.store_messages(batch, batch_size=20, method=method) == 50
+                assert store.store_messages(batch[:1], method=method) == 1  # upsert
+
+                stored = store.get_message(batch[7].id)
+                assert stored.content == batch[7].content
+                assert stored.tags == batch[7].tags
+                assert stored.context == {"i": 7}
+        finally:
+            with store.cursor() as cur:
+                cur.execute("DELETE FROM messages WHERE project_id = %s", (project_id,))
+            store.close()
+
+
+class FlakyStore:
+    """store_messages stand-in that fails the first `fail_times` calls"""
+    
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.stored = []
+        
+    def store_messages(self, messages):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise psycopg2.OperationalError("connection lost")
+        self.stored.extend(m.content for m in messages)
+        return len(messages)
+
+
+class TestMessageBusBuffer:
+    """Batched PostgresMessageBus never drops buffered messages"""
+    
+    def post(self, bus, *contents):
+        for content in contents:
+            bus.post(Message(sender="Helena", content=content))
+    
+    def test_failed_batch_is_kept_for_the_next_flush(self):
+        store = FlakyStore(fail_times=1)
+        bus = PostgresMessageBus(store, "proj", batch_size=2)
+        
+        self.post(bus, "a", "b")
+        
+        assert store.stored == []
+        assert len(bus.message_history) == 2  # still routed
+        
+        self.post(bus, "c")  # next full buffer retries the failed batch first
+        
+        assert store.stored == ["a", "b", "c"]
+        bus.close()
+        
+    def test_buffered_messages_are_flushed_at_exit(self):
+        store = FlakyStore()
+        bus = PostgresMessageBus(store, "proj", batch_size=10)
+        self.post(bus, "a")
+        
+        postgres_integration._flush_open_buses()
+        
+        assert store.stored == ["a"]
+        assert bus not in postgres_integration._open_buses
+
+
+class TestConnections:
+
+    def test_cursor_commits_on_success_and_rolls_back_on_error(self):
+        store = make_store()
+        with store.cursor() as cur:
+            cur.execute("SELECT 1")
+        assert (store.conn.commits, store.conn.rollbacks) == (1, 0)
+
+        with pytest.raises(ValueError):
+            with store.cursor() as cur:
+                raise ValueError("bad row")
+        assert (store.conn.commits, store.conn.rollbacks) == (1, 1)
+        assert not store._lock._is_owned()
+
+    def test_broken_pooled_connection_is_discarded(self):
+        store = make_store()
+        store.pool = RecordingPool()
+        store.pool_timeout = 0
+
+        with store.cursor() as cur:
+            cur.execute("SELECT 1")
+        with pytest.raises(psycopg2.OperationalError):
+            with store.cursor() as cur:
+                raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+        assert [close for _, close in store.pool.returned] == [False, True]
+        assert store.pool.handed_out[1].rollbacks == 0
+
+    def test_broken_shared_connection_reconnects(self, monkeypatch):
+        store = make_store()
+        broken = store.conn
+        with pytest.raises(psycopg2.InterfaceError):
+            with store.cursor():
+                raise psycopg2.InterfaceError("connection already closed")
+        assert broken.closed and store.conn is None
+
+        fresh = RecordingConnection()
+        monkeypatch.setattr(store, "_connect", lambda: setattr(store, "conn", fresh))
+        assert store.get_message("m1") is None
+        assert store.conn is fresh and fresh.log
+
+
+class TestPartitioning:
+
+    def test_upsert_conflict_target_includes_partition_key(self):
+        store = make_store()
+        assert "ON CONFLICT (id) DO" in store._upsert_messages_sql("VALUES %s")
+
+        store.partitioning = "month"
+        assert "ON CONFLICT (id, timestamp) DO" in store._upsert_messages_sql("VALUES %s")
+
+    def test_month_partitions_created_before_writes(self):
+        store = make_store()
+        store.partitioning = "month"
+        batch = [message(1), message(2, timestamp=datetime(2025, 12, 31, 23, 59))]
+
+        store.store_messages(batch, method="copy")
+
+        statements = [repr(sql) for sql, _ in store.conn.log]
+        created = [i for i, sql in enumerate(statements) if "PARTITION OF" in sql]
+        assert len(created) == 2
+        assert any("messages_y2025m11" in statements[i] for i in created)
+        assert any("messages_y2025m12" in statements[i] for i in created)
+        assert max(created) < next(i for i, sql in enumerate(statements) if "COPY" in sql)
+        assert store.conn.commits == 1  # same transaction as the rows
+
+    def test_helena_core_inserts_create_the_partition(self):
+        conn = RecordingConnection()
+        conn.cursor = lambda cursor_factory=None: PartitionedCursor(conn.log)
+        helena = HelenaCore(backend="subprocess", project_id="new-project")
+        helena._pg_connection = contextmanager(lambda: (yield conn))
+
+        result = helena._save_to_postgresql(
+            "message", "hello", 0.5, "Helena", "m1", datetime(2025, 11, 3), {}
+        )
+
+        assert result["status"] == "success"
+        statements = [repr(sql) for sql, _ in conn.log]
+        created = next(i for i, sql in enumerate(statements) if "PARTITION OF" in sql)
+        assert "Literal('new-project')" in statements[created]
+        assert created < next(i for i, sql in enumerate(statements) if "INSERT INTO messages" in sql)
+
+    def test_only_whole_months_before_cutoff_expire(self, monkeypatch):
+        store = make_store()
+        monkeypatch.setattr(store, "list_partitions", lambda: [
+            {"name": "messages_y2025m09", "month": datetime(2025, 9, 1)},
+            {"name": "messages_y2025m10", "month": datetime(2025, 10, 1)},
+            {"name": "messages_y2025m11", "month": datetime(2025, 11, 1)},
+            {"name": "messages_legacy", "month": None},
+        ])
+
+        expired = store.expired_partitions(datetime(2025, 11, 1, 12, 0))
+        assert [p["name"] for p in expired] == ["messages_y2025m09", "messages_y2025m10"]
+
+    @needs_postgres
+    def test_month_partitions_archive_instead_of_delete(self):
+        schema = f"test_partitions_{uuid.uuid4().hex[:8]}"
+        admin = psycopg2.connect(POSTGRES_DSN)
+        admin.autocommit = True
+        with admin.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {schema}")
+
+        store = PostgresContextStore(f"{POSTGRES_DSN} options='-c search_path={schema}'", partitioning="month")
+        try:
+            old, recent = datetime(2024, 1, 15), datetime.now()
+            assert store.store_messages(
+                [message(i, timestamp=old) for i in range(3)] +
+                [StoredMessage(id="new", project_id="proj", sender="Helena", recipient=None,
+                               message_type="UPDATE", content="text", context={}, timestamp=recent)]
+            ) == 4
+
+            cutoff = datetime(2024, 6, 1)
+            plan = store.cleanup_messages(cutoff)
+            assert plan["partitions"] == ["messages_y2024m01"]
+            assert (plan["partition_rows"], plan["deleted_rows"]) == (3, 0)
+
+            store.cleanup_messages(cutoff, archive=True, dry_run=False)
+            with store.cursor() as cur:
+                cur.execute("SELECT id FROM messages")
+                assert [row[0] for row in cur.fetchall()] == ["new"]
+                cur.execute(f"SELECT COUNT(*) FROM {ARCHIVE_SCHEMA}.messages_y2024m01")
+                assert cur.fetchone()[0] == 3
+        finally:
+            store.close()
+            with admin.cursor() as cur:
+                cur.execute(f"DROP SCHEMA {schema} CASCADE")
+                cur.execute(f"DROP TABLE IF EXISTS {ARCHIVE_SCHEMA}.messages_y2024m01")
+            admin.close()
+
+    @needs_postgres
+    def test_helena_core_saves_into_project_partitions(self):
+        schema = f"test_partitions_{uuid.uuid4().hex[:8]}"
+        dsn = f"{POSTGRES_DSN} options='-c search_path={schema}'"
+        admin = psycopg2.connect(POSTGRES_DSN)
+        admin.autocommit = True
+        with admin.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {schema}")
+
+        store = PostgresContextStore(dsn, partitioning="project")
+        helena = HelenaCore(postgres_conn=dsn, backend="subprocess", project_id="fresh-project")
+        try:
+            single = helena._save_to_postgresql(
+                "message", "one", 0.5, "Helena", "h1", datetime.now(), {}
+            )
+            bulk = helena._save_many_to_postgresql([
+                {"event_type": "message", "content": f"bulk {i}", "importance": 0.5,
+                 "made_by": "Helena", "additional_data": {}, "event_id": f"h{i}",
+                 "timestamp": datetime.now()}
+                for i in range(2, 5)
+            ])
+
+            assert single["status"] == "success" and bulk["status"] == "success"
+            assert [p["name"] for p in store.list_partitions()] == [_project_partition_name("fresh-project")]
+            assert len(store.get_agent_conversation_history("Helena", "fresh-project")) == 4
+        finally:
+            store.close()
+            with admin.cursor() as cur:
+                cur.execute(f"DROP SCHEMA {schema} CASCADE")
+            admin.close()
+
+
+# get_relevant_context_for_agent before candidate prefiltering: scores
+# every message of the project
+FULL_SCAN_CONTEXT_SQL = """
+WITH relevance_scored AS (
+    SELECT *,
+        (
+            (SELECT COUNT(*)::FLOAT FROM unnest(tags) tag WHERE tag = ANY(%s))
+            / GREATEST(array_length(tags, 1), 1) * 0.3
+            + (
+                CASE
+                    WHEN EXTRACT(EPOCH FROM (NOW() - timestamp)) < 3600 THEN 1.0
+                    WHEN EXTRACT(EPOCH FROM (NOW() - timestamp)) < 86400 THEN 0.7
+                    WHEN EXTRACT(EPOCH FROM (NOW() - timestamp)) < 604800 THEN 0.4
+                    ELSE 0.2
+                END
+            ) * 0.2
+            + importance * 0.3
+            + (
+                CASE
+                    WHEN sender = %s THEN 0.1
+                    WHEN recipient = %s THEN 0.1
+                    ELSE 0.0
+                END
+            ) * 0.2
+        ) as relevance_score
+    FROM messages
+    WHERE project_id = %s AND importance >= %s
+)
+SELECT id FROM relevance_scored
+WHERE relevance_score > 0.1
+ORDER BY relevance_score DESC, timestamp DESC, id
+LIMIT %s
+"""
+
+
+class TestRelevantContext:
+
+    def test_time_window_is_a_parameter(self):
+        store = make_store()
+        store.get_relevant_context_for_agent("Helena", "proj", "database schema", time_window_days=30)
+
+        sql, params = store.conn.log[-1]
+        assert "30 days" not in sql
+        assert "make_interval(days => %(time_window_days)s)" in sql
+        assert params["time_window_days"] == 30
+
+    @needs_postgres
+    def test_ranking_matches_full_scan(self):
+        store = PostgresContextStore(POSTGRES_DSN)
+        project_id = f"test-context-{uuid.uuid4()}"
+        rng = random.Random(7)
+        agents = ["Helena", "Aleksander", "Tomasz", "Anna"]
+        tags = ["database", "schema", "security", "cache", "deploy", "review"]
+        now = datetime.now()
+
+        for i in range(600):
+            # Distinct timestamps so the ordering has no ties
+            store.store_message(StoredMessage(
+                id=f"{project_id}-{i}",
+                project_id=project_id,
+                sender=rng.choice(agents),
+                recipient=rng.choice(agents + [None]),
+                message_type="UPDATE",
+                content=f"message {i}",
+                context={},
+                timestamp=now - timedelta(hours=rng.choice([0.5, 5, 50, 500, 5000]), seconds=i),
+                importance=round(rng.random(), 2),
+                tags=rng.sample(tags, rng.randint(0, 3))
+            ))
+
+        try:
+            for agent, query, limit in [
+                ("Helena", "database schema review", 20),
+                ("Anna", "nothing matches this", 10),
+                ("Tomasz", "cache security", 50),
+            ]:
+                keywords = store._extract_keywords(query)
+                with store.cursor() as cur:
+                    cur.execute(FULL_SCAN_CONTEXT_SQL, (keywords, agent, agent, project_id, 0.0, limit))
+                    expected = [row[0] for row in cur.fetchall()]
+
+                actual = store.get_relevant_context_for_agent(agent, project_id, query, max_messages=limit)
+                assert [m.id for m in actual] == expected
+        finally:
+            with store.cursor() as cur:
+                cur.execute("DELETE FROM messages WHERE project_id = %s", (project_id,))
+            store.close()
@@ -0,0 +1,367 @@
+"""
+Unit tests for QdrantSemanticStore on the local vector backend
+Embeddings are stubbed - no Qdrant or LM Studio required
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from local_vector_index import LocalVectorIndex
+from qdrant_integration import QdrantSemanticStore
+
+
+TOPICS = ["postgres", "redis", "neo4j", "qdrant"]
+
+
+def fake_embeddings(texts):
+    """One axis per topic word, so similar topics score high"""
+    vectors = []
+    for text in texts:
+        vector = [float(topic in text.lower()) for topic in TOPICS]
+        vectors.append(vector + [0.1])
+    return vectors
+
+
+def make_store(local_path=None) -> QdrantSemanticStore:
+    store = QdrantSemanticStore(backend="local", local_path=local_path)
+    store.dimension = len(TOPICS) + 1
+    store.embedder._request_embeddings = fake_embeddings
+    store.create_collection("demo")
+    return store
+
+
+def message(message_id, content, sender, tags=None):
+    return {
+        "id": message_id,
+        "content": content,
+        "sender": sender,
+        "timestamp": datetime(2025, 11, 3, 12, 0),
+        "message_type": "DECISION",
+        "tags": tags or []
+    }
+
+
+@pytest.fixture
+def store():
+    store = make_store()
+    store.store_messages_batch("demo", [
+        message("m1", "We chose Postgres for ACID", "Architect", ["database"]),
+        message("m2", "Postgres replication plan", "DevOps", ["database", "ops"]),
+        message("m3", "Redis for session cache", "Developer", ["cache"]),
+        message("m4", "Neo4j models the knowledge graph", "Architect"),
+    ])
+    return store
+
+
+class TestLocalBackend:
+    """Same API and filter semantics as the Qdrant backend"""
+    
+    def test_search_ranks_by_similarity(self, store):
+        results = store.search("demo", "Why Postgres?", limit=2, score_threshold=0.5)
+        
+        assert [r["id"] for r in results] == ["m1", "m2"]
+        assert results[0]["score"] >= results[1]["score"]
+        assert results[0]["sender"] == "Architect"
+        
+    def test_filters_match_values_and_list_fields(self, store):
+        by_sender = store.search("demo", "Postgres", score_threshold=0.0,
+                                 filters={"sender": "DevOps"})
+        by_tag = store.search("demo", "Postgres", score_threshold=0.0,
+                              filters={"tags": "database"})
+        
+        assert [r["id"] for r in by_sender] == ["m2"]
+        assert sorted(r["id"] for r in by_tag) == ["m1", "m2"]
+        
+    def test_filter_columns_follow_updates(self):
+        index = LocalVectorIndex()
+        index.create_collection("c", dimension=2)
+        index.upsert("c", ["a", "b", "c"], [[1, 0], [1, 0.1], [1, 0.2]], [
+            {"tags": ["db"], "importance": 0.9, "timestamp": "2025-11-03T09:00:00"},
+            {"tags": ["ops"], "importance": 0.4, "timestamp": "2025-11-03T10:00:00"},
+            {"tags": ["db"], "importance": "high"},
+        ])
+        ids = lambda hits: sorted(h["id"] for h in hits)
+        
+        assert ids(index.search("c", [1, 0], filters={"tags": "db"})) == ["a", "c"]
+        assert ids(index.search("c", [1, 0], ranges={"importance": (0.5, None)})) == ["a"]
+        assert ids(index.search("c", [1, 0], ranges={"timestamp": (datetime(2025, 11, 3, 9, 30), None)})) == ["b"]
+        
+        index.upsert("c", ["a"], [[1, 0]], [{"tags": ["ops"], "importance": 0.1}])
+        
+        assert ids(index.search("c", [1, 0], filters={"tags": "ops"})) == ["a", "b"]
+        assert ids(index.search("c", [1, 0], filters={"tags": "db"}, exclude_ids=["b"])) == ["c"]
+        assert ids(index.search("c", [1, 0], ranges={"importance": (None, 0.5)})) == ["a", "b"]
+        
+        index.upsert("c", ["a", "b"], [[1, 0], [1, 0.1]], [
+            {"sender": "y"}, {"importance": "high", "timestamp": "yesterday"}
+        ])
+        
+        assert ids(index.search("c", [1, 0], ranges={"importance": (0.0, None)})) == []
+        assert ids(index.search("c", [1, 0], ranges={"timestamp": (datetime(2025, 1, 1), None)})) == []
+        
+    def test_find_similar_excludes_self(self, store):
+        results = store.find_similar("demo", "m1", limit=1)
+        
+        assert [r["id"] for r in results] == ["m2"]
+        
+    def test_collection_stats(self, store):
+        stats = store.get_collection_stats("demo")
+        
+        assert stats["points_count"] == 4
+        assert stats["backend"] == "local"
+        
+    def test_memory_mapped_collections_persist(self, tmp_path):
+        first = make_store(tmp_path)
+        first.store_message("demo", "m1", "Redis for caching", "DevOps",
+                            datetime.now(), "DECISION")
+        first.store_message("demo", "m1", "Redis for rate limits", "DevOps",
+                            datetime.now(), "DECISION")  # overwrite
+        
+        second = make_store(tmp_path)
+        results = second.search("demo", "redis", score_threshold=0.5)
+        
+        assert [r["content"] for r in results] == ["Redis for rate limits"]
+        assert second.get_collection_stats("demo")["points_count"] == 1
+
+
+class TestIvfIndex:
+    """Approximate search stays close to exact search"""
+    
+    def test_ivf_recall(self):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(20, 32))
+        vectors = np.repeat(centers, 100, axis=0) + rng.normal(scale=0.1, size=(2000, 32))
+        index = LocalVectorIndex(ivf_threshold=0, nprobe=4)
+        index.create_collection("big", dimension=32)
+        index.upsert("big", list(range(2000)), vectors, [{} for _ in range(2000)])
+        index.build_index("big", nlist=20)
+        
+        recall = []
+        for query in rng.normal(size=(10, 32)) + centers[:10]:
+            exact = {h["id"] for h in index.search("big", query, limit=10, exact=True)}
+            approx = {h["id"] for h in index.search("big", query, limit=10)}
+            recall.append(len(exact & approx) / 10)
+        
+        assert np.mean(recall) >= 0.9
+        
+    def test_update_moves_point_to_its_new_partition(self):
+        index = LocalVectorIndex(ivf_threshold=0, nprobe=1)
+        index.create_collection("ivf", dimension=2)
+        index.upsert("ivf", ["x", "y", "p"], [[1, 0], [0, 1], [1, 0.01]], [{}, {}, {}])
+        index.build_index("ivf", nlist=2)
+        
+        index.upsert("ivf", ["p"], [[0.01, 1]], [{}])
+        
+        assert [h["id"] for h in index.search("ivf", [0, 1], limit=3)] == ["y", "p"]
+        assert [h["id"] for h in index.search("ivf", [1, 0], limit=3)] == ["x"]
+
+
+class TestStreamingBatch:
+    """Pipelined store_messages_batch"""
+    
+    def test_streams_generator(self):
+        store = make_store()
+        upserts = []
+        original = store._upsert
+        
+        def recording_upsert(collection_name, ids, vectors, payloads, wait=True):
+            upserts.append((len(ids), wait))
+            original(collection_name, ids, vectors, payloads, wait)
+        store._upsert = recording_upsert
+        
+        messages = (
+            message(f"m{i}", f"{TOPICS[i % 4]} note {i}", "Developer")
+            for i in range(500)
+        )
+        stats = store.store_messages_batch(
+            "demo", messages, batch_size=32, upsert_batch_size=100
+        )
+        
+        assert stats["stored"] == 500
+        assert stats["failed"] == 0
+        assert stats["embed_batches"] == 16
+        assert stats["messages_per_sec"] > 0
+        assert store.get_collection_stats("demo")["points_count"] == 500
+        assert all(size <= 100 for size, _ in upserts)
+        assert [wait for _, wait in upserts].count(True) == 1
+        assert upserts[-1][1] is True
+        
+    def test_embed_requests_respect_char_cap(self):
+        store = make_store()
+        store.embedder.max_batch_chars = 200
+        requests_sent = []
+        
+        def recording(texts):
+            requests_sent.append(sum(len(t) for t in texts))
+            return fake_embeddings(texts)
+        store.embedder._request_embeddings = recording
+        
+        stats = store.store_messages_batch("demo", [
+            message(f"m{i}", f"postgres {i} " + "x" * 90, "Developer") for i in range(8)
+        ], batch_size=8)
+        
+        assert stats["stored"] == 8
+        assert len(requests_sent) >= 4
+        assert max(requests_sent) <= 200
+        
+    def test_failed_embedding_batch_is_counted(self):
+        store = make_store()
+        
+        def flaky(texts):
+            if any("broken" in t for t in texts):
+                raise Exception("LM Studio error: 500")
+            return fake_embeddings(texts)
+        store.embedder._request_embeddings = flaky
+        
+        stats = store.store_messages_batch("demo", [
+            message("m1", "redis ok", "DevOps"),
+            message("m2", "broken", "DevOps"),
+        ], batch_size=1)
+        
+        assert stats["stored"] == 1
+        assert stats["failed"] == 1
+
+
+class TestPayloadIndexes:
+    """Indexed range filters on importance and timestamp"""
+    
+    def messages(self):
+        return [
+            {**message("00000000-0000-0000-0000-000000000001", "Postgres chosen", "Architect"),
+             "importance": 0.9, "timestamp": datetime(2025, 11, 3, 9, 0)},
+            {**message("00000000-0000-0000-0000-000000000002", "Postgres tuning", "Developer"),
+             "importance": 0.4, "timestamp": datetime(2025, 11, 3, 10, 0)},
+            {**message("00000000-0000-0000-0000-000000000003", "Postgres backup", "DevOps"),
+             "importance": 0.95, "timestamp": datetime(2025, 10, 1, 10, 0)},
+        ]
+    
+    @pytest.mark.parametrize("backend", ["local", "qdrant"])
+    def test_important_and_recent(self, backend):
+        if backend == "local":
+            store = make_store()
+        else:
+            from qdrant_client import QdrantClient
+            store = QdrantSemanticStore()
+            store.qdrant = QdrantClient(":memory:")
+            store.dimension = len(TOPICS) + 1
+            store.embedder._request_embeddings = fake_embeddings
+            store.create_collection("demo")
+        store.store_messages_batch("demo", self.messages())
+        
+        results = store.search(
+            "demo", "postgres", score_threshold=0.0,
+            min_importance=0.8, since=datetime(2025, 11, 1)
+        )
+        
+        assert [r["sender"] for r in results] == ["Architect"]
+        
+    def test_migration_indexes_existing_collections(self):
+        from qdrant_client import QdrantClient
+        store = QdrantSemanticStore()
+        store.qdrant = QdrantClient(":memory:")
+        store.dimension = 4
+        store.qdrant.create_collection(
+            "destiny-team-legacy",
+            vectors_config={"size": 4, "distance": "Cosine"}
+        )
+        
+        migrated = store.migrate_payload_indexes()
+        
+        assert migrated == {"destiny-team-legacy": list(QdrantSemanticStore.PAYLOAD_INDEXES)}
+
+
+class TestQuantization:
+    """Quantized codes in RAM, originals on disk, rescored results"""
+    
+    @pytest.mark.parametrize("quantization", ["scalar", "binary"])
+    def test_rescored_results_match_exact(self, quantization, tmp_path):
+        rng = np.random.default_rng(2)
+        # Low-rank structure + noise, like real text embeddings
+        vectors = rng.normal(size=(3000, 32)) @ rng.normal(size=(32, 256))
+        vectors += rng.normal(scale=2.0, size=vectors.shape)
+        index = LocalVectorIndex(tmp_path, ivf_threshold=0, oversampling=4.0)
+        index.create_collection("q", dimension=256, quantization=quantization)
+        index.upsert("q", list(range(3000)), vectors, [{} for _ in range(3000)])
+        
+        recall = []
+        for query in vectors[:20] + rng.normal(size=(20, 256)):
+            exact = {h["id"] for h in index.search("q", query, limit=10, exact=True)}
+            approx = index.search("q", query, limit=10)
+            recall.append(len(exact & {h["id"] for h in approx}) / 10)
+        
+        assert np.mean(recall) >= 0.8
+        memory = index.memory_bytes("q")
+        assert memory["ram"] < memory["disk"] / 3
+        
+    def test_qdrant_collection_config(self):
+        from qdrant_client import QdrantClient
+        store = QdrantSemanticStore(quantization="scalar", on_disk=True)
+        store.qdrant = QdrantClient(":memory:")
+        
+        store.create_collection("demo")
+        
+        config = store.qdrant.get_collection("destiny-team-demo").config
+        assert config.params.vectors.on_disk is True
+        assert store._quantization_config("scalar").scalar.type == "int8"
+        assert store._quantization_config("binary").binary.always_ram is True
+        
+    def test_search_params_follow_the_collection(self):
+        """Rescoring is decided per collection, not by the store default"""
+        from qdrant_client import QdrantClient
+        store = QdrantSemanticStore(quantization="scalar")
+        store.qdrant = QdrantClient(":memory:")
+        store.dimension = 4
+        store.create_collection("quantized")
+        store.qdrant.create_collection(
+            "destiny-team-legacy",
+            vectors_config={"size": 4, "distance": "Cosine"}
+        )
+        
+        assert store._search_params("destiny-team-quantized").quantization.rescore is True
+        assert store._search_params("destiny-team-legacy") is None
+        assert store._quantized == {"destiny-team-quantized": True, "destiny-team-legacy": False}
+        
+        store.quantization = None
+        store.create_collection("override", quantization="binary")
+        assert store._search_params("destiny-team-override") is not None
+
+
+class TestFindSimilarMany:
+    """Batched similar-message lookup, self excluded"""
+    
+    IDS = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(1, 5)]
+    
+    @pytest.mark.parametrize("backend", ["local", "qdrant"])
+    def test_keyed_by_source(self, backend):
+        if backend == "local":
+            store = make_store()
+        else:
+            from qdrant_client import QdrantClient
+            store = QdrantSemanticStore()
+            store.qdrant = QdrantClient(":memory:")
+            store.dimension = len(TOPICS) + 1
+            store.embedder._request_embeddings = fake_embeddings
+            store.create_collection("demo")
+        store.store_messages_batch("demo", [
+            message(self.IDS[0], "Postgres for ACID", "Architect"),
+            message(self.IDS[1], "Postgres replication", "DevOps"),
+            message(self.IDS[2], "Redis sessions", "Developer"),
+            message(self.IDS[3], "Redis eviction", "DevOps"),
+        ])
+        missing = "00000000-0000-0000-0000-000000000099"
+        
+        similar = store.find_similar_many(
+            "demo", [self.IDS[0], self.IDS[2], missing], limit=1, batch_size=2
+        )
+        
+        assert set(similar) == {self.IDS[0], self.IDS[2]}
+        assert [r["id"] for r in similar[self.IDS[0]]] == [self.IDS[1]]
+        assert [r["id"] for r in similar[self.IDS[2]]] == [self.IDS[3]]
+        assert store.find_similar("demo", missing) == []
@@ -0,0 +1,303 @@
+"""
+Tests for RedisCache: L1 tier, key indexes, pipelining and streams
+
+Run against fakeredis (with Lua support: pip install "fakeredis[lua]").
+"""
+
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL (update_session)
+
+from redis_cache import RedisCache
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    """fakeredis client counting round-trips (a pipeline is one)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_trips = 0
+
+    def execute_command(self, *args, **options):
+        self.round_trips += 1
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def counted(*args, **kwargs):
+            self.round_trips += 1
+            return execute(*args, **kwargs)
+        pipe.execute = counted
+        return pipe
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def caches():
+    """Closes every cache a test creates (stops L1 listener threads)"""
+    created = []
+    yield created
+    for cache in created:
+        cache.close()
+
+
+@pytest.fixture
+def make_cache(server, caches):
+    def make(l1_size=16, **kwargs):
+        cache = RedisCache(l1_size=l1_size, **kwargs)
+        cache.client = CountingRedis(server=server)
+        caches.append(cache)
+        return cache
+    return make
+
+
+def eventually(condition, timeout=3.0):
+    """Pub/sub delivery runs on the listener thread"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestL1Cache:
+
+    def test_repeat_reads_skip_redis(self, make_cache):
+        cache = make_cache()
+        cache.cache_search_results("postgres", "proj", [{"id": 1}], ttl=60)
+
+        trips = cache.client.round_trips
+        for _ in range(5):
+            assert cache.get_cached_search("postgres", "proj") == [{"id": 1}]
+
+        assert cache.client.round_trips == trips
+        stats = cache.get_tier_stats()
+        assert stats["l1_hits"] == 5
+        assert stats["l2_hits"] == 0
+
+    def test_l2_hit_populates_l1_and_returns_copies(self, make_cache):
+        writer = make_cache()
+        reader = make_cache()
+        writer.set("state", {"step": 1}, ttl=60)
+
+        value = reader.get("state")
+        value["step"] = 99  # mutating the result must not poison L1
+
+        assert reader.get("state") == {"step": 1}
+        assert reader.get_tier_stats()["l2_hits"] == 1
+        assert reader.get_tier_stats()["l1_hits"] == 1
+
+    def test_ttl_capped_by_redis_ttl(self, make_cache):
+        cache = make_cache(l1_ttl=60)
+        cache.set("short", {"x": 1}, ttl=1)
+        full_key = cache._make_key("short")
+
+        expires_at = cache._l1[full_key][0]
+        assert expires_at - time.monotonic() <= 1
+
+        # Expired in both tiers -> miss
+        cache.client.delete(full_key)
+        cache._l1[full_key] = (time.monotonic() - 1, b"stale")
+        assert cache.get("short") is None
+        assert cache.get_tier_stats()["misses"] == 1
+
+    def test_writes_invalidate_other_processes(self, make_cache):
+        first = make_cache()
+        second = make_cache()
+        first.set("session:abc", {"user": "a"}, ttl=60)
+        assert second.get("session:abc") == {"user": "a"}
+
+        first.set("session:abc", {"user": "b"}, ttl=60)
+        assert eventually(lambda: second.get("session:abc") == {"user": "b"})
+
+        first.delete("session:abc")
+        assert eventually(lambda: second.get("session:abc") is None)
+        assert second.get_tier_stats()["invalidations"] == 2
+
+    def test_lru_is_size_bounded(self, make_cache):
+        cache = make_cache(l1_size=3)
+        for i in range(5):
+            cache.set(f"k{i}", i, ttl=60)
+
+        assert len(cache._l1) == 3
+        assert cache._make_key("k0") not in cache._l1
+        assert cache.get("k0") == 0  # still in Redis
+
+    def test_disabled_by_default(self, server, caches):
+        cache = RedisCache()
+        cache.client = CountingRedis(server=server)
+        caches.append(cache)
+        cache.set("k", 1, ttl=60)
+
+        assert cache.get("k") == 1
+        assert cache.get("k") == 1
+        assert not cache._l1
+        assert cache._listener is None
+        assert cache.get_tier_stats()["l2_hits"] == 2
+
+
+class TestProjectKeyIndex:
+
+    def test_clear_project_cache_uses_index(self, make_cache):
+        cache = make_cache(l1_size=0)
+        cache.cache_search_results("q1", "alpha", [{"id": 1}])
+        cache.cache_search_results("q2", "alpha", [{"id": 2}])
+        cache.cache_agent_state("planner", "alpha", {"step": 1})
+        cache.cache_search_results("q1", "beta", [{"id": 3}])
+        cache.mark_project_active("alpha")
+        cache.client.set("destiny:hot_memory:alpha", b"[]")
+
+        assert cache.clear_project_cache("alpha") == 5
+        assert cache.get_cached_search("q1", "alpha") is None
+        assert cache.get_agent_state("planner", "alpha") is None
+        assert cache.get_cached_search("q1", "beta") == [{"id": 3}]
+        assert not cache.client.exists("destiny:project_keys:alpha")
+
+    def test_indexed_set_is_one_round_trip(self, make_cache):
+        cache = make_cache(l1_size=0)
+        cache.set("agent_state:alpha:planner", {}, ttl=60, project_id="alpha")
+
+        assert cache.client.round_trips == 1
+
+    def test_expired_members_are_pruned(self, make_cache):
+        cache = make_cache(l1_size=0, index_prune_interval=4)
+        index_key = cache._project_index_key("alpha")
+        for i in range(3):
+            cache.set(f"k{i}", i, ttl=60, project_id="alpha")
+        cache.client.delete("destiny:k0", "destiny:k1")  # as if expired
+
+        assert cache.client.scard(index_key) == 3
+        assert cache.prune_project_index("alpha") == 2
+        assert cache.client.smembers(index_key) == {b"destiny:k2"}
+
+        # Every 4th indexed set() prunes on its own
+        cache.client.delete("destiny:k2")
+        cache.set("k3", 3, ttl=60, project_id="alpha")
+        assert cache.client.smembers(index_key) == {b"destiny:k3"}
+
+    def test_active_projects_via_scan(self, make_cache):
+        cache = make_cache(l1_size=0)
+        cache.mark_project_active("alpha")
+        cache.mark_project_active("beta")
+
+        assert sorted(cache.get_active_projects()) == ["alpha", "beta"]
+
+
+class TestSearchGeneration:
+
+    def test_key_includes_type_and_limit(self, make_cache):
+        cache = make_cache(l1_size=0)
+        cache.cache_search_results("db", "alpha", [{"id": "hot"}], search_type="hot", limit=5)
+
+        assert cache.get_cached_search("db", "alpha", "hot", 5) == [{"id": "hot"}]
+        assert cache.get_cached_search("db", "alpha", "hybrid", 5) is None
+        assert cache.get_cached_search("db", "alpha", "hot", 20) is None
+
+    def test_bump_invalidates_only_that_project(self, make_cache):
+        cache = make_cache(l1_size=0)
+        cache.cache_search_results("db", "alpha", [{"id": 1}])
+        cache.cache_search_results("db", "beta", [{"id": 2}])
+
+        assert cache.bump_search_generation("alpha") == 1
+        assert cache.get_cached_search("db", "alpha") is None
+        assert cache.get_cached_search("db", "beta") == [{"id": 2}]
+
+    def test_bump_reaches_other_processes_l1(self, make_cache):
+        reader = make_cache()
+        writer = make_cache()
+        reader.cache_search_results("db", "alpha", [{"id": 1}])
+        assert reader.get_cached_search("db", "alpha") == [{"id": 1}]
+
+        writer.bump_search_generation("alpha")
+
+        assert eventually(lambda: reader.get_cached_search("db", "alpha") is None)
+
+
+class TestPipelinedOperations:
+
+    def test_add_many_to_hot_memory_is_one_round_trip(self, make_cache):
+        cache = make_cache(l1_size=0)
+        cache.add_many_to_hot_memory("alpha", [{"n": i} for i in range(15)], max_size=10)
+
+        assert cache.client.round_trips == 1
+        hot = cache.get_hot_memory("alpha")
+        assert [m["n"] for m in hot] == list(range(14, 4, -1))
+
+    def test_single_add_keeps_fifo_order(self, make_cache):
+        cache = make_cache(l1_size=0)
+        for i in range(3):
+            cache.add_to_hot_memory("alpha", {"n": i}, max_size=2)
+
+        assert [m["n"] for m in cache.get_hot_memory("alpha")] == [2, 1]
+
+    def test_update_session_preserves_ttl(self, make_cache):
+        cache = make_cache()
+        cache.create_session("s1", {"step": 1}, ttl=120)
+        assert cache.get_session("s1") == {"step": 1}
+
+        cache.update_session("s1", {"step": 2})
+
+        assert 100 < cache.client.ttl("destiny:session:s1") <= 120
+        assert cache.get_session("s1") == {"step": 2}
+
+    def test_update_session_without_ttl_gets_default(self, make_cache):
+        cache = make_cache(l1_size=0)
+        cache.client.set("destiny:session:s2", cache.codec.encode({"step": 1}))
+
+        cache.update_session("s2", {"step": 2})
+
+        assert 3500 < cache.client.ttl("destiny:session:s2") <= 3600
+        assert cache.get_session("s2") == {"step": 2}
+
+
+class TestHotMemoryStreams:
+
+    def test_get_hot_memory_newest_first(self, make_cache):
+        cache = make_cache(l1_size=0, hot_memory_mode="stream", stream_maxlen=50)
+        cache.add_many_to_hot_memory("alpha", [{"n": i} for i in range(15)])
+
+        hot = cache.get_hot_memory("alpha")
+        assert [m["n"] for m in hot] == list(range(14, 4, -1))
+        assert all("stream_id" in m for m in hot)
+
+    def test_tail_returns_only_newer_messages(self, make_cache):
+        cache = make_cache(l1_size=0, hot_memory_mode="stream", stream_maxlen=50)
+        cache.add_many_to_hot_memory("alpha", [{"n": 0}, {"n": 1}])
+
+        first = cache.tail("alpha")
+        cache.add_to_hot_memory("alpha", {"n": 2})
+        newer = cache.tail("alpha", since_id=first[-1]["stream_id"])
+
+        assert [m["n"] for m in first] == [0, 1]
+        assert [m["n"] for m in newer] == [2]
+
+    def test_each_agent_reads_every_message_once(self, make_cache):
+        cache = make_cache(l1_size=0, hot_memory_mode="stream", stream_maxlen=50)
+        cache.add_many_to_hot_memory("alpha", [{"n": 0}, {"n": 1}])
+
+        assert [m["n"] for m in cache.read_new("alpha", "planner")] == [0, 1]
+        assert cache.read_new("alpha", "planner") == []
+
+        cache.add_to_hot_memory("alpha", {"n": 2})
+        assert [m["n"] for m in cache.read_new("alpha", "planner")] == [2]
+        assert [m["n"] for m in cache.read_new("alpha", "reviewer")] == [0, 1, 2]
+
+    def test_stream_calls_need_stream_mode(self, make_cache):
+        cache = make_cache(l1_size=0)
+        with pytest.raises(RuntimeError):
+            cache.tail("alpha")
@@ -40,17 +40,17 @@ def verify_all_layers():
         )
         
         # Count projects
-        with postgres.conn.cursor() as cur:
+        with postgres.cursor() as cur:
             cur.execute("SELECT COUNT(*) FROM projects")
             project_count = cur.fetchone()[0]
         
         # Count messages
-        with postgres.conn.cursor() as cur:
+        with postgres.cursor() as cur:
             cur.execute("SELECT COUNT(*) FROM messages")
             message_count = cur.fetchone()[0]
         
         # Count decisions
-        with postgres.conn.cursor() as cur:
+        with postgres.cursor() as cur:
             cur.execute("SELECT COUNT(*) FROM decisions")
             decision_count = cur.fetchone()[0]
         
@@ -168,7 +168,7 @@ def verify_all_layers():
     try:
         redis = RedisCache(host="localhost", port=6379)
         
-        all_keys = redis.client.keys("destiny:*")
+        all_keys = list(redis.client.scan_iter(match="destiny:*", count=500))
         
         stats = redis.get_cache_stats()
         